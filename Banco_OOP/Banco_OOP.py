@@ -1,6 +1,27 @@
-from abc import ABC, abstractmethod, abstractproperty 
+from abc import ABC, abstractmethod
 from datetime import datetime
+import math
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from banco_comum.contadores_diarios import CalendarioDiario
+from banco_comum.dinheiro import Dinheiro
+from banco_comum.registros import RegistroClientes, RegistroContas, normalizar_cpf
+from banco_comum.regras_limites import (LimitePorOperacao, LimiteQuantidadeDiaria, LimiteVolumeDiario, SaldoSuficiente,
+                            ValorPositivo, compilar_regras)
+
+# Códigos de resultado das operações, usados por quem precisa do motivo de uma
+# recusa sem depender das mensagens impressas (ex.: servidor_banco).
+OPERACAO_OK = 0
+VALOR_INVALIDO = 4
+SALDO_INSUFICIENTE = 5
+LIMITE_VALOR_SAQUE = 6
+LIMITE_SAQUES_DIARIOS = 7
+LIMITE_VOLUME_DIARIO = 8
+
+# Dia corrente para os contadores diários das contas correntes.
+_CALENDARIO = CalendarioDiario()
 
 _TRANSACTION_ID = 0
 def get_next_transaction_id():
@@ -9,74 +30,60 @@ def get_next_transaction_id():
     return _TRANSACTION_ID
 
 class Transacao(ABC):
-    def __init__(self, valor: float):
+    __slots__ = ("_valor", "_id", "_data")
+
+    def __init__(self, valor: Dinheiro):
         self._valor = valor
         self._id = get_next_transaction_id()
         self._data = datetime.now()
 
-    @abstractproperty
-    def valor(self) -> float:
-        pass
+    @property
+    def valor(self) -> Dinheiro:
+        return self._valor
 
-    @abstractproperty
+    @property
     def id(self) -> int:
-        pass
+        return self._id
 
-    @abstractproperty
+    @property
     def data(self) -> datetime:
-        pass
+        return self._data
 
     @abstractmethod
     def registrar(self, conta: 'Conta') -> bool:
         pass
 
 class Deposito(Transacao):
-    def __init__(self, valor: float):
+    __slots__ = ()
+
+    def __init__(self, valor: Dinheiro | float):
+        valor = Dinheiro.de_reais(valor)
         if valor <= 0:
             raise ValueError("O valor do depósito deve ser positivo.")
         super().__init__(valor)
 
-    @property
-    def valor(self) -> float:
-        return self._valor
-
-    @property
-    def id(self) -> int:
-        return self._id
-
-    @property
-    def data(self) -> datetime:
-        return self._data
-
     def registrar(self, conta: 'Conta') -> bool:
         if conta.depositar(self.valor):
             return True
         return False
 
 class Saque(Transacao):
-    def __init__(self, valor: float):
+    __slots__ = ()
+
+    def __init__(self, valor: Dinheiro | float):
+        valor = Dinheiro.de_reais(valor)
         if valor <= 0:
             raise ValueError("O valor do saque deve ser positivo.")
         super().__init__(valor)
 
-    @property
-    def valor(self) -> float:
-        return self._valor
-
-    @property
-    def id(self) -> int:
-        return self._id
-
-    @property
-    def data(self) -> datetime:
-        return self._data
-
     def registrar(self, conta: 'Conta') -> bool:
         if conta.sacar(self.valor):
             return True
         return False
 
 class Historico:
+    __slots__ = ("_transacoes",)
+
     def __init__(self):
         self._transacoes = []
 
@@ -99,10 +106,13 @@ class Historico:
         print("---------------")
 
 class Conta:
+    # _saldo fica em centavos como int simples, como no banco de decoradores_iteradores_geradores;
+    # a propriedade saldo é que devolve Dinheiro.
+    __slots__ = ("_saldo", "_numero", "_agencia", "_cliente", "_historico")
     _AGENCIA_PADRAO = "0001"
 
     def __init__(self, cliente: 'Cliente', numero: int):
-        self._saldo = 0.0
+        self._saldo = 0
         self._numero = numero
         self._agencia = Conta._AGENCIA_PADRAO
         self._cliente = cliente
@@ -113,8 +123,8 @@ class Conta:
         return cls(cliente, numero)
 
     @property
-    def saldo(self) -> float:
-        return self._saldo
+    def saldo(self) -> Dinheiro:
+        return Dinheiro(self._saldo)
 
     @property
     def numero(self) -> int:
@@ -132,66 +142,125 @@ class Conta:
     def historico(self) -> Historico:
         return self._historico
 
-    def sacar(self, valor: float) -> bool:
+    # Validação e movimentação separadas, para que quem não imprime (ex.: servidor_banco)
+    # aplique as mesmas regras de sacar/depositar. Recebem o valor já em Dinheiro.
+    def _validar_deposito(self, valor: Dinheiro | int) -> int:
         if valor <= 0:
-            print("\n!!! Operação falhou! O valor do saque deve ser positivo.")
-            return False
-
-        if valor > self._saldo:
-            print("\n!!! Operação falhou! Saldo insuficiente.")
+            return VALOR_INVALIDO
+        return OPERACAO_OK
+
+    def _creditar(self, valor: Dinheiro | int):
+        self._saldo += int(valor)
+
+    # (conta, valor) -> código de resultado; a primeira regra que recusa define o código.
+    _validar_saque = compilar_regras((
+        ValorPositivo(VALOR_INVALIDO),
+        SaldoSuficiente(SALDO_INSUFICIENTE),
+    ), nome="_validar_saque", sucesso=OPERACAO_OK)
+
+    def _debitar(self, valor: Dinheiro | int):
+        self._saldo -= int(valor)
+
+    def _mensagem_recusa_saque(self, motivo: int, valor: Dinheiro) -> str:
+        if motivo == VALOR_INVALIDO:
+            return "O valor do saque deve ser positivo."
+        if motivo == LIMITE_SAQUES_DIARIOS:
+            return "Limite de saques diários da Conta Corrente atingido."
+        if motivo == LIMITE_VALOR_SAQUE:
+            return f"O valor do saque (R${valor:.2f}) excede o limite máximo por saque de R${self.limite:.2f}."
+        if motivo == LIMITE_VOLUME_DIARIO:
+            return f"O saque excede o limite diário de R${self.limite_volume_diario:.2f} em saques."
+        return "Saldo insuficiente."
+
+    def sacar(self, valor: Dinheiro | float) -> bool:
+        valor = Dinheiro.de_reais(valor)
+        motivo = self._validar_saque(valor)
+        if motivo != OPERACAO_OK:
+            print(f"\n!!! Operação falhou! {self._mensagem_recusa_saque(motivo, valor)}")
             return False
 
-        self._saldo -= valor
+        self._debitar(valor)
         print(f"\nSaque de R${valor:.2f} realizado com sucesso.")
         return True
 
-    def depositar(self, valor: float) -> bool:
-        if valor <= 0:
+    def depositar(self, valor: Dinheiro | float) -> bool:
+        valor = Dinheiro.de_reais(valor)
+        if self._validar_deposito(valor) != OPERACAO_OK:
             print("\n!!! Operação falhou! O valor do depósito deve ser positivo.")
             return False
 
-        self._saldo += valor
+        self._creditar(valor)
         print(f"\nDepósito de R${valor:.2f} realizado com sucesso.")
         return True
 
 class ContaCorrente(Conta):
-    def __init__(self, cliente: 'Cliente', numero: int, limite_valor_saque: float = 500.0, limite_saques_diarios_cc: int = 3):
+    # limite_volume_diario é opcional: None (o padrão) deixa o volume de saques sem teto.
+    # _saques_hoje e _volume_saques_hoje valem para o dia _dia_saques do _CALENDARIO e são
+    # zerados no primeiro saque de outro dia, como no banco de decoradores_iteradores_geradores
+    # (aqui sem a virada agendada: o servidor roda em uma única thread).
+    __slots__ = ("_limite_valor_saque", "_limite_saques_diarios", "_dia_saques", "_saques_hoje",
+                 "_limite_volume_diario", "_volume_saques_hoje")
+
+    def __init__(self, cliente: 'Cliente', numero: int, limite_valor_saque: Dinheiro | float = 500.0,
+                 limite_saques_diarios_cc: int = 3, limite_volume_diario: Dinheiro | float | None = None):
         super().__init__(cliente, numero)
-        self._limite_valor_saque = limite_valor_saque
+        self._limite_valor_saque = Dinheiro.de_reais(limite_valor_saque)
         self._limite_saques_diarios = limite_saques_diarios_cc
+        self._dia_saques = 0
         self._saques_hoje = 0
+        # Sem limite, inf: a regra compilada compara com ele como com qualquer int.
+        self._limite_volume_diario = math.inf if limite_volume_diario is None else Dinheiro.de_reais(limite_volume_diario)
+        self._volume_saques_hoje = 0
 
     @property
-    def limite(self) -> float:
+    def limite(self) -> Dinheiro:
         return self._limite_valor_saque
 
-    def sacar(self, valor: float) -> bool:
-        if valor <= 0:
-            print("\n!!! Operação falhou! O valor do saque deve ser positivo.")
-            return False
-
-        if self._saques_hoje >= self._limite_saques_diarios:
-            print("\n!!! Operação falhou! Limite de saques diários da Conta Corrente atingido.")
-            return False
+    @property
+    def limite_volume_diario(self) -> Dinheiro | None:
+        return None if self._limite_volume_diario == math.inf else self._limite_volume_diario
 
-        if valor > self.limite:
-            print(f"\n!!! Operação falhou! O valor do saque (R${valor:.2f}) excede o limite máximo por saque de R${self.limite:.2f}.")
-            return False
-        
-        if valor > self._saldo:
-            print("\n!!! Operação falhou! Saldo insuficiente.")
-            return False
+    @property
+    def saques_hoje(self) -> int:
+        return self._saques_hoje if self._dia_saques == _CALENDARIO.dia else 0
 
-        self._saldo -= valor
+    @property
+    def volume_saques_hoje(self) -> Dinheiro:
+        return Dinheiro(self._volume_saques_hoje if self._dia_saques == _CALENDARIO.dia else 0)
+
+    _regras_saque = compilar_regras((
+        ValorPositivo(VALOR_INVALIDO),
+        LimiteQuantidadeDiaria(LIMITE_SAQUES_DIARIOS, limite="_limite_saques_diarios", realizadas="_saques_hoje"),
+        LimitePorOperacao(LIMITE_VALOR_SAQUE, limite="_limite_valor_saque"),
+        LimiteVolumeDiario(LIMITE_VOLUME_DIARIO, limite="_limite_volume_diario", acumulado="_volume_saques_hoje"),
+        SaldoSuficiente(SALDO_INSUFICIENTE),
+    ), nome="_regras_saque", sucesso=OPERACAO_OK)
+
+    def _validar_saque(self, valor: Dinheiro | int) -> int:
+        dia = _CALENDARIO.dia
+        if self._dia_saques != dia:
+            self._virar_dia(dia)
+        return self._regras_saque(valor)
+
+    def _virar_dia(self, dia: int):
+        if self._dia_saques < dia:
+            self._dia_saques = dia
+            self._saques_hoje = 0
+            self._volume_saques_hoje = 0
+
+    def _debitar(self, valor: Dinheiro | int):
+        self._saldo -= int(valor)
         self._saques_hoje += 1
-        print(f"\nSaque de R${valor:.2f} realizado com sucesso.")
-        return True
+        self._volume_saques_hoje += int(valor)
 
 
 class Cliente:
+    __slots__ = ("_endereco", "_contas", "_contas_por_numero")
+
     def __init__(self, endereco: str):
         self._endereco = endereco
         self._contas = []
+        self._contas_por_numero: dict[int, 'Conta'] = {}
 
     @property
     def endereco(self) -> str:
@@ -202,7 +271,7 @@ class Cliente:
         return self._contas
 
     def realizar_transacao(self, conta: 'Conta', transacao: Transacao) -> bool:
-        if conta not in self.contas:
+        if self._contas_por_numero.get(conta.numero) is not conta:
             print("Erro: Conta não pertence a este cliente.")
             return False
 
@@ -213,8 +282,14 @@ class Cliente:
 
     def adicionar_conta(self, conta: 'Conta'):
         self._contas.append(conta)
+        self._contas_por_numero[conta.numero] = conta
+
+    def buscar_conta(self, numero_conta: int) -> 'Conta | None':
+        return self._contas_por_numero.get(numero_conta)
 
 class PessoaFisica(Cliente):
+    __slots__ = ("_cpf", "_nome", "_data_nascimento")
+
     def __init__(self, cpf: str, nome: str, data_nascimento: str, endereco: str):
         super().__init__(endereco)
         self._cpf = cpf
@@ -248,19 +323,13 @@ def menu():
     print("="*46)
     return input("=> ").lower().strip()
 
-def filtrar_cliente(cpf: str, clientes: list[PessoaFisica]) -> PessoaFisica | None:
-    for cliente in clientes:
-        if cliente.cpf == cpf:
-            return cliente
-    return None
+def filtrar_cliente(cpf: str, clientes: RegistroClientes) -> PessoaFisica | None:
+    return clientes.buscar_por_cpf(cpf)
 
 def recuperar_conta_cliente(cliente: Cliente, numero_conta: int) -> Conta | None:
-    for conta in cliente.contas:
-        if conta.numero == numero_conta:
-            return conta
-    return None
+    return cliente.buscar_conta(numero_conta)
 
-def cadastrar_usuario(clientes: list[PessoaFisica]):
+def cadastrar_usuario(clientes: RegistroClientes):
     print("\n--- Novo Usuário ---")
     cpf = input("Informe o CPF (somente números): ")
     cliente_existente = filtrar_cliente(cpf, clientes)
@@ -274,10 +343,10 @@ def cadastrar_usuario(clientes: list[PessoaFisica]):
     endereco = input("Informe o endereço (logradouro, nro - bairro - cidade/sigla estado): ")
 
     novo_cliente = PessoaFisica(cpf=cpf, nome=nome, data_nascimento=data_nascimento, endereco=endereco)
-    clientes.append(novo_cliente)
+    clientes.adicionar(novo_cliente)
     print("\n>>> Usuário criado com sucesso!")
 
-def criar_conta(clientes: list[PessoaFisica], contas: list[Conta]):
+def criar_conta(clientes: RegistroClientes, contas: RegistroContas):
     print("\n--- Criar Nova Conta ---")
     cpf = input("Informe o CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
@@ -286,24 +355,30 @@ def criar_conta(clientes: list[PessoaFisica], contas: list[Conta]):
         print("\n!!! Erro: Cliente não encontrado, crie um novo usuário primeiro!")
         return
 
-    novo_numero_conta = len(contas) + 1001
+    novo_numero_conta = contas.proximo_numero
 
     try:
-        limite_valor_saque_cc = float(input("Informe o limite MÁXIMO por saque (ex: 500): "))
+        limite_valor_saque_cc = Dinheiro.de_texto(input("Informe o limite MÁXIMO por saque (ex: 500): "))
         limite_saques_diarios_cc = int(input("Informe o limite de SAQUES DIÁRIOS (ex: 3): "))
+        limite_volume_diario = input("Informe o limite de VOLUME DIÁRIO de saques (vazio = sem limite): ").strip()
+        limite_volume_diario = Dinheiro.de_texto(limite_volume_diario) if limite_volume_diario else None
+        if limite_volume_diario is not None and limite_volume_diario <= 0:
+            raise ValueError
         
         nova_conta = ContaCorrente(cliente=cliente, numero=novo_numero_conta, 
                                    limite_valor_saque=limite_valor_saque_cc, 
-                                   limite_saques_diarios_cc=limite_saques_diarios_cc)
+                                   limite_saques_diarios_cc=limite_saques_diarios_cc,
+                                   limite_volume_diario=limite_volume_diario)
     except ValueError:
         print("\n!!! Erro: Valores de limite ou saques inválidos. Conta não criada.")
         return
 
-    contas.append(nova_conta)
+    contas.adicionar(nova_conta)
     cliente.adicionar_conta(nova_conta)
+    clientes.registrar_conta(nova_conta)
     print(f"\n>>> Conta {nova_conta.numero} (Conta Corrente) criada com sucesso para {cliente.nome}!")
 
-def listar_contas(contas: list[Conta]):
+def listar_contas(contas: RegistroContas):
     print("\n--- Lista de Contas ---")
     if not contas:
         print("Nenhuma conta cadastrada.")
@@ -320,9 +395,11 @@ def listar_contas(contas: list[Conta]):
         if isinstance(conta, ContaCorrente):
             print(f"Limite por Saque: R${conta.limite:.2f}")
             print(f"Limite Saques Diários: {conta._limite_saques_diarios}")
+            if conta.limite_volume_diario is not None:
+                print(f"Limite Volume Diário: R${conta.limite_volume_diario:.2f}")
         print("-" * 30)
 
-def depositar(clientes: list[PessoaFisica]):
+def depositar(clientes: RegistroClientes):
     print("\n--- Depositar ---")
     cpf = input("Informe o CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
@@ -350,7 +427,7 @@ def depositar(clientes: list[PessoaFisica]):
         return
 
     try:
-        valor = float(input("Informe o valor do depósito: "))
+        valor = Dinheiro.de_texto(input("Informe o valor do depósito: "))
         if valor <= 0:
             raise ValueError
     except ValueError:
@@ -362,7 +439,7 @@ def depositar(clientes: list[PessoaFisica]):
     print(f"Saldo atual da conta {conta.numero}: R${conta.saldo:.2f}")
 
 
-def sacar(clientes: list[PessoaFisica]):
+def sacar(clientes: RegistroClientes):
     print("\n--- Sacar ---")
     cpf = input("Informe o CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
@@ -390,7 +467,7 @@ def sacar(clientes: list[PessoaFisica]):
         return
 
     try:
-        valor = float(input("Informe o valor do saque: "))
+        valor = Dinheiro.de_texto(input("Informe o valor do saque: "))
     except ValueError:
         print("\n!!! Erro: Valor de saque inválido. Informe um número.")
         return
@@ -399,7 +476,7 @@ def sacar(clientes: list[PessoaFisica]):
     cliente.realizar_transacao(conta, transacao)
     print(f"Saldo atual da conta {conta.numero}: R${conta.saldo:.2f}")
 
-def exibir_extrato(clientes: list[PessoaFisica]):
+def exibir_extrato(clientes: RegistroClientes):
     print("\n--- Extrato ---")
     cpf = input("Informe o CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
@@ -430,8 +507,8 @@ def exibir_extrato(clientes: list[PessoaFisica]):
     print(f"Saldo Atual: R${conta.saldo:.2f}")
 
 def main():
-    clientes: list[PessoaFisica] = []
-    contas: list[Conta] = []
+    clientes = RegistroClientes()
+    contas = RegistroContas()
 
     while True:
         limpar_tela()
@@ -0,0 +1,69 @@
+# Benchmark: memória e vazão dos modelos com __slots__.
+# As subclasses "Legado" não declaram __slots__ e voltam a ter __dict__ por instância,
+# reproduzindo o layout anterior dos modelos.
+# Uso: python benchmark_modelos_slots.py [quantidade]   (ex.: 10000000)
+import gc
+import sys
+import time
+import tracemalloc
+
+from Banco_OOP import ContaCorrente, Deposito, PessoaFisica, Saque
+
+class DepositoLegado(Deposito):
+    pass
+
+class SaqueLegado(Saque):
+    pass
+
+class PessoaFisicaLegado(PessoaFisica):
+    pass
+
+class ContaCorrenteLegado(ContaCorrente):
+    pass
+
+AMOSTRA_MEMORIA = 100_000
+
+def criar_transacoes(quantidade: int, deposito, saque) -> list:
+    return [deposito(10.0) if i % 3 else saque(5.0) for i in range(quantidade)]
+
+def criar_contas(quantidade: int, pessoa_fisica, conta_corrente) -> list:
+    contas = []
+    for i in range(quantidade):
+        cliente = pessoa_fisica(cpf=f"{i:011d}", nome="Cliente", data_nascimento="01-01-1990", endereco="Rua A, 1")
+        contas.append(conta_corrente(cliente=cliente, numero=1001 + i))
+    return contas
+
+def bytes_por_objeto(construir) -> float:
+    gc.collect()
+    tracemalloc.start()
+    objetos = construir(AMOSTRA_MEMORIA)
+    atual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objetos
+    return atual / AMOSTRA_MEMORIA
+
+def vazao(construir, quantidade: int) -> float:
+    gc.collect()
+    inicio = time.perf_counter()
+    objetos = construir(quantidade)
+    duracao = time.perf_counter() - inicio
+    del objetos
+    return quantidade / duracao
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    cenarios = [
+        ("transacoes legado", lambda n: criar_transacoes(n, DepositoLegado, SaqueLegado)),
+        ("transacoes slots", lambda n: criar_transacoes(n, Deposito, Saque)),
+        ("contas legado", lambda n: criar_contas(n, PessoaFisicaLegado, ContaCorrenteLegado)),
+        ("contas slots", lambda n: criar_contas(n, PessoaFisica, ContaCorrente)),
+    ]
+    print(f"{quantidade} objetos por cenário (memória medida em amostra de {AMOSTRA_MEMORIA})")
+    print(f"{'cenário':>18} | {'bytes/objeto':>12} | {'total estimado (MB)':>19} | {'objetos/s':>10}")
+    print("-" * 70)
+    for nome, construir in cenarios:
+        memoria = bytes_por_objeto(construir)
+        print(f"{nome:>18} | {memoria:>12.1f} | {memoria * quantidade / 2**20:>19.1f} | {vazao(construir, quantidade):>10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# Gerador de carga assíncrono para o servidor_banco. Sobe o servidor em um subprocesso,
+# abre CLIENTES conexões simultâneas e, em cada uma, cadastra um usuário, cria uma conta
+# e faz OPERACOES requisições (depósito, saque ou extrato), uma de cada vez. Mede a
+# latência de cada requisição (p50/p99) e as operações por segundo do conjunto.
+# Uso: python benchmark_servidor.py [clientes] [operacoes] [porta]
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+
+from servidor_banco import ENDERECO, PORTA
+
+CLIENTES = 2_000
+OPERACOES = 50
+
+async def requisitar(leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter, *campos) -> list[str]:
+    escritor.write(("\t".join(map(str, campos)) + "\n").encode("utf-8"))
+    resposta = (await leitor.readline()).decode("utf-8").rstrip("\n").split("\t")
+    if campos[0] == "exibir_extrato" and resposta[0] == "OK":
+        for _ in range(int(resposta[2])):
+            await leitor.readline()
+    return resposta
+
+async def cliente(indice: int, porta: int, operacoes: int, largada: asyncio.Barrier, latencias: list[float],
+                  erros: list[str]):
+    leitor, escritor = await asyncio.open_connection(ENDERECO, porta, limit=1 << 20)
+    cpf = f"{indice:011d}"
+    await requisitar(leitor, escritor, "cadastrar_usuario", cpf, f"Cliente {indice}", "01-01-1990", "Rua A, 1")
+    resposta = await requisitar(leitor, escritor, "criar_conta", cpf, 1_000, 10**9)
+    numero_conta = resposta[1]
+    aleatorio = random.Random(indice)
+    await largada.wait()
+
+    for _ in range(operacoes):
+        sorteio = aleatorio.random()
+        if sorteio < 0.45:
+            campos = ("depositar", cpf, numero_conta, aleatorio.randint(1, 500))
+        elif sorteio < 0.9:
+            campos = ("sacar", cpf, numero_conta, aleatorio.randint(1, 500))
+        else:
+            campos = ("exibir_extrato", cpf, numero_conta)
+        inicio = time.perf_counter()
+        resposta = await requisitar(leitor, escritor, *campos)
+        latencias.append(time.perf_counter() - inicio)
+        if resposta[0] != "OK" and resposta[1] != "Saldo insuficiente.":
+            erros.append(resposta[1])
+    escritor.close()
+    await escritor.wait_closed()
+
+async def gerar_carga(clientes: int, operacoes: int, porta: int) -> tuple[float, list[float], list[str]]:
+    latencias: list[float] = []
+    erros: list[str] = []
+    largada = asyncio.Barrier(clientes + 1)
+    tarefas = [asyncio.create_task(cliente(i, porta, operacoes, largada, latencias, erros)) for i in range(clientes)]
+    await largada.wait()
+    inicio = time.perf_counter()
+    await asyncio.gather(*tarefas)
+    return time.perf_counter() - inicio, latencias, erros
+
+def percentil(ordenadas: list[float], fracao: float) -> float:
+    return ordenadas[min(len(ordenadas) - 1, int(fracao * len(ordenadas)))]
+
+def main():
+    clientes = int(sys.argv[1]) if len(sys.argv) > 1 else CLIENTES
+    operacoes = int(sys.argv[2]) if len(sys.argv) > 2 else OPERACOES
+    porta = int(sys.argv[3]) if len(sys.argv) > 3 else PORTA
+    caminho_servidor = os.path.join(os.path.dirname(os.path.abspath(__file__)), "servidor_banco.py")
+    servidor = subprocess.Popen([sys.executable, caminho_servidor, str(porta)], stdout=subprocess.PIPE, text=True)
+    try:
+        servidor.stdout.readline()
+        duracao, latencias, erros = asyncio.run(gerar_carga(clientes, operacoes, porta))
+    finally:
+        servidor.terminate()
+        servidor.wait()
+
+    latencias.sort()
+    print(f"{clientes} clientes simultâneos, {operacoes} operações cada")
+    print(f"operações/s: {len(latencias) / duracao:,.0f}  ({len(latencias)} em {duracao:.2f} s)")
+    print(f"latência p50: {percentil(latencias, 0.50) * 1000:.2f} ms  p99: {percentil(latencias, 0.99) * 1000:.2f} ms")
+    if erros:
+        print(f"{len(erros)} respostas de erro inesperadas, ex.: {erros[0]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# Servidor TCP assíncrono (asyncio) para as operações do Banco_OOP: atende milhares de
+# clientes ao mesmo tempo em uma única thread, no lugar do laço bloqueado em input().
+# Protocolo de linhas UTF-8 com campos separados por TAB. Cada requisição recebe uma
+# resposta "OK[\t...]" ou "ERRO\t<mensagem>", na ordem de chegada (pode haver pipelining):
+#   cadastrar_usuario  cpf  nome  data_nascimento  endereco        -> OK
+#   criar_conta        cpf  limite_valor_saque  limite_saques_diarios -> OK  numero_conta
+#   depositar          cpf  numero_conta  valor                     -> OK  saldo
+#   sacar              cpf  numero_conta  valor                     -> OK  saldo
+#   exibir_extrato     cpf  numero_conta                            -> OK  saldo  n
+#                      seguida de n linhas: tipo  valor  data
+# Uso: python servidor_banco.py [porta]
+import asyncio
+import sys
+
+from Banco_OOP import OPERACAO_OK, ContaCorrente, Deposito, PessoaFisica, RegistroClientes, RegistroContas, Saque
+from banco_comum.dinheiro import Dinheiro
+
+ENDERECO = "127.0.0.1"
+PORTA = 8765
+# Com mais bytes pendentes que isso para um cliente, o servidor espera ele ler antes de continuar.
+LIMITE_BUFFER_ESCRITA = 1 << 16
+
+def _valor(texto: str) -> Dinheiro:
+    # Em reais, como digitado no menu ("12.34", "12,34"); "nan" e "inf" não são aceitos.
+    try:
+        return Dinheiro.de_texto(texto)
+    except ValueError:
+        raise ValueError("Valor inválido. Informe um número.") from None
+
+def _inteiro(texto: str) -> int:
+    try:
+        return int(texto)
+    except ValueError:
+        raise ValueError("Número inválido.") from None
+
+class ServicoBanco:
+    # Cada operação roda inteira entre dois awaits, então o laço de eventos já as
+    # serializa e os modelos do Banco_OOP não precisam de travas.
+    __slots__ = ("clientes", "contas", "_comandos")
+
+    def __init__(self):
+        self.clientes = RegistroClientes()
+        self.contas = RegistroContas()
+        self._comandos = {
+            "cadastrar_usuario": (self.cadastrar_usuario, 4),
+            "criar_conta": (self.criar_conta, 3),
+            "depositar": (self.depositar, 3),
+            "sacar": (self.sacar, 3),
+            "exibir_extrato": (self.exibir_extrato, 2),
+        }
+
+    def executar(self, linha: bytes) -> str:
+        try:
+            comando, *campos = linha.decode("utf-8").rstrip("\r\n").split("\t")
+            operacao = self._comandos.get(comando)
+            if operacao is None:
+                return "ERRO\tComando desconhecido.\n"
+            funcao, quantidade_campos = operacao
+            if len(campos) != quantidade_campos:
+                return f"ERRO\t{comando} espera {quantidade_campos} campos.\n"
+            return funcao(*campos)
+        except ValueError as erro:
+            return f"ERRO\t{erro}\n"
+
+    def _cliente(self, cpf: str) -> PessoaFisica:
+        cliente = self.clientes.buscar_por_cpf(cpf)
+        if cliente is None:
+            raise ValueError("Cliente não encontrado.")
+        return cliente
+
+    def _conta(self, cpf: str, numero_conta: str) -> ContaCorrente:
+        conta = self._cliente(cpf).buscar_conta(_inteiro(numero_conta))
+        if conta is None:
+            raise ValueError("Conta não encontrada para este cliente.")
+        return conta
+
+    def cadastrar_usuario(self, cpf: str, nome: str, data_nascimento: str, endereco: str) -> str:
+        if not self.clientes.adicionar(PessoaFisica(cpf=cpf, nome=nome, data_nascimento=data_nascimento,
+                                                    endereco=endereco)):
+            raise ValueError("Já existe um cliente com este CPF.")
+        return "OK\n"
+
+    def criar_conta(self, cpf: str, limite_valor_saque: str, limite_saques_diarios: str) -> str:
+        cliente = self._cliente(cpf)
+        conta = ContaCorrente(cliente=cliente, numero=self.contas.proximo_numero,
+                              limite_valor_saque=_valor(limite_valor_saque),
+                              limite_saques_diarios_cc=_inteiro(limite_saques_diarios))
+        self.contas.adicionar(conta)
+        cliente.adicionar_conta(conta)
+        self.clientes.registrar_conta(conta)
+        return f"OK\t{conta.numero}\n"
+
+    # Depósito e saque usam a validação e a movimentação dos modelos sem passar por
+    # Conta.depositar/sacar, que imprimem uma mensagem por operação no console do servidor.
+    def depositar(self, cpf: str, numero_conta: str, valor: str) -> str:
+        conta = self._conta(cpf, numero_conta)
+        valor = _valor(valor)
+        if conta._validar_deposito(valor) != OPERACAO_OK:
+            raise ValueError("O valor do depósito deve ser positivo.")
+        conta._creditar(valor)
+        conta.historico.adicionar_transacao(Deposito(valor))
+        return f"OK\t{conta.saldo:.2f}\n"
+
+    def sacar(self, cpf: str, numero_conta: str, valor: str) -> str:
+        conta = self._conta(cpf, numero_conta)
+        valor = _valor(valor)
+        motivo = conta._validar_saque(valor)
+        if motivo != OPERACAO_OK:
+            raise ValueError(conta._mensagem_recusa_saque(motivo, valor))
+        conta._debitar(valor)
+        conta.historico.adicionar_transacao(Saque(valor))
+        return f"OK\t{conta.saldo:.2f}\n"
+
+    def exibir_extrato(self, cpf: str, numero_conta: str) -> str:
+        conta = self._conta(cpf, numero_conta)
+        transacoes = conta.historico.transacoes
+        linhas = [f"OK\t{conta.saldo:.2f}\t{len(transacoes)}\n"]
+        linhas.extend(f"{type(transacao).__name__}\t{transacao.valor:.2f}\t{transacao.data.strftime('%d/%m/%Y %H:%M:%S')}\n"
+                      for transacao in transacoes)
+        return "".join(linhas)
+
+async def atender(servico: ServicoBanco, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+    try:
+        while linha := await leitor.readline():
+            escritor.write(servico.executar(linha).encode("utf-8"))
+            if escritor.transport.get_write_buffer_size() > LIMITE_BUFFER_ESCRITA:
+                await escritor.drain()
+    except (ConnectionError, ValueError):
+        # ValueError: linha maior que o limite do StreamReader.
+        pass
+    finally:
+        escritor.close()
+
+async def servir(porta: int = PORTA, servico: ServicoBanco | None = None):
+    servico = servico if servico is not None else ServicoBanco()
+    servidor = await asyncio.start_server(lambda leitor, escritor: atender(servico, leitor, escritor),
+                                          ENDERECO, porta, backlog=4096)
+    print(f"Servidor do banco em {ENDERECO}:{porta}", flush=True)
+    async with servidor:
+        await servidor.serve_forever()
+
+def main():
+    porta = int(sys.argv[1]) if len(sys.argv) > 1 else PORTA
+    try:
+        asyncio.run(servir(porta))
+    except KeyboardInterrupt:
+        print("\nServidor encerrado.")
+
+if __name__ == "__main__":
+    main()
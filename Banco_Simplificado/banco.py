@@ -2,12 +2,23 @@
 # Este código simula um sistema bancário simples com opções de levantar, depositar e extrato.
 # Importa a biblioteca msvcrt para capturar entradas do teclado sem pressionar Enter
 import msvcrt
+import os
+import sys
+from types import SimpleNamespace
 
-limite_saque = 500 # Limite de saque por transação
-saldo = 0 # Saldo inicial da conta
-limite_movimentacao = 5000 # Limite de depósitos 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from banco_comum.contadores_diarios import CalendarioDiario
+from banco_comum.dinheiro import Dinheiro
+from banco_comum.regras_limites import (LimitePorOperacao, LimiteQuantidadeDiaria, SaldoSuficiente, TetoMovimentacao,
+                            ValorPositivo, compilar_regras)
+
+limite_saque = Dinheiro.de_reais(500) # Limite de saque por transação
+saldo = Dinheiro(0) # Saldo inicial da conta (Dinheiro: centavos em int)
+limite_movimentacao = Dinheiro.de_reais(5000) # Limite de depósitos 
 saques_diarios = 3 # Limite de saques diários 3
-saques_realizados = 0 # Contador de saques realizados hoje
+saques_realizados = 0 # Contador de saques realizados no dia dia_saques
+dia_saques = 0 # Dia (ordinal) a que saques_realizados se refere
+calendario = CalendarioDiario() # Dia corrente; o contador é zerado no primeiro levantamento de outro dia
 extrato = [] # Lista para armazenar o extrato de movimentações
 
 err="\033[91m" # Código de erro (vermelho)
@@ -16,6 +27,20 @@ normal="\033[0m" # Código normal (reset)
 
 mensagem= ""
 
+# Os limites fixos entram nas funções compiladas como literais; o estado da conta (saldo e
+# saques do dia) é passado a cada chamada.
+VALOR_INVALIDO, SALDO_INSUFICIENTE, LIMITE_SAQUE, LIMITE_SAQUES_DIARIOS, LIMITE_MOVIMENTACAO = range(1, 6)
+validar_levantamento = compilar_regras((
+    ValorPositivo(VALOR_INVALIDO),
+    SaldoSuficiente(SALDO_INSUFICIENTE, saldo="saldo"),
+    LimitePorOperacao(LIMITE_SAQUE, limite=limite_saque),
+    LimiteQuantidadeDiaria(LIMITE_SAQUES_DIARIOS, limite=saques_diarios, realizadas="saques_realizados"),
+), nome="validar_levantamento")
+validar_deposito = compilar_regras((
+    ValorPositivo(VALOR_INVALIDO),
+    TetoMovimentacao(LIMITE_MOVIMENTACAO, teto=limite_movimentacao, saldo="saldo"),
+), nome="validar_deposito")
+
 # Limpa a tela do console
 def limpar_tela():
     print("\033[H\033[J", end='')
@@ -25,11 +50,12 @@ def depositar():
     global saldo, limite_movimentacao, extrato, mensagem
     print("\n=== Depósito ===")
     try:
-        valor = float(input("Digite o valor a ser depositado: "))
-        if valor <= 0:
+        valor = Dinheiro.de_texto(input("Digite o valor a ser depositado: "))
+        motivo = validar_deposito(SimpleNamespace(saldo=saldo), valor)
+        if motivo == VALOR_INVALIDO:
             mensagem = f"{err}\nValor inválido. O depósito deve ser maior que zero.{normal}"
             return
-        if valor + saldo > limite_movimentacao:
+        if motivo == LIMITE_MOVIMENTACAO:
             mensagem = f"{err}\nLimite de movimentação excedido. O depósito não foi realizado.{normal}"
             return
         saldo += valor
@@ -53,20 +79,24 @@ def estrato():
 
 def levantar():
     global saldo, limite_saque, extrato, mensagem, saques_realizados
-    global saques_diarios
+    global saques_diarios, dia_saques
     print("\n=== Levantar ===")
     try:
-        valor = float(input("Digite o valor a ser levantado: "))
-        if valor <= 0:
+        valor = Dinheiro.de_texto(input("Digite o valor a ser levantado: "))
+        if dia_saques != calendario.dia:
+            dia_saques = calendario.dia
+            saques_realizados = 0
+        motivo = validar_levantamento(SimpleNamespace(saldo=saldo, saques_realizados=saques_realizados), valor)
+        if motivo == VALOR_INVALIDO:
             mensagem = f"{err}\nValor inválido. O levantamento deve ser maior que zero.{normal}"
             return
-        if valor > saldo:
+        if motivo == SALDO_INSUFICIENTE:
             mensagem = f"{err}\nSaldo insuficiente para o levantamento.{normal}"
             return
-        if valor > limite_saque:
+        if motivo == LIMITE_SAQUE:
             mensagem = f"{err}\nValor excede o limite de saque de R$ {limite_saque:.2f}.{normal}"
             return
-        if saques_realizados >= saques_diarios:
+        if motivo == LIMITE_SAQUES_DIARIOS:
             mensagem = f"{err}\nLimite de saques diários excedido. Você já realizou {saques_realizados} saques hoje.{normal}"
             return
         saldo -= valor
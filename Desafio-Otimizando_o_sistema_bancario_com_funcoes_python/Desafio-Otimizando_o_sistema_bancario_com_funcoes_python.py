@@ -1,21 +1,115 @@
+import os
+import sys
+from collections.abc import Sequence
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from banco_comum.dinheiro import Dinheiro
+from banco_comum.regras_limites import LimitePorOperacao, LimiteQuantidadeDiaria, SaldoSuficiente, ValorPositivo, compilar_regras
 
 CORERRO = '\033[91m'    # Vermelho para erros
 CORPADRAO = '\033[0m'   # Cor padrão (reset)
 CORSUCESSO = '\033[92m'  # Verde para sucesso
 
+# O extrato é uma lista de movimentações (tipo, valor) que só cresce; o texto é montado
+# apenas na exibição, em contacorrente. Saldo, limite e valores são Dinheiro (centavos em
+# int); sacar e depositar ainda aceitam float e int em reais, convertidos na entrada.
+DEPOSITO = "Depósito"
+SAQUE = "Saque"
+
+# Usuários e contas (os mesmos dicts de sempre) com índices por CPF. Guardam a lista em vez
+# de herdar de list: só append altera os itens, então extend, insert, += e companhia não
+# podem deixar o índice para trás. As funções abaixo também aceitam listas comuns.
+class Usuarios(Sequence):
+    def __init__(self, usuarios=()):
+        self._usuarios = []
+        self.por_cpf = {}
+        for usuario in usuarios:
+            self.append(usuario)
+
+    def __len__(self):
+        return len(self._usuarios)
+
+    def __getitem__(self, indice):
+        return self._usuarios[indice]
+
+    def __iter__(self):
+        return iter(self._usuarios)
+
+    def append(self, usuario):
+        if usuario['cpf'] in self.por_cpf:
+            raise ValueError(f"CPF já cadastrado: {usuario['cpf']}")
+        self._usuarios.append(usuario)
+        self.por_cpf[usuario['cpf']] = usuario
+
+    def buscar(self, cpf):
+        return self.por_cpf.get(cpf)
+
+class Contas(Sequence):
+    def __init__(self, contas=()):
+        self._contas = []
+        self.por_cpf = {}
+        for conta in contas:
+            self.append(conta)
+
+    def __len__(self):
+        return len(self._contas)
+
+    def __getitem__(self, indice):
+        return self._contas[indice]
+
+    def __iter__(self):
+        return iter(self._contas)
+
+    def append(self, conta):
+        self._contas.append(conta)
+        self.por_cpf.setdefault(conta['usuario'], []).append(conta)
+
+    def do_usuario(self, cpf):
+        return self.por_cpf.get(cpf, [])
+
+def usuarios_por_cpf(usuarios):
+    if isinstance(usuarios, Usuarios):
+        return usuarios.por_cpf
+    indice = {}
+    for usuario in usuarios:
+        indice.setdefault(usuario['cpf'], usuario)
+    return indice
+
+def contas_por_cpf(contas):
+    if isinstance(contas, Contas):
+        return contas.por_cpf
+    indice = {}
+    for conta in contas:
+        indice.setdefault(conta['usuario'], []).append(conta)
+    return indice
+
+# Mesma ordem de antes, com o valor inválido verificado primeiro; cada regra
+# devolve o índice da sua mensagem em RECUSAS_SAQUE.
+RECUSAS_SAQUE = (
+    None,
+    "Operação falhou! O valor informado é inválido.",
+    "Operação falhou! Você não tem saldo suficiente.",
+    "Operação falhou! O valor do saque excede o limite.",
+    "Operação falhou! Número máximo de saques excedido.",
+)
+validar_saque = compilar_regras((
+    ValorPositivo(1),
+    SaldoSuficiente(2, saldo="saldo"),
+    LimitePorOperacao(3, limite="limite"),
+    LimiteQuantidadeDiaria(4, limite="limite_saques", realizadas="numero_saques"),
+), nome="validar_saque")
+
 def sacar(*, saldo, valor, extrato, limite, numero_saques, LIMITE_SAQUES):
     global CORERRO, CORPADRAO, CORSUCESSO
-    if valor > saldo:
-        print(f"{CORERRO}Operação falhou! Você não tem saldo suficiente.{CORPADRAO}")
-    elif valor > limite:
-        print(f"{CORERRO}Operação falhou! O valor do saque excede o limite.{CORPADRAO}")
-    elif numero_saques >= LIMITE_SAQUES:
-        print(f"{CORERRO}Operação falhou! Número máximo de saques excedido.{CORPADRAO}")
-    elif valor <= 0:
-        print(f"{CORERRO}Operação falhou! O valor informado é inválido.{CORPADRAO}")
+    saldo, valor, limite = Dinheiro.de_reais(saldo), Dinheiro.de_reais(valor), Dinheiro.de_reais(limite)
+    motivo = validar_saque(SimpleNamespace(saldo=saldo, limite=limite, numero_saques=numero_saques,
+                                           limite_saques=LIMITE_SAQUES), valor)
+    if motivo:
+        print(f"{CORERRO}{RECUSAS_SAQUE[motivo]}{CORPADRAO}")
     else:
         saldo -= valor
-        extrato += f"Saque: R$ {valor:.2f}\n"
+        extrato.append((SAQUE, valor))
         numero_saques += 1
     return saldo, extrato
 
@@ -25,35 +119,43 @@ def listar_contas(contas,usuarios):
         print(f"{CORERRO}Nenhuma conta cadastrada.{CORPADRAO}")
         return
     print("\nLista de Contas:")
+    indice = usuarios_por_cpf(usuarios)
     for conta in contas:
-        usuario = next((u for u in usuarios if u['cpf'] == conta['usuario']), None)
+        usuario = indice.get(conta['usuario'])
         print(f"Agência: {conta['agencia']}, Número da Conta: {conta['numero_conta']}, Usuário: {usuario['nome']}")
 
     
     
 def depositar(saldo, valor, extrato, /):
     global CORERRO, CORPADRAO, CORSUCESSO
+    saldo, valor = Dinheiro.de_reais(saldo), Dinheiro.de_reais(valor)
     if valor > 0:
         saldo += valor
-        extrato += f"Depósito: R$ {valor:.2f}\n"
+        extrato.append((DEPOSITO, valor))
     else:
         print(f"{CORERRO}Operação falhou! O valor informado é inválido.{CORPADRAO}")
     return saldo,valor, extrato
     
 
+def formatar_movimentacao(movimentacao):
+    tipo, valor = movimentacao
+    return f"{tipo}: R$ {valor:.2f}\n"
+
 def contacorrente(saldo,/,*, extrato):
     print("\n================ EXTRATO ================")
-    print("Não foram realizadas movimentações." if not extrato else extrato)
+    if not extrato:
+        print("Não foram realizadas movimentações.")
+    else:
+        sys.stdout.writelines(map(formatar_movimentacao, extrato))
     print(f"\nSaldo: R$ {saldo:.2f}")
     print("==========================================")
 
 def criar_usuario(usuarios):
     global CORERRO, CORSUCESSO, CORPADRAO
     cpf = input("CPF (apenas números): ") 
-    for usuario in usuarios: 
-        if usuario['cpf'] == cpf:
-            print(f"{CORERRO}CPF já cadastrado. Não é possível criar um novo usuário.{CORPADRAO}")
-            return None
+    if cpf in usuarios_por_cpf(usuarios):
+        print(f"{CORERRO}CPF já cadastrado. Não é possível criar um novo usuário.{CORPADRAO}")
+        return None
     nome = input("Nome do Usuário: ")
     data_nascimento = input("Data de Nascimento (dd/mm/aaaa): ")
       
@@ -79,14 +181,12 @@ def criar_conta(contas, usuarios):
     global CORERRO, CORSUCESSO, CORPADRAO
     
     cpf_usuario = input("CPF do usuário: ")
-    cpf_encontrado = any(usuario['cpf'] == cpf_usuario for usuario in usuarios)
-    if not cpf_encontrado:
+    usuario_encontrado = usuarios_por_cpf(usuarios).get(cpf_usuario)
+    if usuario_encontrado is None:
         print(f"{CORERRO}O usuário não se encontra cadastrado. Não é possível criar uma nova conta.{CORPADRAO}")
         return None
-        
-    usuario_encontrado = next((u for u in usuarios if u['cpf'] == cpf_usuario), None)
-    if usuario_encontrado:
-        print(f"{usuario_encontrado['nome']}.")
+
+    print(f"{usuario_encontrado['nome']}.")
     contas.append({
         "agencia": agencia,
         "numero_conta": numero_conta,
@@ -111,25 +211,27 @@ def menu():
     => """)
     return input("Selecione uma opção: ")
 
-def listar_usuarios(usuarios):
+def listar_usuarios(usuarios, contas=()):
     global CORERRO, CORSUCESSO, CORPADRAO
     if not usuarios:
         print(f"{CORERRO}Nenhum usuário cadastrado.{CORPADRAO}")
         return
     print("\nLista de Usuários:")
+    indice = contas_por_cpf(contas)
     for usuario in usuarios:
-        print(f"Nome: {usuario['nome']}, Data de Nascimento: {usuario['data_nascimento']}, CPF: {usuario['cpf']}, Endereço: {usuario['endereco']}")
+        numeros = ", ".join(str(conta['numero_conta']) for conta in indice.get(usuario['cpf'], ())) or "nenhuma"
+        print(f"Nome: {usuario['nome']}, Data de Nascimento: {usuario['data_nascimento']}, CPF: {usuario['cpf']}, Endereço: {usuario['endereco']}, Contas: {numeros}")
 
 def main():
     
     
 
-    usuarios = []
-    contas=[]
+    usuarios = Usuarios()
+    contas = Contas()
 
-    saldo = 0
-    limite = 500
-    extrato = ""
+    saldo = Dinheiro(0)
+    limite = Dinheiro.de_reais(500)
+    extrato = []
     numero_saques = 0
     LIMITE_SAQUES = 3
 
@@ -138,17 +240,25 @@ def main():
         opcao=menu()
 
         if opcao == "d":
-            valor = float(input("Informe o valor do depósito: "))
+            try:
+                valor = Dinheiro.de_texto(input("Informe o valor do depósito: "))
+            except ValueError:
+                print(f"{CORERRO}Operação falhou! O valor informado é inválido.{CORPADRAO}")
+                continue
             saldo,valor,extrato=depositar(saldo,valor,extrato)
         elif opcao == "l":
-            listar_usuarios(usuarios)
+            listar_usuarios(usuarios, contas)
         elif opcao == "c":
             resposta = criar_usuario(usuarios)
             if resposta is not None:
                 usuarios = resposta
         elif opcao == "s":
-            valor = float(input("Informe o valor do saque: "))
-            saldo,extrato = sacar(saque=valor, saldo=saldo, extrato=extrato, limite=limite, numero_saques=numero_saques, LIMITE_SAQUES=LIMITE_SAQUES)
+            try:
+                valor = Dinheiro.de_texto(input("Informe o valor do saque: "))
+            except ValueError:
+                print(f"{CORERRO}Operação falhou! O valor informado é inválido.{CORPADRAO}")
+                continue
+            saldo,extrato = sacar(valor=valor, saldo=saldo, extrato=extrato, limite=limite, numero_saques=numero_saques, LIMITE_SAQUES=LIMITE_SAQUES)
 
 
         elif opcao == "e":
@@ -167,4 +277,5 @@ def main():
         else:
             print(f"{CORERRO}Operação inválida, por favor selecione novamente a operação desejada.{CORPADRAO}")
 
-main()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# Benchmark: extrato como lista de movimentações contra a concatenação de strings anterior
+# (extrato += f"..." a cada operação). Mede depositar/sacar por operação em tamanhos
+# crescentes e a montagem do extrato para exibição com 1M de movimentações.
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+import time
+
+CAMINHO = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                       "Desafio-Otimizando_o_sistema_bancario_com_funcoes_python.py")
+MOVIMENTACOES = 1_000_000
+# A concatenação copia o extrato inteiro a cada operação; acima disso fica lenta demais.
+MAXIMO_CONCATENACAO = 100_000
+
+def carregar_desafio():
+    especificacao = importlib.util.spec_from_file_location("desafio", CAMINHO)
+    modulo = importlib.util.module_from_spec(especificacao)
+    especificacao.loader.exec_module(modulo)
+    return modulo
+
+def depositar_concatenando(saldo, valor, extrato, /):
+    # Implementação anterior de depositar.
+    if valor > 0:
+        saldo += valor
+        extrato += f"Depósito: R$ {valor:.2f}\n"
+    return saldo, valor, extrato
+
+def sacar_concatenando(*, saldo, valor, extrato, limite, numero_saques, LIMITE_SAQUES):
+    # Implementação anterior de sacar, sem as mensagens de recusa.
+    if 0 < valor <= saldo and valor <= limite and numero_saques < LIMITE_SAQUES:
+        saldo -= valor
+        extrato += f"Saque: R$ {valor:.2f}\n"
+    return saldo, extrato
+
+def movimentar(depositar, sacar, extrato, quantidade: int) -> float:
+    saldo = 0
+    inicio = time.perf_counter()
+    for i in range(quantidade):
+        if i % 4 == 3:
+            saldo, extrato = sacar(saldo=saldo, valor=1.5, extrato=extrato, limite=500, numero_saques=0,
+                                   LIMITE_SAQUES=3)
+        else:
+            saldo, _, extrato = depositar(saldo, 10.25, extrato)
+    return time.perf_counter() - inicio
+
+def main():
+    desafio = carregar_desafio()
+    maximo = int(sys.argv[1]) if len(sys.argv) > 1 else MOVIMENTACOES
+
+    print(f"{'movimentações':>13} | {'concatenação (µs/op)':>20} | {'lista (µs/op)':>13}")
+    print("-" * 54)
+    quantidade = 10_000
+    while quantidade <= maximo:
+        lista = movimentar(desafio.depositar, desafio.sacar, [], quantidade)
+        if quantidade <= MAXIMO_CONCATENACAO:
+            concatenacao = f"{movimentar(depositar_concatenando, sacar_concatenando, '', quantidade) / quantidade * 1e6:20.2f}"
+        else:
+            concatenacao = f"{'-':>20}"
+        print(f"{quantidade:>13,} | {concatenacao} | {lista / quantidade * 1e6:13.2f}")
+        quantidade *= 10
+
+    extrato = []
+    saldo = 0
+    for _ in range(maximo):
+        saldo, _, extrato = desafio.depositar(saldo, 10.25, extrato)
+    saida = io.StringIO()
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(saida):
+        desafio.contacorrente(saldo, extrato=extrato)
+    print(f"\nExibição do extrato com {maximo:,} movimentações: {time.perf_counter() - inicio:.2f} s "
+          f"({len(saida.getvalue()) / 1e6:.1f} MB de texto)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# Benchmark: cadastro de usuários e contas e listagem de contas com os índices por CPF
+# (Usuarios/Contas) contra as buscas lineares anteriores em listas. As funções do desafio
+# leem os dados com input(), que aqui é substituído por uma fila de respostas.
+import contextlib
+import importlib.util
+import os
+import sys
+import time
+
+CAMINHO = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                       "Desafio-Otimizando_o_sistema_bancario_com_funcoes_python.py")
+USUARIOS = 100_000
+# As buscas lineares são quadráticas no total; acima disso ficam lentas demais.
+MAXIMO_LINEAR = 10_000
+
+def carregar_desafio():
+    especificacao = importlib.util.spec_from_file_location("desafio", CAMINHO)
+    modulo = importlib.util.module_from_spec(especificacao)
+    especificacao.loader.exec_module(modulo)
+    return modulo
+
+def criar_usuario_linear(usuarios, cpf):
+    # Implementação anterior: percorre todos os usuários procurando o CPF.
+    for usuario in usuarios:
+        if usuario['cpf'] == cpf:
+            return None
+    usuarios.append({"nome": f"Usuário {cpf}", "data_nascimento": "01/01/1990", "cpf": cpf, "endereco": "Rua A, 1"})
+    return usuarios
+
+def criar_conta_linear(contas, usuarios, cpf):
+    if not any(usuario['cpf'] == cpf for usuario in usuarios):
+        return None
+    next((u for u in usuarios if u['cpf'] == cpf), None)
+    contas.append({"agencia": "0001", "numero_conta": len(contas) + 1, "usuario": cpf})
+    return contas
+
+def listar_contas_linear(contas, usuarios):
+    for conta in contas:
+        usuario = next((u for u in usuarios if u['cpf'] == conta['usuario']), None)
+        print(f"Agência: {conta['agencia']}, Número da Conta: {conta['numero_conta']}, Usuário: {usuario['nome']}")
+
+def fila(respostas: list[str]):
+    # Substituto de input(): ignora o prompt e devolve a próxima resposta.
+    respostas = iter(respostas)
+    return lambda prompt="": next(respostas)
+
+def medir(funcao, *argumentos) -> float:
+    with open(os.devnull, "w") as saida, contextlib.redirect_stdout(saida):
+        inicio = time.perf_counter()
+        funcao(*argumentos)
+        return time.perf_counter() - inicio
+
+def linear(quantidade: int) -> tuple[float, float, float]:
+    usuarios, contas = [], []
+    cpfs = [f"{cpf:011d}" for cpf in range(quantidade)]
+    cadastro = medir(lambda: [criar_usuario_linear(usuarios, cpf) for cpf in cpfs])
+    abertura = medir(lambda: [criar_conta_linear(contas, usuarios, cpf) for cpf in cpfs])
+    return cadastro, abertura, medir(listar_contas_linear, contas, usuarios)
+
+def indexado(desafio, quantidade: int) -> tuple[float, float, float]:
+    usuarios, contas = desafio.Usuarios(), desafio.Contas()
+    respostas = []
+    for cpf in range(quantidade):
+        respostas += [f"{cpf:011d}", f"Usuário {cpf}", "01/01/1990", "Rua A, 1"]
+    desafio.input = fila(respostas)
+    cadastro = medir(lambda: [desafio.criar_usuario(usuarios) for _ in range(quantidade)])
+    desafio.input = fila([f"{cpf:011d}" for cpf in range(quantidade)])
+    abertura = medir(lambda: [desafio.criar_conta(contas, usuarios) for _ in range(quantidade)])
+    return cadastro, abertura, medir(desafio.listar_contas, contas, usuarios)
+
+def main():
+    desafio = carregar_desafio()
+    maximo = int(sys.argv[1]) if len(sys.argv) > 1 else USUARIOS
+    print(f"{'usuários':>9} | {'busca':>8} | {'cadastro (s)':>12} | {'contas (s)':>10} | {'listagem (s)':>12}")
+    print("-" * 64)
+    quantidade = 1_000
+    while quantidade <= maximo:
+        resultados = [("índice", indexado(desafio, quantidade))]
+        if quantidade <= MAXIMO_LINEAR:
+            resultados.insert(0, ("linear", linear(quantidade)))
+        for busca, (cadastro, abertura, listagem) in resultados:
+            print(f"{quantidade:>9,} | {busca:>8} | {cadastro:12.3f} | {abertura:10.3f} | {listagem:12.3f}")
+        quantidade *= 10
+
+if __name__ == "__main__":
+    main()
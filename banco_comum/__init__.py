@@ -0,0 +1,8 @@
+# Código compartilhado pelas versões do banco (decoradores_iteradores_geradores, Banco_OOP,
+# Banco_Simplificado e o Desafio). Cada script roda de dentro da sua pasta, então quem
+# importa daqui coloca antes a raiz do repositório no fim do sys.path:
+#
+#     sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+#     from banco_comum.regras_limites import compilar_regras
+#
+# Os módulos deste pacote não importam nada das pastas dos bancos.
@@ -0,0 +1,100 @@
+# Baldes diários para os contadores de limite das contas (quantidade e volume de saques).
+# Cada conta guarda o dia do seu balde; antes de consultar os contadores ela compara esse
+# dia com CalendarioDiario.dia (um int, recalculado só quando o relógio passa da próxima
+# meia-noite) e zera o balde se ele for de um dia anterior. As contas que movimentaram em
+# cada dia ficam registradas no calendário, então a virada feita pelo AgendadorVirada à
+# meia-noite percorre só as contas ativas, não todas. Quem recebe a virada implementa
+# _virar_dia(dia) e deve zerar os contadores apenas se o balde for anterior a `dia`.
+import threading
+import time
+from datetime import date, datetime, timedelta, tzinfo
+from datetime import time as horario
+
+class CalendarioDiario:
+    def __init__(self, fuso: tzinfo | None = None, relogio=time.time):
+        # fuso None: o fuso local do sistema, com a regra de horário de verão vigente.
+        self._fuso = fuso
+        self._relogio = relogio
+        self._trava = threading.Lock()
+        self._ativas: dict[int, set] = {}
+        self._avancar()
+
+    def _agora(self) -> datetime:
+        if self._fuso is None:
+            return datetime.fromtimestamp(self._relogio()).astimezone()
+        return datetime.fromtimestamp(self._relogio(), self._fuso)
+
+    def _meia_noite(self, data: date) -> datetime:
+        if self._fuso is None:
+            return datetime.combine(data, horario.min).astimezone()
+        return datetime.combine(data, horario.min, tzinfo=self._fuso)
+
+    def _avancar(self):
+        with self._trava:
+            hoje = self._agora().date()
+            self._data = hoje
+            self._virada = self._meia_noite(hoje + timedelta(days=1)).timestamp()
+            self._dia = hoje.toordinal()
+
+    @property
+    def dia(self) -> int:
+        if self._relogio() >= self._virada:
+            self._avancar()
+        return self._dia
+
+    @property
+    def inicio_do_dia(self) -> datetime:
+        # Meia-noite do dia corrente, com fuso.
+        if self._relogio() >= self._virada:
+            self._avancar()
+        return self._meia_noite(self._data)
+
+    @property
+    def segundos_ate_virada(self) -> float:
+        return max(0.0, self._virada - self._relogio())
+
+    @property
+    def ativas(self) -> int:
+        return sum(len(contas) for contas in self._ativas.values())
+
+    def registrar(self, conta, dia: int):
+        # Chamado quando a conta abre o balde de `dia`.
+        contas = self._ativas.get(dia)
+        if contas is None:
+            with self._trava:
+                contas = self._ativas.setdefault(dia, set())
+        contas.add(conta)
+
+    def virar(self) -> int:
+        # Zera os baldes de dias anteriores; devolve quantas contas foram visitadas.
+        dia = self.dia
+        with self._trava:
+            antigos = [self._ativas.pop(anterior) for anterior in [d for d in self._ativas if d < dia]]
+        visitadas = 0
+        for contas in antigos:
+            for conta in contas:
+                conta._virar_dia(dia)
+            visitadas += len(contas)
+        return visitadas
+
+class AgendadorVirada:
+    # Thread que dorme até a próxima meia-noite do calendário e chama virar().
+    def __init__(self, calendario: CalendarioDiario):
+        self._calendario = calendario
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._executar, name="virada-diaria", daemon=True)
+        self._thread.start()
+
+    def _executar(self):
+        while not self._parar.wait(self._calendario.segundos_ate_virada):
+            self._calendario.virar()
+
+    def fechar(self):
+        self._parar.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
@@ -0,0 +1,103 @@
+# Valor monetário em ponto fixo: um int com a quantidade de centavos. Somas, subtrações e
+# comparações são exatas (sem o arrasto de float) e a comparação, o hash e a conversão
+# para int continuam sendo as do próprio int. Operações aceitam outro Dinheiro ou um int,
+# que é tratado como centavos (uso interno); int(d) devolve os centavos e float(d) os reais.
+# Na fronteira pública (depósitos, saques, limites, lotes) de_reais lê float, int e texto
+# como reais, como sempre foi; quem já tem centavos passa Dinheiro(centavos).
+class Dinheiro(int):
+    __slots__ = ()
+
+    @classmethod
+    def de_reais(cls, valor: 'Dinheiro | int | float | str') -> 'Dinheiro':
+        # float primeiro: é o que chega de lotes e de código legado.
+        if type(valor) is float:
+            return cls(round(valor * 100))
+        if isinstance(valor, Dinheiro):
+            return valor
+        if isinstance(valor, int):
+            return cls(valor * 100)
+        if isinstance(valor, str):
+            return cls.de_texto(valor)
+        return cls(round(valor * 100))
+
+    @classmethod
+    def de_texto(cls, texto: str) -> 'Dinheiro':
+        # Aceita "1234", "1234,5", "1.234,56", "1234.56" e "R$ 10,00"; com vírgula, ela é o
+        # separador decimal e os pontos separam milhares, como na digitação em português.
+        texto = texto.strip()
+        # Caminho rápido para "1234" e "1234.56", os formatos mais comuns em arquivos e lotes.
+        sem_ponto = texto.replace(".", "", 1)
+        if sem_ponto.isdecimal():
+            if len(sem_ponto) == len(texto):
+                return cls(int(texto) * 100)
+            if len(texto) > 3 and texto[-3] == ".":
+                return cls(int(sem_ponto))
+        original = texto
+        texto = texto.removeprefix("R$").strip()
+        negativo = texto.startswith("-")
+        if negativo:
+            texto = texto[1:]
+        if "," in texto:
+            inteiro, _, fracao = texto.rpartition(",")
+            inteiro = inteiro.replace(".", "")
+        else:
+            inteiro, ponto, fracao = texto.rpartition(".")
+            if not ponto or len(fracao) > 2:
+                inteiro, fracao = texto.replace(".", ""), ""
+        if not inteiro and fracao:
+            inteiro = "0"
+        if not inteiro.isdecimal() or (fracao and not fracao.isdecimal()) or len(fracao) > 2:
+            raise ValueError(f"Valor monetário inválido: {original!r}")
+        centavos = int(inteiro) * 100 + (int(fracao.ljust(2, "0")) if fracao else 0)
+        return cls(-centavos if negativo else centavos)
+
+    @property
+    def centavos(self) -> int:
+        return int(self)
+
+    def __add__(self, outro):
+        if isinstance(outro, int):
+            return Dinheiro(int.__add__(self, outro))
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, outro):
+        if isinstance(outro, int):
+            return Dinheiro(int.__sub__(self, outro))
+        return NotImplemented
+
+    def __rsub__(self, outro):
+        if isinstance(outro, int):
+            return Dinheiro(int.__rsub__(self, outro))
+        return NotImplemented
+
+    def __mul__(self, fator):
+        if isinstance(fator, int):
+            return Dinheiro(int.__mul__(self, fator))
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return Dinheiro(int.__neg__(self))
+
+    def __abs__(self):
+        return Dinheiro(int.__abs__(self))
+
+    def __float__(self) -> float:
+        return int(self) / 100
+
+    def __str__(self) -> str:
+        reais, centavos = divmod(abs(int(self)), 100)
+        return f"{'-' if self < 0 else ''}{reais}.{centavos:02d}"
+
+    def __repr__(self) -> str:
+        return f"Dinheiro('{self}')"
+
+    def __format__(self, especificacao: str) -> str:
+        # Para exibição: até 2**53 centavos o float mais próximo de centavos/100 sempre
+        # volta ao mesmo texto com duas casas, então ":.2f" continua exato.
+        if not especificacao:
+            return str(self)
+        return format(int(self) / 100, especificacao)
@@ -0,0 +1,148 @@
+# Índices de clientes e de contas compartilhados pelo banco de decoradores_iteradores_geradores
+# e pelo Banco_OOP. Só dependem dos atributos dos modelos (cpf, nome, contas; numero,
+# agencia, cliente), então servem às classes de cada banco. As travas protegem as escritas
+# dos caixas em threads; no Banco_OOP, de uma thread só, custam pouco.
+import threading
+from bisect import bisect_left
+from collections.abc import Iterable
+
+# Todo nome que começa com o prefixo fica antes de prefixo + este caractere.
+_MAIOR_CARACTERE = chr(0x10FFFF)
+
+def normalizar_cpf(cpf: str) -> str:
+    if cpf.isdigit():
+        return cpf
+    return "".join(c for c in cpf if c.isdigit())
+
+class RegistroClientes:
+    # Índice principal por CPF normalizado e índices secundários por conta e por nome.
+    # O índice por nome é uma lista ordenada reconstruída apenas quando necessário.
+    def __init__(self):
+        self._por_cpf: dict[str, 'PessoaFisica'] = {}
+        self._por_conta: dict[int, 'PessoaFisica'] = {}
+        self._nomes: list[tuple[str, str]] = []
+        self._nomes_ordenados = True
+        self._trava = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._por_cpf)
+
+    def __iter__(self):
+        return iter(self._por_cpf.values())
+
+    def __contains__(self, cpf: str) -> bool:
+        return normalizar_cpf(cpf) in self._por_cpf
+
+    def adicionar(self, cliente: 'PessoaFisica') -> bool:
+        chave = normalizar_cpf(cliente.cpf)
+        with self._trava:
+            if chave in self._por_cpf:
+                return False
+            self._por_cpf[chave] = cliente
+            self._nomes.append((cliente.nome.lower(), chave))
+            self._nomes_ordenados = False
+        for conta in cliente.contas:
+            self._por_conta[conta.numero] = cliente
+        return True
+
+    def adicionar_lote(self, clientes: Iterable['PessoaFisica']) -> list['PessoaFisica']:
+        # Mesmo efeito de adicionar para cada cliente, com uma única aquisição da trava.
+        # Devolve os clientes aceitos, na ordem (CPFs já cadastrados são ignorados).
+        aceitos = []
+        with self._trava:
+            for cliente in clientes:
+                chave = normalizar_cpf(cliente.cpf)
+                if chave in self._por_cpf:
+                    continue
+                self._por_cpf[chave] = cliente
+                self._nomes.append((cliente.nome.lower(), chave))
+                for conta in cliente.contas:
+                    self._por_conta[conta.numero] = cliente
+                aceitos.append(cliente)
+            if aceitos:
+                self._nomes_ordenados = False
+        return aceitos
+
+    def registrar_conta(self, conta: 'Conta'):
+        self._por_conta[conta.numero] = conta.cliente
+
+    def buscar_por_cpf(self, cpf: str) -> 'PessoaFisica | None':
+        return self._por_cpf.get(normalizar_cpf(cpf))
+
+    def buscar_por_conta(self, numero_conta: int) -> 'PessoaFisica | None':
+        return self._por_conta.get(numero_conta)
+
+    def buscar_por_nome(self, prefixo: str):
+        # Ordena e copia a faixa do prefixo sob a trava, para que um adicionar concorrente
+        # não mexa na lista durante o sort nem durante a iteração.
+        prefixo = prefixo.lower()
+        with self._trava:
+            if not self._nomes_ordenados:
+                self._nomes.sort()
+                self._nomes_ordenados = True
+            inicio = bisect_left(self._nomes, (prefixo, ""))
+            fim = bisect_left(self._nomes, (prefixo + _MAIOR_CARACTERE, ""), inicio)
+            encontrados = self._nomes[inicio:fim]
+        for _, chave in encontrados:
+            yield self._por_cpf[chave]
+
+class RegistroContas:
+    # Índice de todas as contas do banco por número e por (agência, número),
+    # preservando a ordem de criação para listagens e para o ContasIterator.
+    # _maior_numero acompanha todas as contas aceitas (criadas, importadas ou recuperadas do
+    # diário), e os números novos partem dele, não da quantidade de contas.
+    _PRIMEIRO_NUMERO = 1001
+
+    def __init__(self):
+        self._contas: list['Conta'] = []
+        self._por_numero: dict[int, 'Conta'] = {}
+        self._por_agencia_numero: dict[tuple[str, int], 'Conta'] = {}
+        self._maior_numero = RegistroContas._PRIMEIRO_NUMERO - 1
+        self._trava = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._contas)
+
+    def __getitem__(self, indice: int) -> 'Conta':
+        return self._contas[indice]
+
+    def __iter__(self):
+        return iter(self._contas)
+
+    def __contains__(self, numero_conta: int) -> bool:
+        return numero_conta in self._por_numero
+
+    @property
+    def proximo_numero(self) -> int:
+        return self._maior_numero + 1
+
+    def adicionar(self, conta: 'Conta') -> bool:
+        with self._trava:
+            if conta.numero in self._por_numero:
+                return False
+            self._contas.append(conta)
+            self._por_numero[conta.numero] = conta
+            self._por_agencia_numero[(conta.agencia, conta.numero)] = conta
+            if conta.numero > self._maior_numero:
+                self._maior_numero = conta.numero
+        return True
+
+    def adicionar_lote(self, contas: Iterable['Conta']) -> list['Conta']:
+        # Adiciona com uma única aquisição da trava; devolve as contas aceitas, na ordem.
+        aceitas = []
+        with self._trava:
+            for conta in contas:
+                if conta.numero in self._por_numero:
+                    continue
+                self._contas.append(conta)
+                self._por_numero[conta.numero] = conta
+                self._por_agencia_numero[(conta.agencia, conta.numero)] = conta
+                aceitas.append(conta)
+            if aceitas:
+                self._maior_numero = max(self._maior_numero, max(conta.numero for conta in aceitas))
+        return aceitas
+
+    def buscar(self, numero_conta: int, agencia: str | None = None) -> 'Conta | None':
+        if agencia is None:
+            return self._por_numero.get(numero_conta)
+        return self._por_agencia_numero.get((agencia, numero_conta))
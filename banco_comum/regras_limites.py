@@ -0,0 +1,118 @@
+# Regras declarativas de validação de operações (saque, depósito) compiladas em uma única
+# função. Cada regra descreve uma condição de recusa e o código devolvido quando ela vale;
+# compilar_regras gera o código-fonte da cadeia de ifs, na ordem das regras, e o compila
+# uma vez. A função resultante tem a assinatura (conta, valor) -> código e custa o mesmo
+# que a cadeia escrita à mão: limites fixos entram como literais, limites por conta como
+# leitura de atributo. Valores monetários são comparados em centavos (int ou Dinheiro).
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
+
+def _atributo(nome: str) -> str:
+    if not nome.isidentifier():
+        raise ValueError(f"Nome de atributo inválido: {nome!r}")
+    return f"conta.{nome}"
+
+def _operando(limite: 'str | int') -> str:
+    # str: nome de um atributo da conta; int (ou Dinheiro): limite fixo, em centavos.
+    if isinstance(limite, str):
+        return _atributo(limite)
+    if isinstance(limite, int) and not isinstance(limite, bool):
+        return str(int(limite))
+    raise ValueError(f"Limite inválido: {limite!r}")
+
+class Regra(ABC):
+    __slots__ = ("_codigo",)
+
+    def __init__(self, codigo: int):
+        self._codigo = codigo
+
+    @property
+    def codigo(self) -> int:
+        return self._codigo
+
+    @abstractmethod
+    def condicao(self) -> str:
+        # Expressão Python sobre `conta` e `valor` que, verdadeira, recusa a operação.
+        pass
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.condicao()!r} -> {self._codigo})"
+
+class ValorPositivo(Regra):
+    __slots__ = ()
+
+    def condicao(self) -> str:
+        # `not valor > 0` em vez de `valor <= 0`: recusa também nan, se um float chegar aqui.
+        return "not valor > 0"
+
+class SaldoSuficiente(Regra):
+    __slots__ = ("_saldo",)
+
+    def __init__(self, codigo: int, saldo: str = "_saldo"):
+        super().__init__(codigo)
+        self._saldo = _atributo(saldo)
+
+    def condicao(self) -> str:
+        return f"valor > {self._saldo}"
+
+class LimitePorOperacao(Regra):
+    __slots__ = ("_limite",)
+
+    def __init__(self, codigo: int, limite: 'str | int'):
+        super().__init__(codigo)
+        self._limite = _operando(limite)
+
+    def condicao(self) -> str:
+        return f"valor > {self._limite}"
+
+class LimiteQuantidadeDiaria(Regra):
+    __slots__ = ("_realizadas", "_limite")
+
+    def __init__(self, codigo: int, limite: 'str | int', realizadas: str):
+        super().__init__(codigo)
+        self._realizadas = _atributo(realizadas)
+        self._limite = _operando(limite)
+
+    def condicao(self) -> str:
+        return f"{self._realizadas} >= {self._limite}"
+
+class LimiteVolumeDiario(Regra):
+    __slots__ = ("_acumulado", "_limite")
+
+    def __init__(self, codigo: int, limite: 'str | int', acumulado: str):
+        super().__init__(codigo)
+        self._acumulado = _atributo(acumulado)
+        self._limite = _operando(limite)
+
+    def condicao(self) -> str:
+        return f"{self._acumulado} + valor > {self._limite}"
+
+class TetoMovimentacao(Regra):
+    # Teto do saldo após a operação, como o limite_movimentacao dos depósitos.
+    __slots__ = ("_saldo", "_teto")
+
+    def __init__(self, codigo: int, teto: 'str | int', saldo: str = "_saldo"):
+        super().__init__(codigo)
+        self._saldo = _atributo(saldo)
+        self._teto = _operando(teto)
+
+    def condicao(self) -> str:
+        return f"{self._saldo} + valor > {self._teto}"
+
+def compilar_regras(regras: Iterable[Regra], nome: str = "validar",
+                    sucesso: int = 0) -> Callable[[object, int], int]:
+    regras = tuple(regras)
+    if not nome.isidentifier():
+        raise ValueError(f"Nome de função inválido: {nome!r}")
+    linhas = [f"def {nome}(conta, valor):"]
+    for regra in regras:
+        linhas.append(f"    if {regra.condicao()}:")
+        linhas.append(f"        return {int(regra.codigo)}")
+    linhas.append(f"    return {int(sucesso)}")
+    fonte = "\n".join(linhas) + "\n"
+    escopo = {}
+    exec(compile(fonte, f"<regras {nome}>", "exec"), {"__builtins__": {}}, escopo)
+    funcao = escopo[nome]
+    funcao.regras = regras
+    funcao.fonte = fonte
+    return funcao
@@ -1,144 +1,659 @@
-from abc import ABC, abstractmethod, abstractproperty
-from datetime import datetime
+from abc import ABC, abstractmethod
+from array import array
+import base64
+from datetime import datetime, timedelta
+import gc
 import os
+import struct
+import sys
+import threading
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from contextlib import ExitStack
+from itertools import compress, count
 from functools import wraps
-
-_TRANSACTION_ID = 0
+from time import perf_counter_ns
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from banco_comum.contadores_diarios import AgendadorVirada, CalendarioDiario
+from banco_comum.dinheiro import Dinheiro
+from banco_comum.registros import RegistroClientes, RegistroContas, normalizar_cpf
+from banco_comum.regras_limites import LimitePorOperacao, LimiteQuantidadeDiaria, SaldoSuficiente, ValorPositivo, compilar_regras
+from diario import (REGISTRO_CLIENTE, REGISTRO_CONTA, REGISTRO_TRANSFERENCIA, DiarioTransacoes, ler_registros,
+                    validar_cliente)
+from historico_mapeado import CAMPO_CODIGO, CAMPO_DATA, CAMPO_ID, CAMPO_VALOR, ArquivoHistorico
+from metricas import ativar_metricas, histograma_operacao, medir, metricas_ativas, relatorio_metricas
+from relatorios import gerar_extratos
+from registro_eventos import RegistroEventos
+from snapshot import Snapshot, gravar_snapshot
+
+OPERACAO_OK = 0
+CLIENTE_NAO_ENCONTRADO = 1
+CONTA_NAO_ENCONTRADA = 2
+TIPO_INVALIDO = 3
+VALOR_INVALIDO = 4
+SALDO_INSUFICIENTE = 5
+LIMITE_VALOR_SAQUE = 6
+LIMITE_SAQUES_DIARIOS = 7
+
+CAMINHO_DIARIO = "banco_diario.bin"
+CAMINHO_SNAPSHOT = "banco_snapshot.bin"
+CAMINHO_EVENTOS = "banco_eventos.jsonl"
+BYTES_DIARIO_POR_SNAPSHOT = 1 << 20
+
+# next() de itertools.count é atômico no CPython, então vários caixas em threads
+# obtêm ids distintos sem precisar de lock.
+_IDS_TRANSACAO = count(1)
 def get_next_transaction_id():
-    global _TRANSACTION_ID
-    _TRANSACTION_ID += 1
-    return _TRANSACTION_ID
+    return next(_IDS_TRANSACAO)
+
+def _avancar_ids_transacao(ultimo_id: int):
+    global _IDS_TRANSACAO
+    _IDS_TRANSACAO = count(max(next(_IDS_TRANSACAO), ultimo_id + 1))
+
+_DIARIO: DiarioTransacoes | None = None
+def ativar_diario(diario: DiarioTransacoes | None):
+    global _DIARIO
+    _DIARIO = diario
+
+# Dia corrente dos contadores de limite diário (fuso local); main() agenda a virada à meia-noite.
+_CALENDARIO = CalendarioDiario()
+def ativar_calendario(calendario: CalendarioDiario):
+    global _CALENDARIO
+    _CALENDARIO = calendario
+
+# Sem registro ativo os logs são ignorados; main() ativa um RegistroEventos em arquivo.
+_EVENTOS: RegistroEventos | None = None
+def ativar_registro_eventos(registro: RegistroEventos | None):
+    global _EVENTOS
+    _EVENTOS = registro
 
 def log_operacao_menu(operacao_nome: str):
-    print(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')}: {operacao_nome}")
+    if _EVENTOS is not None:
+        _EVENTOS.registrar(operacao_nome)
+
+def log_transacao(func, *, medida: bool = False):
+    # medida=True faz aqui mesmo o papel de @medir, em vez de empilhar os dois wrappers:
+    # registrar roda a cada transação e cada camada é uma chamada Python a mais.
+    histograma = histograma_operacao(func.__qualname__) if medida else None
 
-def log_transacao(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
-        resultado = func(*args, **kwargs)
+        if histograma is not None and metricas_ativas():
+            inicio = perf_counter_ns()
+            try:
+                resultado = func(*args, **kwargs)
+            finally:
+                histograma.registrar(perf_counter_ns() - inicio)
+        else:
+            resultado = func(*args, **kwargs)
+        if _EVENTOS is None:
+            return resultado
 
         if isinstance(args[0], Transacao):
-            tipo = type(args[0]).__name__
-            print(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')}: {tipo}")
+            _EVENTOS.registrar(type(args[0]).__name__, args[0].id, float(args[0].valor))
         elif func.__name__ == 'criar_conta' and resultado:
-            tipo = "Criação de Conta"
-            print(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')}: {tipo}")
+            _EVENTOS.registrar("Criação de Conta", resultado.numero)
         return resultado
     return wrapper
 
 class Transacao(ABC):
-    def __init__(self, valor: float):
+    __slots__ = ("_valor", "_id", "_data")
+
+    def __init__(self, valor: Dinheiro):
         self._valor = valor
         self._id = get_next_transaction_id()
         self._data = datetime.now()
 
-    @abstractproperty
-    def valor(self) -> float:
-        pass
+    @property
+    def valor(self) -> Dinheiro:
+        return self._valor
 
-    @abstractproperty
+    @property
     def id(self) -> int:
-        pass
+        return self._id
 
-    @abstractproperty
+    @property
     def data(self) -> datetime:
-        pass
+        return self._data
 
     @abstractmethod
     @log_transacao
     def registrar(self, conta: 'Conta') -> bool:
         pass
 
+    def __init_subclass__(cls, **kwargs):
+        # As subclasses sobrescrevem registrar; sem isso o log_transacao da classe base nunca executaria.
+        super().__init_subclass__(**kwargs)
+        if "registrar" in cls.__dict__:
+            cls.registrar = log_transacao(cls.__dict__["registrar"], medida=True)
+
+    def contas(self, conta: 'Conta') -> tuple['Conta', ...]:
+        return (conta,)
+
+    def _lancar(self, conta: 'Conta'):
+        conta.historico.adicionar_transacao(self)
+        if _DIARIO is not None:
+            _DIARIO.registrar_transacao(conta.numero, self.id, *_colunas_transacao(self))
+
+    @classmethod
+    def restaurar(cls, id: int, valor: Dinheiro, data: datetime) -> 'Transacao':
+        transacao = cls.__new__(cls)
+        transacao._valor = valor
+        transacao._id = id
+        transacao._data = data
+        return transacao
+
 class Deposito(Transacao):
-    def __init__(self, valor: float):
+    __slots__ = ()
+
+    def __init__(self, valor: Dinheiro | float):
+        valor = Dinheiro.de_reais(valor)
         if valor <= 0:
             raise ValueError("O valor do depósito deve ser positivo.")
         super().__init__(valor)
 
-    @property
-    def valor(self) -> float:
-        return self._valor
-
-    @property
-    def id(self) -> int:
-        return self._id
-
-    @property
-    def data(self) -> datetime:
-        return self._data
-
     def registrar(self, conta: 'Conta') -> bool:
         if conta.depositar(self.valor):
             return True
         return False
 
 class Saque(Transacao):
-    def __init__(self, valor: float):
+    __slots__ = ()
+
+    def __init__(self, valor: Dinheiro | float):
+        valor = Dinheiro.de_reais(valor)
         if valor <= 0:
             raise ValueError("O valor do saque deve ser positivo.")
         super().__init__(valor)
 
-    @property
-    def valor(self) -> float:
-        return self._valor
+    def registrar(self, conta: 'Conta') -> bool:
+        if conta.sacar(self.valor):
+            return True
+        return False
 
-    @property
-    def id(self) -> int:
-        return self._id
+class Transferencia(Transacao):
+    # Débito na conta de origem e crédito em `destino` na mesma operação. A origem registra
+    # esta transação e o destino uma TransferenciaRecebida com o mesmo id; no diário as duas
+    # pernas vão em um único registro. Transferências restauradas do histórico não têm destino.
+    __slots__ = ("_destino",)
+
+    def __init__(self, valor: Dinheiro | float, destino: 'Conta'):
+        valor = Dinheiro.de_reais(valor)
+        if valor <= 0:
+            raise ValueError("O valor da transferência deve ser positivo.")
+        super().__init__(valor)
+        self._destino = destino
 
     @property
-    def data(self) -> datetime:
-        return self._data
+    def destino(self) -> 'Conta | None':
+        return self._destino
+
+    @classmethod
+    def restaurar(cls, id: int, valor: Dinheiro, data: datetime) -> 'Transferencia':
+        transacao = super().restaurar(id, valor, data)
+        transacao._destino = None
+        return transacao
 
     def registrar(self, conta: 'Conta') -> bool:
-        if conta.sacar(self.valor):
+        if conta.transferir(self.valor, self._destino):
             return True
         return False
 
+    def contas(self, conta: 'Conta') -> tuple['Conta', ...]:
+        return (conta, self._destino)
+
+    def _lancar(self, conta: 'Conta'):
+        codigo, valor_centavos, data_us = _colunas_transacao(self)
+        conta.historico.adicionar_transacao(self)
+        self._destino.historico._adicionar(self.id, _CODIGOS_TRANSACAO[TransferenciaRecebida], valor_centavos, data_us)
+        if _DIARIO is not None:
+            _DIARIO.registrar_transferencia(conta.numero, self._destino.numero, self.id, valor_centavos, data_us)
+
+class TransferenciaRecebida(Transacao):
+    # Perna de crédito de uma Transferencia, só existe no histórico da conta de destino.
+    __slots__ = ()
+
+    def registrar(self, conta: 'Conta') -> bool:
+        raise TypeError("TransferenciaRecebida é registrada pela Transferencia de origem.")
+
+_TIPOS_TRANSACAO = {1: Deposito, 2: Saque, 3: Transferencia, 4: TransferenciaRecebida}
+_CODIGOS_TRANSACAO = {tipo: codigo for codigo, tipo in _TIPOS_TRANSACAO.items()}
+_CODIGOS_POR_NOME = {tipo.__name__.lower(): codigo for codigo, tipo in _TIPOS_TRANSACAO.items()}
+# Tipos que diminuem o saldo; os demais o aumentam.
+_CODIGOS_DEBITO = frozenset((_CODIGOS_TRANSACAO[Saque], _CODIGOS_TRANSACAO[Transferencia]))
+
+_EPOCA = datetime(1970, 1, 1)
+_MICROSSEGUNDO = timedelta(microseconds=1)
+
+_FORMATO_CURSOR = struct.Struct(">?q")
+
+def formatar_transacao(transacao: Transacao) -> str:
+    tipo = type(transacao).__name__
+    return f"Tipo: {tipo:<21} | Valor: R${transacao.valor:7.2f} | Data: {transacao.data.strftime('%d/%m/%Y %H:%M:%S')}"
+
+def _codificar_cursor(mais_recentes_primeiro: bool, indice: int) -> str:
+    return base64.urlsafe_b64encode(_FORMATO_CURSOR.pack(mais_recentes_primeiro, indice)).decode()
+
+def _decodificar_cursor(cursor: str) -> tuple[bool, int]:
+    try:
+        return _FORMATO_CURSOR.unpack(base64.urlsafe_b64decode(cursor))
+    except (ValueError, struct.error):
+        raise ValueError("Cursor de extrato inválido.") from None
+
+class PaginaExtrato:
+    # Uma página do extrato e o cursor opaco para a próxima (None na última página).
+    __slots__ = ("transacoes", "cursor")
+
+    def __init__(self, transacoes: list[Transacao], cursor: str | None):
+        self.transacoes = transacoes
+        self.cursor = cursor
+
+def _colunas_transacao(transacao: Transacao) -> tuple[int, int, int]:
+    codigo = _CODIGOS_TRANSACAO[type(transacao)]
+    return codigo, int(transacao.valor), (transacao.data - _EPOCA) // _MICROSSEGUNDO
+
+class AgregadoTransacoes:
+    # Totais acumulados de um tipo de transação, atualizados a cada inserção no Historico.
+    __slots__ = ("_quantidade", "_total", "_minimo", "_maximo", "_primeira", "_ultima")
+
+    def __init__(self):
+        self._quantidade = 0
+        self._total = 0
+        self._minimo = None
+        self._maximo = None
+        self._primeira = None
+        self._ultima = None
+
+    @classmethod
+    def de_colunas(cls, valores: list[int], primeira: int, ultima: int) -> 'AgregadoTransacoes':
+        agregado = cls()
+        agregado._quantidade = len(valores)
+        agregado._total = sum(valores)
+        agregado._minimo = min(valores)
+        agregado._maximo = max(valores)
+        agregado._primeira = primeira
+        agregado._ultima = ultima
+        return agregado
+
+    def adicionar(self, valor_centavos: int, data_us: int):
+        self._quantidade += 1
+        self._total += valor_centavos
+        if self._minimo is None or valor_centavos < self._minimo:
+            self._minimo = valor_centavos
+        if self._maximo is None or valor_centavos > self._maximo:
+            self._maximo = valor_centavos
+        if self._primeira is None or data_us < self._primeira:
+            self._primeira = data_us
+        if self._ultima is None or data_us > self._ultima:
+            self._ultima = data_us
+
+    @property
+    def quantidade(self) -> int:
+        return self._quantidade
+
+    @property
+    def total(self) -> Dinheiro:
+        return Dinheiro(self._total)
+
+    @property
+    def minimo(self) -> Dinheiro | None:
+        return None if self._minimo is None else Dinheiro(self._minimo)
+
+    @property
+    def maximo(self) -> Dinheiro | None:
+        return None if self._maximo is None else Dinheiro(self._maximo)
+
+    @property
+    def primeira_data(self) -> datetime | None:
+        return None if self._primeira is None else _EPOCA + timedelta(microseconds=self._primeira)
+
+    @property
+    def ultima_data(self) -> datetime | None:
+        return None if self._ultima is None else _EPOCA + timedelta(microseconds=self._ultima)
+
 class Historico:
+    # Armazenamento colunar em arrays tipados: id, código do tipo, valor em centavos
+    # e data em microssegundos desde a época. As Transacao são recriadas sob demanda.
+    # Cada tipo mantém as posições de suas transações ordenadas por data, permitindo
+    # filtrar por tipo e período com busca binária. Um histórico carregado em bloco
+    # (carregar_colunas) só monta agregados e índices por tipo no primeiro uso.
+    __slots__ = ("_ids", "_tipos", "_valores", "_datas", "_agregados",
+                 "_posicoes_por_tipo", "_datas_por_tipo", "_cronologico", "_indexado")
+
     def __init__(self):
-        self._transacoes = []
+        self._ids = array('q')
+        self._tipos = array('b')
+        self._valores = array('q')
+        self._datas = array('q')
+        # Agregados e índices por tipo são criados na primeira transação de cada tipo.
+        self._agregados: dict[int, AgregadoTransacoes] = {}
+        self._posicoes_por_tipo: dict[int, array] = {}
+        self._datas_por_tipo: dict[int, array] = {}
+        self._cronologico = True
+        self._indexado = True
+
+    def __len__(self) -> int:
+        return len(self._ids)
 
     @property
-    def transacoes(self) -> list[Transacao]:
-        return self._transacoes
+    def transacoes(self) -> 'TransacoesHistorico':
+        return TransacoesHistorico(self)
 
     def adicionar_transacao(self, transacao: Transacao):
-        self._transacoes.append(transacao)
+        self._adicionar(transacao.id, *_colunas_transacao(transacao))
+
+    def _adicionar(self, id: int, codigo: int, valor_centavos: int, data_us: int):
+        posicao = len(self._ids)
+        if posicao and data_us < self._datas[-1]:
+            self._cronologico = False
+        self._gravar(id, codigo, valor_centavos, data_us)
+        # Sem índices ainda, a linha nova entra neles junto com as demais em _indexar_colunas.
+        if self._indexado:
+            self._agregar(codigo, valor_centavos, data_us)
+            self._indexar(codigo, posicao, data_us)
+
+    def _gravar(self, id: int, codigo: int, valor_centavos: int, data_us: int):
+        self._ids.append(id)
+        self._tipos.append(codigo)
+        self._valores.append(valor_centavos)
+        self._datas.append(data_us)
+
+    def _agregar(self, codigo: int, valor_centavos: int, data_us: int):
+        agregado = self._agregados.get(codigo)
+        if agregado is None:
+            agregado = self._agregados[codigo] = AgregadoTransacoes()
+        agregado.adicionar(valor_centavos, data_us)
+
+    def _indexar(self, codigo: int, posicao: int, data_us: int):
+        datas = self._datas_por_tipo.get(codigo)
+        if datas is None:
+            datas = self._datas_por_tipo[codigo] = array('q')
+            self._posicoes_por_tipo[codigo] = array('q')
+        posicoes = self._posicoes_por_tipo[codigo]
+        if not datas or data_us >= datas[-1]:
+            datas.append(data_us)
+            posicoes.append(posicao)
+        else:
+            indice = bisect_right(datas, data_us)
+            datas.insert(indice, data_us)
+            posicoes.insert(indice, posicao)
 
+    def _indexar_colunas(self):
+        # Agregados e índices por tipo de todas as linhas de uma vez, a partir das colunas.
+        if self._indexado:
+            return
+        tipos, valores, datas = self._tipos, self._valores, self._datas
+        self._agregados, self._posicoes_por_tipo, self._datas_por_tipo = {}, {}, {}
+        for codigo in _TIPOS_TRANSACAO:
+            if not tipos.count(codigo):
+                continue
+            posicoes = array('q', compress(range(len(tipos)), map(codigo.__eq__, tipos)))
+            if self._cronologico:
+                datas_tipo = array('q', compress(datas, map(codigo.__eq__, tipos)))
+                valores_tipo = list(compress(valores, map(codigo.__eq__, tipos)))
+            else:
+                # sorted é estável: empates de data ficam na ordem de inserção, como em _indexar.
+                posicoes = array('q', sorted(posicoes, key=datas.__getitem__))
+                datas_tipo = array('q', map(datas.__getitem__, posicoes))
+                valores_tipo = list(map(valores.__getitem__, posicoes))
+            self._posicoes_por_tipo[codigo] = posicoes
+            self._datas_por_tipo[codigo] = datas_tipo
+            self._agregados[codigo] = AgregadoTransacoes.de_colunas(valores_tipo, datas_tipo[0], datas_tipo[-1])
+        self._indexado = True
+
+    @staticmethod
+    def _intervalo(datas: array, inicio: datetime | None, fim: datetime | None) -> tuple[int, int]:
+        primeiro = 0 if inicio is None else bisect_left(datas, (inicio - _EPOCA) // _MICROSSEGUNDO)
+        ultimo = len(datas) if fim is None else bisect_right(datas, (fim - _EPOCA) // _MICROSSEGUNDO)
+        return primeiro, ultimo
+
+    def _selecionar(self, tipo_filtro: str | None, inicio: datetime | None, fim: datetime | None):
+        if tipo_filtro:
+            self._indexar_colunas()
+            codigo = _CODIGOS_POR_NOME.get(tipo_filtro.lower())
+            if codigo not in self._posicoes_por_tipo:
+                return range(0), 0, 0
+            posicoes = self._posicoes_por_tipo[codigo]
+            datas = self._datas_por_tipo[codigo]
+        elif self._cronologico:
+            posicoes = range(len(self._ids))
+            datas = self._datas
+        else:
+            posicoes = array('q', sorted(range(len(self._datas)), key=self._datas.__getitem__))
+            datas = array('q', (self._datas[posicao] for posicao in posicoes))
+        primeiro, ultimo = self._intervalo(datas, inicio, fim)
+        return posicoes, primeiro, ultimo
+
+    def resumo(self) -> dict[str, AgregadoTransacoes]:
+        self._indexar_colunas()
+        return {tipo.__name__: self._agregados.get(codigo) or AgregadoTransacoes()
+                for codigo, tipo in _TIPOS_TRANSACAO.items()}
+
+    def agregado(self, tipo: str) -> AgregadoTransacoes | None:
+        codigo = _CODIGOS_POR_NOME.get(tipo.lower())
+        if codigo is None:
+            return None
+        self._indexar_colunas()
+        return self._agregados.get(codigo) or AgregadoTransacoes()
+
+    def exportar_colunas(self) -> tuple[array, array, array, array]:
+        return self._ids, self._tipos, self._valores, self._datas
+
+    def carregar_colunas(self, ids, tipos, valores, datas, cronologico: bool):
+        # Carga em bloco (snapshot): copia as colunas direto dos buffers, sem passar linha a
+        # linha por _adicionar. `cronologico` diz se as datas recebidas estão em ordem.
+        if not len(ids):
+            return
+        if self._ids:
+            cronologico = cronologico and datas[0] >= self._datas[-1]
+        self._cronologico = self._cronologico and cronologico
+        for coluna, dados in ((self._ids, ids), (self._tipos, tipos), (self._valores, valores), (self._datas, datas)):
+            coluna.frombytes(memoryview(dados).cast('B'))
+        self._indexado = False
+
+    def _totais_desde(self, codigo: int, data_us: int) -> tuple[int, int]:
+        # Quantidade e soma em centavos das transações do tipo a partir de data_us.
+        if not self._indexado and self._cronologico:
+            # Sem índice, mas em ordem: basta percorrer o fim do histórico, sem indexá-lo.
+            tipos, valores, datas = self._tipos, self._valores, self._datas
+            quantidade = total = 0
+            posicao = len(datas) - 1
+            while posicao >= 0 and datas[posicao] >= data_us:
+                if tipos[posicao] == codigo:
+                    quantidade += 1
+                    total += valores[posicao]
+                posicao -= 1
+            return quantidade, total
+        self._indexar_colunas()
+        datas = self._datas_por_tipo.get(codigo)
+        if datas is None:
+            return 0, 0
+        primeiro = bisect_left(datas, data_us)
+        valores = self._valores
+        return len(datas) - primeiro, sum(valores[posicao] for posicao in self._posicoes_por_tipo[codigo][primeiro:])
+
+    def transacao(self, posicao: int) -> Transacao:
+        tipo = _TIPOS_TRANSACAO[self._tipos[posicao]]
+        data = _EPOCA + timedelta(microseconds=self._datas[posicao])
+        return tipo.restaurar(self._ids[posicao], Dinheiro(self._valores[posicao]), data)
+
+    @medir
     def gerar_relatorio(self):
         print("\n--- Extrato ---")
-        if not self._transacoes:
+        if not self._ids:
             print("Nenhuma transação realizada.")
             return
 
-        for transacao in self._transacoes:
-            tipo = type(transacao).__name__
-            print(f"Tipo: {tipo:<8} | Valor: R${transacao.valor:7.2f} | Data: {transacao.data.strftime('%d/%m/%Y %H:%M:%S')}")
+        for transacao in self.transacoes:
+            print(formatar_transacao(transacao))
+        print("---------------")
+
+    @medir
+    def gerar_resumo(self):
+        print("\n--- Resumo ---")
+        for tipo, agregado in self.resumo().items():
+            if not agregado.quantidade:
+                print(f"Tipo: {tipo:<21} | Nenhuma transação")
+                continue
+            print(f"Tipo: {tipo:<21} | Qtd: {agregado.quantidade:>5} | Total: R${agregado.total:9.2f} | "
+                  f"Mín: R${agregado.minimo:7.2f} | Máx: R${agregado.maximo:7.2f} | "
+                  f"Última: {agregado.ultima_data.strftime('%d/%m/%Y %H:%M:%S')}")
         print("---------------")
 
-    def transacoes_por_tipo(self, tipo_filtro: str = None):
-        for transacao in self._transacoes:
-            if tipo_filtro is None or type(transacao).__name__.lower() == tipo_filtro.lower():
-                yield transacao
+    def transacoes_por_tipo(self, tipo_filtro: str = None, inicio: datetime = None, fim: datetime = None):
+        posicoes, primeiro, ultimo = self._selecionar(tipo_filtro, inicio, fim)
+        for indice in range(primeiro, ultimo):
+            yield self.transacao(posicoes[indice])
+
+    def paginas(self, tamanho_pagina: int = 20, cursor: str = None, mais_recentes_primeiro: bool = False,
+                tipo_filtro: str = None, inicio: datetime = None, fim: datetime = None):
+        if tamanho_pagina <= 0:
+            raise ValueError("O tamanho da página deve ser positivo.")
+
+        posicoes, primeiro, ultimo = self._selecionar(tipo_filtro, inicio, fim)
+        if cursor is not None:
+            ordem_cursor, limite = _decodificar_cursor(cursor)
+            if ordem_cursor != mais_recentes_primeiro:
+                raise ValueError("O cursor foi gerado para outra ordenação do extrato.")
+            if mais_recentes_primeiro:
+                ultimo = min(ultimo, limite)
+            else:
+                primeiro = max(primeiro, limite)
+
+        while primeiro < ultimo:
+            if mais_recentes_primeiro:
+                limite = max(primeiro, ultimo - tamanho_pagina)
+                indices = range(ultimo - 1, limite - 1, -1)
+                ultimo = limite
+            else:
+                limite = min(ultimo, primeiro + tamanho_pagina)
+                indices = range(primeiro, limite)
+                primeiro = limite
+            proximo = _codificar_cursor(mais_recentes_primeiro, limite) if primeiro < ultimo else None
+            yield PaginaExtrato([self.transacao(posicoes[indice]) for indice in indices], proximo)
+
+    def pagina(self, tamanho_pagina: int = 20, cursor: str = None, mais_recentes_primeiro: bool = False,
+               tipo_filtro: str = None, inicio: datetime = None, fim: datetime = None) -> PaginaExtrato:
+        paginas = self.paginas(tamanho_pagina, cursor, mais_recentes_primeiro, tipo_filtro, inicio, fim)
+        return next(paginas, PaginaExtrato([], None))
+
+# Tipo da array de cada coluna, o mesmo das colunas do Historico em memória.
+_TIPOS_COLUNA = {CAMPO_ID: 'q', CAMPO_CODIGO: 'b', CAMPO_VALOR: 'q', CAMPO_DATA: 'q'}
+
+class ColunaMapeada:
+    # Coluna do Historico lida sob demanda do arquivo mapeado da agência. Fatias devolvem
+    # uma array copiada, como as colunas em memória.
+    __slots__ = ("_arquivo", "_posicoes", "_campo")
+
+    def __init__(self, arquivo: ArquivoHistorico, posicoes: array, campo: int):
+        self._arquivo = arquivo
+        self._posicoes = posicoes
+        self._campo = campo
+
+    def __len__(self) -> int:
+        return len(self._posicoes)
+
+    def __getitem__(self, indice: int | slice) -> int | array:
+        if isinstance(indice, slice):
+            campo = self._arquivo.campo
+            return array(_TIPOS_COLUNA[self._campo],
+                         (campo(registro, self._campo) for registro in self._posicoes[indice]))
+        return self._arquivo.campo(self._posicoes[indice], self._campo)
+
+    def __iter__(self):
+        for registro in self._posicoes:
+            yield self._arquivo.campo(registro, self._campo)
+
+class HistoricoMapeado(Historico):
+    # Historico cujas transações ficam no ArquivoHistorico da agência. Em memória ficam
+    # apenas as posições dos registros da conta (8 bytes por transação) e os agregados;
+    # os filtros por tipo percorrem os registros direto no arquivo mapeado.
+    __slots__ = ("_arquivo", "_numero_conta", "_posicoes")
+
+    def __init__(self, arquivo: ArquivoHistorico, numero_conta: int, posicoes: array | None = None):
+        super().__init__()
+        self._arquivo = arquivo
+        self._numero_conta = numero_conta
+        self._posicoes = array('q')
+        self._ids = ColunaMapeada(arquivo, self._posicoes, CAMPO_ID)
+        self._tipos = ColunaMapeada(arquivo, self._posicoes, CAMPO_CODIGO)
+        self._valores = ColunaMapeada(arquivo, self._posicoes, CAMPO_VALOR)
+        self._datas = ColunaMapeada(arquivo, self._posicoes, CAMPO_DATA)
+        if posicoes is not None:
+            self._posicoes.extend(posicoes)
+            data_anterior = None
+            for registro in self._posicoes:
+                _, _, valor_centavos, data_us, codigo = arquivo.registro(registro)
+                if data_anterior is not None and data_us < data_anterior:
+                    self._cronologico = False
+                data_anterior = data_us
+                self._agregar(codigo, valor_centavos, data_us)
+
+    def _gravar(self, id: int, codigo: int, valor_centavos: int, data_us: int):
+        self._posicoes.append(self._arquivo.anexar(self._numero_conta, id, codigo, valor_centavos, data_us))
+
+    def _indexar(self, codigo: int, posicao: int, data_us: int):
+        pass
+
+    def _selecionar(self, tipo_filtro: str | None, inicio: datetime | None, fim: datetime | None):
+        posicoes, primeiro, ultimo = super()._selecionar(None, inicio, fim)
+        if not tipo_filtro:
+            return posicoes, primeiro, ultimo
+        codigo = _CODIGOS_POR_NOME.get(tipo_filtro.lower())
+        tipos = self._tipos
+        selecionadas = array('q', (posicoes[indice] for indice in range(primeiro, ultimo)
+                                   if tipos[posicoes[indice]] == codigo))
+        return selecionadas, 0, len(selecionadas)
+
+def abrir_historicos_agencia(caminho: str) -> tuple[ArquivoHistorico, dict[int, HistoricoMapeado]]:
+    arquivo = ArquivoHistorico(caminho)
+    historicos = {numero_conta: HistoricoMapeado(arquivo, numero_conta, posicoes)
+                  for numero_conta, posicoes in arquivo.posicoes_por_conta().items()}
+    return arquivo, historicos
+
+class TransacoesHistorico:
+    # Visão somente leitura sobre as colunas do Historico, indexável como uma lista.
+    __slots__ = ("_historico",)
+
+    def __init__(self, historico: Historico):
+        self._historico = historico
+
+    def __len__(self) -> int:
+        return len(self._historico)
+
+    def __getitem__(self, posicao: int | slice) -> Transacao | list[Transacao]:
+        if isinstance(posicao, slice):
+            return [self._historico.transacao(i) for i in range(*posicao.indices(len(self)))]
+        return self._historico.transacao(posicao)
+
+    def __iter__(self):
+        for posicao in range(len(self._historico)):
+            yield self._historico.transacao(posicao)
 
 class Conta:
+    # _trava protege saldo, contadores e histórico da conta; é reentrante para que
+    # Cliente.realizar_transacao possa manter a trava enquanto chama sacar/depositar.
+    # _saldo fica em centavos como int simples, para que as somas internas não criem um
+    # Dinheiro a cada operação; a propriedade saldo é que devolve Dinheiro.
+    __slots__ = ("_saldo", "_numero", "_agencia", "_cliente", "_historico", "_trava")
     _AGENCIA_PADRAO = "0001"
 
-    def __init__(self, cliente: 'Cliente', numero: int):
-        self._saldo = 0.0
+    def __init__(self, cliente: 'Cliente', numero: int, historico: Historico | None = None):
+        self._saldo = 0
         self._numero = numero
         self._agencia = Conta._AGENCIA_PADRAO
         self._cliente = cliente
-        self._historico = Historico()
+        self._historico = historico if historico is not None else Historico()
+        self._trava = threading.RLock()
 
     @classmethod
     def nova_conta(cls, cliente: 'Cliente', numero: int):
         return cls(cliente, numero)
 
     @property
-    def saldo(self) -> float:
-        return self._saldo
+    def saldo(self) -> Dinheiro:
+        return Dinheiro(self._saldo)
 
     @property
     def numero(self) -> int:
@@ -156,66 +671,151 @@ class Conta:
     def historico(self) -> Historico:
         return self._historico
 
-    def sacar(self, valor: float) -> bool:
-        if valor <= 0:
-            print("\n!!! Operação falhou! O valor do saque deve ser positivo.")
+    # (conta, valor) -> código de resultado; a primeira regra que recusa define o código.
+    _validar_saque = compilar_regras((
+        ValorPositivo(VALOR_INVALIDO),
+        SaldoSuficiente(SALDO_INSUFICIENTE),
+    ), nome="_validar_saque", sucesso=OPERACAO_OK)
+
+    def _debitar(self, valor: Dinheiro | int):
+        self._saldo -= int(valor)
+
+    def _mensagem_recusa_saque(self, motivo: int, valor: Dinheiro) -> str:
+        if motivo == VALOR_INVALIDO:
+            return "O valor do saque deve ser positivo."
+        if motivo == LIMITE_SAQUES_DIARIOS:
+            return "Limite de saques diários da Conta Corrente atingido."
+        if motivo == LIMITE_VALOR_SAQUE:
+            return f"O valor do saque (R${valor:.2f}) excede o limite máximo por saque de R${self.limite:.2f}."
+        return "Saldo insuficiente."
+
+    @medir
+    def sacar(self, valor: Dinheiro | float) -> bool:
+        valor = Dinheiro.de_reais(valor)
+        with self._trava:
+            motivo = self._validar_saque(valor)
+            if motivo == OPERACAO_OK:
+                self._debitar(valor)
+        if motivo != OPERACAO_OK:
+            print(f"\n!!! Operação falhou! {self._mensagem_recusa_saque(motivo, valor)}")
             return False
 
-        if valor > self._saldo:
-            print("\n!!! Operação falhou! Saldo insuficiente.")
-            return False
-
-        self._saldo -= valor
         print(f"\nSaque de R${valor:.2f} realizado com sucesso.")
         return True
 
-    def depositar(self, valor: float) -> bool:
+    @medir
+    def depositar(self, valor: Dinheiro | float) -> bool:
+        valor = Dinheiro.de_reais(valor)
         if valor <= 0:
             print("\n!!! Operação falhou! O valor do depósito deve ser positivo.")
             return False
 
-        self._saldo += valor
+        with self._trava:
+            self._saldo += int(valor)
         print(f"\nDepósito de R${valor:.2f} realizado com sucesso.")
         return True
 
+    def _validar_transferencia(self, valor: Dinheiro, destino: 'Conta') -> int:
+        # Transferência não conta como saque: só valida valor e saldo da origem.
+        if destino is None or destino is self:
+            return CONTA_NAO_ENCONTRADA
+        if valor <= 0:
+            return VALOR_INVALIDO
+        if valor > self._saldo:
+            return SALDO_INSUFICIENTE
+        return OPERACAO_OK
+
+    def transferir(self, valor: Dinheiro | float, destino: 'Conta') -> bool:
+        valor = Dinheiro.de_reais(valor)
+        with _travar_contas((self, destino)):
+            motivo = self._validar_transferencia(valor, destino)
+            if motivo == OPERACAO_OK:
+                self._saldo -= int(valor)
+                destino._saldo += int(valor)
+        if motivo == CONTA_NAO_ENCONTRADA:
+            print("\n!!! Operação falhou! Conta de destino inválida.")
+            return False
+        if motivo == VALOR_INVALIDO:
+            print("\n!!! Operação falhou! O valor da transferência deve ser positivo.")
+            return False
+        if motivo != OPERACAO_OK:
+            print("\n!!! Operação falhou! Saldo insuficiente.")
+            return False
+
+        print(f"\nTransferência de R${valor:.2f} para a conta {destino.numero} realizada com sucesso.")
+        return True
+
+def _travar_contas(contas: Iterable[Conta]) -> ExitStack:
+    # Trava as contas sempre em ordem crescente de número: duas operações que disputam as
+    # mesmas contas (A->B e B->A) tomam as travas na mesma sequência e não há deadlock.
+    travas = ExitStack()
+    for conta in sorted({id(conta): conta for conta in contas if conta is not None}.values(),
+                        key=lambda conta: conta.numero):
+        travas.enter_context(conta._trava)
+    return travas
+
 class ContaCorrente(Conta):
-    def __init__(self, cliente: 'Cliente', numero: int, limite_valor_saque: float = 500.0, limite_saques_diarios_cc: int = 3):
-        super().__init__(cliente, numero)
-        self._limite_valor_saque = limite_valor_saque
+    # Contadores do dia (_saques_hoje, _volume_saques_hoje) valem para o dia _dia_saques do
+    # _CALENDARIO; são zerados ao primeiro acesso em outro dia ou pela virada agendada.
+    __slots__ = ("_limite_valor_saque", "_limite_saques_diarios", "_dia_saques", "_saques_hoje",
+                 "_volume_saques_hoje")
+
+    def __init__(self, cliente: 'Cliente', numero: int, limite_valor_saque: Dinheiro | float = 500.0,
+                 limite_saques_diarios_cc: int = 3, historico: Historico | None = None):
+        super().__init__(cliente, numero, historico)
+        self._limite_valor_saque = Dinheiro.de_reais(limite_valor_saque)
         self._limite_saques_diarios = limite_saques_diarios_cc
+        self._dia_saques = 0
         self._saques_hoje = 0
+        self._volume_saques_hoje = 0
 
     @property
-    def limite(self) -> float:
+    def limite(self) -> Dinheiro:
         return self._limite_valor_saque
 
-    def sacar(self, valor: float) -> bool:
-        if valor <= 0:
-            print("\n!!! Operação falhou! O valor do saque deve ser positivo.")
-            return False
-
-        if self._saques_hoje >= self._limite_saques_diarios:
-            print("\n!!! Operação falhou! Limite de saques diários da Conta Corrente atingido.")
-            return False
-
-        if valor > self.limite:
-            print(f"\n!!! Operação falhou! O valor do saque (R${valor:.2f}) excede o limite máximo por saque de R${self.limite:.2f}.")
-            return False
-            
-        if valor > self._saldo:
-            print("\n!!! Operação falhou! Saldo insuficiente.")
-            return False
+    @property
+    def saques_hoje(self) -> int:
+        return self._saques_hoje if self._dia_saques == _CALENDARIO.dia else 0
 
-        self._saldo -= valor
+    @property
+    def volume_saques_hoje(self) -> Dinheiro:
+        return Dinheiro(self._volume_saques_hoje if self._dia_saques == _CALENDARIO.dia else 0)
+
+    _regras_saque = compilar_regras((
+        ValorPositivo(VALOR_INVALIDO),
+        LimiteQuantidadeDiaria(LIMITE_SAQUES_DIARIOS, limite="_limite_saques_diarios", realizadas="_saques_hoje"),
+        LimitePorOperacao(LIMITE_VALOR_SAQUE, limite="_limite_valor_saque"),
+        SaldoSuficiente(SALDO_INSUFICIENTE),
+    ), nome="_regras_saque", sucesso=OPERACAO_OK)
+
+    def _validar_saque(self, valor: Dinheiro | int) -> int:
+        dia = _CALENDARIO.dia
+        if self._dia_saques != dia:
+            self._virar_dia(dia)
+        return self._regras_saque(valor)
+
+    def _virar_dia(self, dia: int):
+        with self._trava:
+            if self._dia_saques < dia:
+                self._dia_saques = dia
+                self._saques_hoje = 0
+                self._volume_saques_hoje = 0
+
+    def _debitar(self, valor: Dinheiro | int):
+        self._saldo -= int(valor)
+        if not self._saques_hoje:
+            _CALENDARIO.registrar(self, self._dia_saques)
         self._saques_hoje += 1
-        print(f"\nSaque de R${valor:.2f} realizado com sucesso.")
-        return True
+        self._volume_saques_hoje += int(valor)
 
 
 class Cliente:
+    __slots__ = ("_endereco", "_contas", "_contas_por_numero")
+
     def __init__(self, endereco: str):
         self._endereco = endereco
         self._contas = []
+        self._contas_por_numero: dict[int, 'Conta'] = {}
 
     @property
     def endereco(self) -> str:
@@ -226,19 +826,26 @@ class Cliente:
         return self._contas
 
     def realizar_transacao(self, conta: 'Conta', transacao: Transacao) -> bool:
-        if conta not in self.contas:
+        if self._contas_por_numero.get(conta.numero) is not conta:
             print("Erro: Conta não pertence a este cliente.")
             return False
 
-        sucesso = transacao.registrar(conta)
-        if sucesso:
-            conta.historico.adicionar_transacao(transacao)
+        with _travar_contas(transacao.contas(conta)):
+            sucesso = transacao.registrar(conta)
+            if sucesso:
+                transacao._lancar(conta)
         return sucesso
 
     def adicionar_conta(self, conta: 'Conta'):
         self._contas.append(conta)
+        self._contas_por_numero[conta.numero] = conta
+
+    def buscar_conta(self, numero_conta: int) -> 'Conta | None':
+        return self._contas_por_numero.get(numero_conta)
 
 class PessoaFisica(Cliente):
+    __slots__ = ("_cpf", "_nome", "_data_nascimento")
+
     def __init__(self, cpf: str, nome: str, data_nascimento: str, endereco: str):
         super().__init__(endereco)
         self._cpf = cpf
@@ -258,7 +865,7 @@ class PessoaFisica(Cliente):
         return self._data_nascimento
 
 class ContasIterator:
-    def __init__(self, contas: list[Conta]):
+    def __init__(self, contas: 'RegistroContas | list[Conta]'):
         self._contas = contas
         self._index = 0
 
@@ -281,6 +888,33 @@ class ContasIterator:
         else:
             raise StopIteration
 
+TAMANHO_PAGINA_EXTRATO = 20
+
+@medir
+def exibir_pagina(paginas) -> PaginaExtrato | None:
+    # Busca e imprime a próxima página. É o que o menu mede no extrato; a espera pelo
+    # usuário entre uma página e outra fica de fora.
+    pagina = next(paginas, None)
+    if pagina is not None:
+        for transacao in pagina.transacoes:
+            print(formatar_transacao(transacao))
+    return pagina
+
+def exibir_paginas(paginas) -> bool:
+    encontrou_transacao = False
+    paginas = iter(paginas)
+    while (pagina := exibir_pagina(paginas)) is not None:
+        encontrou_transacao = True
+        if pagina.cursor is None:
+            break
+        if input("-- [Enter] próxima página / [q] parar: ").lower().strip() == "q":
+            break
+    return encontrou_transacao
+
+def escolher_ordem_extrato() -> bool:
+    ordem = input("Ordem ([a] mais antigas primeiro / [r] mais recentes primeiro): ").lower().strip()
+    return ordem == "r"
+
 def limpar_tela():
     os.system('cls' if os.name == 'nt' else 'clear')
 
@@ -288,28 +922,195 @@ def menu():
     print("\n" + "="*20 + " MENU " + "="*20)
     print("[d] Depositar")
     print("[s] Sacar")
+    print("[t] Transferir")
     print("[e] Extrato")
     print("[nc] Nova conta")
     print("[lc] Listar contas")
     print("[nu] Novo usuário")
     print("[lt] Listar transações por tipo (gerador)")
+    print("[m] Métricas de desempenho")
+    print("[x] Extratos do mês em arquivos")
     print("[q] Sair")
     print("="*46)
     return input("=> ").lower().strip()
 
-def filtrar_cliente(cpf: str, clientes: list[PessoaFisica]) -> PessoaFisica | None:
-    for cliente in clientes:
-        if cliente.cpf == cpf:
-            return cliente
-    return None
+@medir
+def filtrar_cliente(cpf: str, clientes: RegistroClientes) -> PessoaFisica | None:
+    return clientes.buscar_por_cpf(cpf)
 
 def recuperar_conta_cliente(cliente: Cliente, numero_conta: int) -> Conta | None:
-    for conta in cliente.contas:
-        if conta.numero == numero_conta:
-            return conta
-    return None
-
-def cadastrar_usuario(clientes: list[PessoaFisica]):
+    return cliente.buscar_conta(numero_conta)
+
+def processar_lote(transacoes: Iterable[tuple[str, int, str, Dinheiro | int | float | str]], clientes: RegistroClientes) -> array:
+    # Aplica registros (cpf, numero_conta, tipo, valor) agrupados por conta, sem interação
+    # nem impressão por operação. O valor está em reais (float, int ou str) ou é um Dinheiro. Retorna um código de resultado por registro, na ordem de entrada.
+    resultados = array('b')
+    por_conta: dict[int, tuple[Conta, list[tuple[int, int, int]]]] = {}
+    codigos_tipo = {"deposito": _CODIGOS_TRANSACAO[Deposito], "saque": _CODIGOS_TRANSACAO[Saque]}
+
+    for indice, (cpf, numero_conta, tipo, valor) in enumerate(transacoes):
+        resultados.append(OPERACAO_OK)
+        cliente = clientes.buscar_por_cpf(cpf)
+        if cliente is None:
+            resultados[indice] = CLIENTE_NAO_ENCONTRADO
+            continue
+        conta = cliente.buscar_conta(numero_conta)
+        if conta is None:
+            resultados[indice] = CONTA_NAO_ENCONTRADA
+            continue
+        codigo = codigos_tipo.get(tipo.lower())
+        if codigo is None:
+            resultados[indice] = TIPO_INVALIDO
+            continue
+        try:
+            centavos = int(Dinheiro.de_reais(valor))
+        except (ValueError, OverflowError, TypeError):
+            # nan, inf e tipos não numéricos invalidam só este registro, não o lote.
+            centavos = 0
+        if centavos <= 0:
+            resultados[indice] = VALOR_INVALIDO
+            continue
+        por_conta.setdefault(numero_conta, (conta, []))[1].append((indice, codigo, centavos))
+
+    agora_us = (datetime.now() - _EPOCA) // _MICROSSEGUNDO
+    for conta, operacoes in por_conta.values():
+        historico = conta.historico
+        with conta._trava:
+            for indice, codigo, centavos in operacoes:
+                if codigo == _CODIGOS_TRANSACAO[Saque]:
+                    motivo = conta._validar_saque(centavos)
+                    if motivo != OPERACAO_OK:
+                        resultados[indice] = motivo
+                        continue
+                    conta._debitar(centavos)
+                else:
+                    conta._saldo += centavos
+                id_transacao = get_next_transaction_id()
+                historico._adicionar(id_transacao, codigo, centavos, agora_us)
+                if _DIARIO is not None:
+                    _DIARIO.registrar_transacao(conta.numero, id_transacao, codigo, centavos, agora_us)
+    return resultados
+
+def _carregar_snapshot(caminho_snapshot: str, clientes: RegistroClientes, contas: RegistroContas) -> int:
+    with Snapshot(caminho_snapshot) as snapshot:
+        lista_clientes = [PessoaFisica(cpf=cpf, nome=nome, data_nascimento=data_nascimento, endereco=endereco)
+                          for cpf, nome, data_nascimento, endereco in snapshot.clientes()]
+        clientes.adicionar_lote(lista_clientes)
+
+        # Os contadores do dia são recalculados do histórico ao fim da recuperação.
+        lista_contas = []
+        for (numero, indice_cliente, saldo_centavos, limite_valor_saque_centavos, limite_saques_diarios,
+             cronologico, agencia, inicio, quantidade) in snapshot.contas():
+            conta = ContaCorrente(cliente=lista_clientes[indice_cliente], numero=numero,
+                                  limite_valor_saque=Dinheiro(limite_valor_saque_centavos),
+                                  limite_saques_diarios_cc=limite_saques_diarios)
+            conta._agencia = agencia
+            conta._saldo = saldo_centavos
+            conta.historico.carregar_colunas(*snapshot.colunas(inicio, quantidade), cronologico=bool(cronologico))
+            lista_contas.append(conta)
+        for conta in contas.adicionar_lote(lista_contas):
+            conta.cliente.adicionar_conta(conta)
+            clientes.registrar_conta(conta)
+
+        _avancar_ids_transacao(snapshot.ultimo_id)
+        return snapshot.posicao_diario
+
+def gravar_estado(caminho_snapshot: str, clientes: RegistroClientes, contas: RegistroContas, diario: DiarioTransacoes):
+    diario.confirmar()
+    indices_clientes = {}
+    campos_clientes = []
+    for indice, cliente in enumerate(clientes):
+        indices_clientes[id(cliente)] = indice
+        campos_clientes.append((cliente.cpf, cliente.nome, cliente.data_nascimento, cliente.endereco))
+    campos_contas = [(conta.numero, indices_clientes[id(conta.cliente)], int(conta.saldo), int(conta.limite),
+                      conta._limite_saques_diarios, conta.historico._cronologico, conta.agencia) for conta in contas]
+    historicos = [conta.historico.exportar_colunas() for conta in contas]
+    # O id consumido aqui nunca é emitido, então serve como limite superior dos ids já usados.
+    ultimo_id = get_next_transaction_id()
+    gravar_snapshot(caminho_snapshot, diario.posicao, ultimo_id, campos_clientes, campos_contas, historicos)
+
+def recuperar_estado(caminho: str, registros_por_fsync: int = 64,
+                     caminho_snapshot: str | None = None) -> tuple[RegistroClientes, RegistroContas, DiarioTransacoes]:
+    # Reconstrói clientes, contas e históricos a partir do snapshot mais recente (se houver)
+    # e reaplica apenas o trecho do diário gravado depois dele. Devolve o diário aberto para
+    # novas gravações, descartando um eventual registro incompleto no fim.
+    # O coletor de ciclos fica desligado durante a carga: milhões de objetos novos
+    # disparariam coletas repetidas sem encontrar lixo algum.
+    gc_ativo = gc.isenabled()
+    gc.disable()
+    try:
+        return _recuperar_estado(caminho, registros_por_fsync, caminho_snapshot)
+    finally:
+        if gc_ativo:
+            gc.enable()
+
+def _recuperar_estado(caminho: str, registros_por_fsync: int,
+                      caminho_snapshot: str | None) -> tuple[RegistroClientes, RegistroContas, DiarioTransacoes]:
+    clientes = RegistroClientes()
+    contas = RegistroContas()
+    codigo_transferencia = _CODIGOS_TRANSACAO[Transferencia]
+    codigo_recebida = _CODIGOS_TRANSACAO[TransferenciaRecebida]
+    comprimento = 0
+    ultimo_id = 0
+
+    if caminho_snapshot is not None and os.path.exists(caminho_snapshot):
+        comprimento = _carregar_snapshot(caminho_snapshot, clientes, contas)
+        tamanho_diario = os.path.getsize(caminho) if os.path.exists(caminho) else 0
+        if tamanho_diario < comprimento:
+            raise ValueError(f"O diário {caminho} é menor que a posição registrada no snapshot {caminho_snapshot}.")
+
+    for tipo, campos, comprimento in ler_registros(caminho, comprimento):
+        if tipo == REGISTRO_CLIENTE:
+            cpf, nome, data_nascimento, endereco = campos
+            clientes.adicionar(PessoaFisica(cpf=cpf, nome=nome, data_nascimento=data_nascimento, endereco=endereco))
+        elif tipo == REGISTRO_CONTA:
+            numero, cpf, limite_valor_saque_centavos, limite_saques_diarios = campos
+            cliente = clientes.buscar_por_cpf(cpf)
+            conta = ContaCorrente(cliente=cliente, numero=numero, limite_valor_saque=Dinheiro(limite_valor_saque_centavos),
+                                  limite_saques_diarios_cc=limite_saques_diarios)
+            contas.adicionar(conta)
+            cliente.adicionar_conta(conta)
+            clientes.registrar_conta(conta)
+        elif tipo == REGISTRO_TRANSFERENCIA:
+            numero_origem, numero_destino, id_transacao, valor_centavos, data_us = campos
+            origem = contas.buscar(numero_origem)
+            destino = contas.buscar(numero_destino)
+            origem.historico._adicionar(id_transacao, codigo_transferencia, valor_centavos, data_us)
+            destino.historico._adicionar(id_transacao, codigo_recebida, valor_centavos, data_us)
+            origem._saldo -= valor_centavos
+            destino._saldo += valor_centavos
+            ultimo_id = max(ultimo_id, id_transacao)
+        else:
+            numero_conta, id_transacao, codigo, valor_centavos, data_us = campos
+            conta = contas.buscar(numero_conta)
+            conta.historico._adicionar(id_transacao, codigo, valor_centavos, data_us)
+            if codigo in _CODIGOS_DEBITO:
+                conta._saldo -= valor_centavos
+            else:
+                conta._saldo += valor_centavos
+            ultimo_id = max(ultimo_id, id_transacao)
+
+    _avancar_ids_transacao(ultimo_id)
+    _recalcular_contadores_diarios(contas)
+    diario = DiarioTransacoes(caminho, registros_por_fsync, comprimento_valido=comprimento)
+    return clientes, contas, diario
+
+def _recalcular_contadores_diarios(contas: RegistroContas):
+    # Saques de hoje a partir do histórico; as datas do histórico são locais e sem fuso.
+    dia = _CALENDARIO.dia
+    inicio_us = (_CALENDARIO.inicio_do_dia.astimezone().replace(tzinfo=None) - _EPOCA) // _MICROSSEGUNDO
+    codigo_saque = _CODIGOS_TRANSACAO[Saque]
+    for conta in contas:
+        if not isinstance(conta, ContaCorrente):
+            continue
+        quantidade, total = conta.historico._totais_desde(codigo_saque, inicio_us)
+        conta._dia_saques = dia
+        conta._saques_hoje = quantidade
+        conta._volume_saques_hoje = total
+        if quantidade:
+            _CALENDARIO.registrar(conta, dia)
+
+def cadastrar_usuario(clientes: RegistroClientes):
     print("\n--- Novo Usuário ---")
     cpf = input("Informe o CPF (somente números): ")
     cliente_existente = filtrar_cliente(cpf, clientes)
@@ -321,14 +1122,21 @@ def cadastrar_usuario(clientes: list[PessoaFisica]):
     nome = input("Informe o nome completo: ")
     data_nascimento = input("Informe a data de nascimento (dd-mm-aaaa): ")
     endereco = input("Informe o endereço (logradouro, nro - bairro - cidade/sigla estado): ")
+    try:
+        validar_cliente(cpf, nome, data_nascimento, endereco)
+    except ValueError as erro:
+        print(f"\n!!! Erro: {erro}")
+        return
 
     novo_cliente = PessoaFisica(cpf=cpf, nome=nome, data_nascimento=data_nascimento, endereco=endereco)
-    clientes.append(novo_cliente)
+    clientes.adicionar(novo_cliente)
+    if _DIARIO is not None:
+        _DIARIO.registrar_cliente(cpf, nome, data_nascimento, endereco)
     print("\n>>> Usuário criado com sucesso!")
     log_operacao_menu("Cadastrar Usuário")
 
 @log_transacao
-def criar_conta(clientes: list[PessoaFisica], contas: list[Conta]):
+def criar_conta(clientes: RegistroClientes, contas: RegistroContas):
     print("\n--- Criar Nova Conta ---")
     cpf = input("Informe o CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
@@ -337,10 +1145,10 @@ def criar_conta(clientes: list[PessoaFisica], contas: list[Conta]):
         print("\n!!! Erro: Cliente não encontrado, crie um novo usuário primeiro!")
         return None
 
-    novo_numero_conta = len(contas) + 1001
+    novo_numero_conta = contas.proximo_numero
 
     try:
-        limite_valor_saque_cc = float(input("Informe o limite MÁXIMO por saque (ex: 500): "))
+        limite_valor_saque_cc = Dinheiro.de_texto(input("Informe o limite MÁXIMO por saque (ex: 500): "))
         limite_saques_diarios_cc = int(input("Informe o limite de SAQUES DIÁRIOS (ex: 3): "))
         
         nova_conta = ContaCorrente(cliente=cliente, numero=novo_numero_conta, 
@@ -350,13 +1158,20 @@ def criar_conta(clientes: list[PessoaFisica], contas: list[Conta]):
         print("\n!!! Erro: Valores de limite ou saques inválidos. Conta não criada.")
         return None
 
-    contas.append(nova_conta)
+    # Outro caixa pode ter usado o número entre a leitura de proximo_numero e aqui.
+    if not contas.adicionar(nova_conta):
+        print(f"\n!!! Erro: O número de conta {novo_numero_conta} já está em uso. Conta não criada.")
+        return None
     cliente.adicionar_conta(nova_conta)
+    clientes.registrar_conta(nova_conta)
+    if _DIARIO is not None:
+        _DIARIO.registrar_conta(nova_conta.numero, normalizar_cpf(cliente.cpf), int(limite_valor_saque_cc),
+                                limite_saques_diarios_cc)
     print(f"\n>>> Conta {nova_conta.numero} (Conta Corrente) criada com sucesso para {cliente.nome}!")
     return nova_conta
 
 
-def listar_contas(contas: list[Conta]):
+def listar_contas(contas: RegistroContas):
     print("\n--- Lista de Contas ---")
     if not contas:
         print("Nenhuma conta cadastrada.")
@@ -369,7 +1184,7 @@ def listar_contas(contas: list[Conta]):
         print(f"Titular:\t{conta_info['cliente_nome']}")
         print(f"CPF:\t\t{conta_info['cliente_cpf']}")
         
-        conta_original = next((c for c in contas if c.numero == conta_info['numero']), None)
+        conta_original = contas.buscar(conta_info['numero'], conta_info['agencia'])
         if isinstance(conta_original, ContaCorrente):
             print(f"Limite por Saque: R${conta_original.limite:.2f}")
             print(f"Limite Saques Diários: {conta_original._limite_saques_diarios}")
@@ -377,7 +1192,7 @@ def listar_contas(contas: list[Conta]):
     log_operacao_menu("Listar Contas")
 
 
-def depositar(clientes: list[PessoaFisica]):
+def depositar(clientes: RegistroClientes):
     print("\n--- Depositar ---")
     cpf = input("Informe o CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
@@ -405,7 +1220,7 @@ def depositar(clientes: list[PessoaFisica]):
         return
 
     try:
-        valor = float(input("Informe o valor do depósito: "))
+        valor = Dinheiro.de_texto(input("Informe o valor do depósito: "))
         if valor <= 0:
             raise ValueError
     except ValueError:
@@ -418,7 +1233,7 @@ def depositar(clientes: list[PessoaFisica]):
     log_operacao_menu("Depositar")
 
 
-def sacar(clientes: list[PessoaFisica]):
+def sacar(clientes: RegistroClientes):
     print("\n--- Sacar ---")
     cpf = input("Informe o CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
@@ -446,7 +1261,7 @@ def sacar(clientes: list[PessoaFisica]):
         return
 
     try:
-        valor = float(input("Informe o valor do saque: "))
+        valor = Dinheiro.de_texto(input("Informe o valor do saque: "))
     except ValueError:
         print("\n!!! Erro: Valor de saque inválido. Informe um número.")
         return
@@ -456,7 +1271,53 @@ def sacar(clientes: list[PessoaFisica]):
     print(f"Saldo atual da conta {conta.numero}: R${conta.saldo:.2f}")
     log_operacao_menu("Sacar")
 
-def exibir_extrato(clientes: list[PessoaFisica]):
+def transferir(clientes: RegistroClientes, contas: RegistroContas):
+    print("\n--- Transferir ---")
+    cpf = input("Informe o CPF do cliente: ")
+    cliente = filtrar_cliente(cpf, clientes)
+
+    if not cliente:
+        print("\n!!! Erro: Cliente não encontrado!")
+        return
+
+    if not cliente.contas:
+        print("\n!!! Erro: Cliente não possui contas. Crie uma conta primeiro.")
+        return
+
+    print("\nContas disponíveis para transferência:")
+    for i, conta in enumerate(cliente.contas):
+        print(f"  [{i+1}] Conta: {conta.numero} - Saldo: R${conta.saldo:.2f} ({type(conta).__name__})")
+
+    escolha_conta = input("Escolha o número da conta de origem: ")
+    try:
+        idx_conta = int(escolha_conta) - 1
+        if not (0 <= idx_conta < len(cliente.contas)):
+            raise ValueError
+        conta = cliente.contas[idx_conta]
+    except ValueError:
+        print("\n!!! Erro: Seleção de conta inválida.")
+        return
+
+    try:
+        destino = contas.buscar(int(input("Informe o número da conta de destino: ")))
+    except ValueError:
+        destino = None
+    if destino is None or destino is conta:
+        print("\n!!! Erro: Conta de destino inválida.")
+        return
+
+    try:
+        valor = Dinheiro.de_texto(input("Informe o valor da transferência: "))
+        transacao = Transferencia(valor, destino)
+    except ValueError:
+        print("\n!!! Erro: Valor de transferência inválido. Informe um número positivo.")
+        return
+
+    cliente.realizar_transacao(conta, transacao)
+    print(f"Saldo atual da conta {conta.numero}: R${conta.saldo:.2f}")
+    log_operacao_menu("Transferir")
+
+def exibir_extrato(clientes: RegistroClientes):
     print("\n--- Extrato ---")
     cpf = input("Informe o CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
@@ -483,11 +1344,19 @@ def exibir_extrato(clientes: list[PessoaFisica]):
         print("\n!!! Erro: Seleção de conta inválida.")
         return
 
-    conta.historico.gerar_relatorio()
+    tipo_extrato = input("Tipo de extrato ([c] completo / [r] resumo): ").lower().strip()
+    if tipo_extrato != "r":
+        mais_recentes_primeiro = escolher_ordem_extrato()
+        print("\n--- Extrato ---")
+        paginas = conta.historico.paginas(TAMANHO_PAGINA_EXTRATO, mais_recentes_primeiro=mais_recentes_primeiro)
+        if not exibir_paginas(paginas):
+            print("Nenhuma transação realizada.")
+        print("---------------")
+    conta.historico.gerar_resumo()
     print(f"Saldo Atual: R${conta.saldo:.2f}")
     log_operacao_menu("Exibir Extrato")
 
-def listar_transacoes_por_tipo(clientes: list[PessoaFisica]):
+def listar_transacoes_por_tipo(clientes: RegistroClientes):
     print("\n--- Listar Transações por Tipo ---")
     cpf = input("Informe o CPF do cliente: ")
     cliente = filtrar_cliente(cpf, clientes)
@@ -514,14 +1383,21 @@ def listar_transacoes_por_tipo(clientes: list[PessoaFisica]):
         print("\n!!! Erro: Seleção de conta inválida.")
         return
 
-    tipo_filtro = input("Filtrar por tipo (Deposito/Saque) ou deixar em branco para todos: ").strip()
+    tipo_filtro = input("Filtrar por tipo (Deposito/Saque/Transferencia/TransferenciaRecebida) ou deixar em branco para todos: ").strip()
+    try:
+        data_inicial = input("Data inicial (dd/mm/aaaa) ou deixar em branco: ").strip()
+        data_final = input("Data final (dd/mm/aaaa) ou deixar em branco: ").strip()
+        inicio = datetime.strptime(data_inicial, "%d/%m/%Y") if data_inicial else None
+        fim = datetime.strptime(data_final, "%d/%m/%Y") + timedelta(days=1) - _MICROSSEGUNDO if data_final else None
+    except ValueError:
+        print("\n!!! Erro: Data inválida. Use o formato dd/mm/aaaa.")
+        return
+    mais_recentes_primeiro = escolher_ordem_extrato()
     
     print(f"\n--- Transações da Conta {conta.numero} (Filtrado por: {tipo_filtro if tipo_filtro else 'Todos'}) ---")
-    encontrou_transacao = False
-    for transacao in conta.historico.transacoes_por_tipo(tipo_filtro):
-        tipo = type(transacao).__name__
-        print(f"Tipo: {tipo:<8} | Valor: R${transacao.valor:7.2f} | Data: {transacao.data.strftime('%d/%m/%Y %H:%M:%S')}")
-        encontrou_transacao = True
+    paginas = conta.historico.paginas(TAMANHO_PAGINA_EXTRATO, mais_recentes_primeiro=mais_recentes_primeiro,
+                                      tipo_filtro=tipo_filtro, inicio=inicio, fim=fim)
+    encontrou_transacao = exibir_paginas(paginas)
     
     if not encontrou_transacao:
         print("Nenhuma transação encontrada para o filtro especificado.")
@@ -529,9 +1405,55 @@ def listar_transacoes_por_tipo(clientes: list[PessoaFisica]):
     log_operacao_menu("Listar Transações por Tipo")
 
 
+def gerar_extratos_mes(contas: RegistroContas):
+    print("\n--- Extratos do Mês ---")
+    if not contas:
+        print("Nenhuma conta cadastrada.")
+        return
+    try:
+        inicio = datetime.strptime(input("Mês de referência (mm/aaaa): ").strip(), "%m/%Y")
+    except ValueError:
+        print("\n!!! Erro: Mês inválido. Use o formato mm/aaaa.")
+        return
+    proximo_mes = (inicio + timedelta(days=32)).replace(day=1)
+    diretorio = input(f"Diretório de saída (Enter para extratos_{inicio:%Y_%m}): ").strip() or f"extratos_{inicio:%Y_%m}"
+
+    nomes_tipos = {codigo: tipo.__name__ for codigo, tipo in _TIPOS_TRANSACAO.items()}
+    try:
+        caminho_indice = gerar_extratos(contas, diretorio, nomes_tipos, _CODIGOS_DEBITO, inicio=inicio,
+                                        fim=proximo_mes - _MICROSSEGUNDO)
+    except OSError as erro:
+        print(f"\n!!! Erro: Não foi possível gravar os extratos: {erro}")
+        return
+    print(f"\n>>> {len(contas)} extratos gravados em {diretorio}; índice em {caminho_indice}.")
+    log_operacao_menu("Gerar Extratos do Mês")
+
+def exibir_metricas():
+    print("\n--- Métricas de Desempenho (µs) ---")
+    if not metricas_ativas():
+        print("Métricas desativadas.")
+        return
+    relatorio = relatorio_metricas()
+    if not relatorio:
+        print("Nenhuma operação medida ainda.")
+        return
+
+    print(f"{'Operação':<28} | {'Qtd':>7} | {'p50':>9} | {'p95':>9} | {'p99':>9} | {'Máx':>9}")
+    for nome, histograma in relatorio.items():
+        print(f"{nome:<28} | {histograma.quantidade:>7} | {histograma.percentil(0.50) / 1000:>9.1f} | "
+              f"{histograma.percentil(0.95) / 1000:>9.1f} | {histograma.percentil(0.99) / 1000:>9.1f} | "
+              f"{histograma.maximo / 1000:>9.1f}")
+    print("-" * 86)
+    log_operacao_menu("Exibir Métricas")
+
 def main():
-    clientes: list[PessoaFisica] = []
-    contas: list[Conta] = []
+    clientes, contas, diario = recuperar_estado(CAMINHO_DIARIO, caminho_snapshot=CAMINHO_SNAPSHOT)
+    ativar_diario(diario)
+    eventos = RegistroEventos(CAMINHO_EVENTOS)
+    ativar_registro_eventos(eventos)
+    ativar_metricas()
+    agendador = AgendadorVirada(_CALENDARIO)
+    posicao_ultimo_snapshot = diario.posicao
 
     while True:
         limpar_tela()
@@ -541,6 +1463,8 @@ def main():
             depositar(clientes)
         elif opcao == "s":
             sacar(clientes)
+        elif opcao == "t":
+            transferir(clientes, contas)
         elif opcao == "e":
             exibir_extrato(clientes)
         elif opcao == "nu":
@@ -551,14 +1475,26 @@ def main():
             listar_contas(contas)
         elif opcao == "lt":
             listar_transacoes_por_tipo(clientes)
+        elif opcao == "m":
+            exibir_metricas()
+        elif opcao == "x":
+            gerar_extratos_mes(contas)
         elif opcao == "q":
             print("\nSaindo do sistema. Até mais!")
+            gravar_estado(CAMINHO_SNAPSHOT, clientes, contas, diario)
+            diario.fechar()
+            agendador.fechar()
             log_operacao_menu("Sair do Sistema")
+            eventos.fechar()
             break
         else:
             print("\n!!! Operação inválida, por favor selecione novamente a opção desejada.")
             log_operacao_menu(f"Opção Inválida: {opcao}")
 
+        if diario.posicao - posicao_ultimo_snapshot >= BYTES_DIARIO_POR_SNAPSHOT:
+            gravar_estado(CAMINHO_SNAPSHOT, clientes, contas, diario)
+            posicao_ultimo_snapshot = diario.posicao
+
         input("\nPressione Enter para continuar...")
 
 if __name__ == "__main__":
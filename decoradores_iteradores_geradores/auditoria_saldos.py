@@ -0,0 +1,102 @@
+# Auditoria de saldos: recalcula o saldo de todas as contas a partir das colunas do
+# Historico e confere com Conta.saldo. Usa NumPy quando disponível e, sem ele,
+# recai em um cálculo em Python puro com o mesmo resultado.
+from array import array
+from collections.abc import Iterable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from Banco_iteradores_geradores_decoradores import _CODIGOS_DEBITO, Conta
+from banco_comum.dinheiro import Dinheiro
+
+CODIGOS_DEBITO = array('b', sorted(_CODIGOS_DEBITO))
+
+class ColunasContas:
+    # Históricos de várias contas concatenados; as transações da conta numeros[i]
+    # ocupam as posições inicios[i]..inicios[i + 1] de tipos e valores.
+    __slots__ = ("numeros", "saldos_registrados", "inicios", "tipos", "valores")
+
+    def __init__(self):
+        self.numeros = array('q')
+        self.saldos_registrados = array('q')
+        self.inicios = array('q', [0])
+        self.tipos = array('b')
+        self.valores = array('q')
+
+    def __len__(self) -> int:
+        return len(self.numeros)
+
+class Divergencia:
+    __slots__ = ("numero", "saldo_calculado", "saldo_registrado")
+
+    def __init__(self, numero: int, saldo_calculado: float, saldo_registrado: float):
+        self.numero = numero
+        self.saldo_calculado = saldo_calculado
+        self.saldo_registrado = saldo_registrado
+
+    def __repr__(self) -> str:
+        return (f"Divergencia(numero={self.numero}, saldo_calculado={self.saldo_calculado:.2f}, "
+                f"saldo_registrado={self.saldo_registrado:.2f})")
+
+def exportar_colunas(contas: Iterable[Conta]) -> ColunasContas:
+    colunas = ColunasContas()
+    for conta in contas:
+        _, tipos, valores, _ = conta.historico.exportar_colunas()
+        colunas.numeros.append(conta.numero)
+        colunas.saldos_registrados.append(int(conta.saldo))
+        colunas.tipos.extend(tipos)
+        colunas.valores.extend(valores)
+        colunas.inicios.append(len(colunas.tipos))
+    return colunas
+
+def _acumulado_numpy(colunas: ColunasContas):
+    tipos = np.frombuffer(colunas.tipos, dtype=np.int8)
+    valores = np.frombuffer(colunas.valores, dtype=np.int64)
+    assinados = np.where(np.isin(tipos, np.frombuffer(CODIGOS_DEBITO, dtype=np.int8)), -valores, valores)
+    return np.concatenate((np.zeros(1, dtype=np.int64), np.cumsum(assinados)))
+
+def recalcular_saldos(colunas: ColunasContas) -> array:
+    # Saldo final de cada conta, em centavos, na ordem de colunas.numeros.
+    if np is not None:
+        acumulado = _acumulado_numpy(colunas)
+        inicios = np.frombuffer(colunas.inicios, dtype=np.int64)
+        return array('q', (acumulado[inicios[1:]] - acumulado[inicios[:-1]]).tobytes())
+
+    saldos = array('q')
+    tipos, valores, inicios = colunas.tipos, colunas.valores, colunas.inicios
+    for i in range(len(colunas.numeros)):
+        inicio, fim = inicios[i], inicios[i + 1]
+        saldos.append(sum(-valor if tipo in _CODIGOS_DEBITO else valor
+                          for tipo, valor in zip(tipos[inicio:fim], valores[inicio:fim])))
+    return saldos
+
+def saldos_correntes(colunas: ColunasContas) -> array:
+    # Saldo da conta logo após cada transação, em centavos, alinhado com colunas.tipos.
+    if np is not None:
+        acumulado = _acumulado_numpy(colunas)
+        inicios = np.frombuffer(colunas.inicios, dtype=np.int64)
+        bases = np.repeat(acumulado[inicios[:-1]], np.diff(inicios))
+        return array('q', (acumulado[1:] - bases).tobytes())
+
+    correntes = array('q')
+    tipos, valores, inicios = colunas.tipos, colunas.valores, colunas.inicios
+    for i in range(len(colunas.numeros)):
+        saldo = 0
+        for posicao in range(inicios[i], inicios[i + 1]):
+            saldo += -valores[posicao] if tipos[posicao] in _CODIGOS_DEBITO else valores[posicao]
+            correntes.append(saldo)
+    return correntes
+
+def auditar_saldos(contas: Iterable[Conta]) -> list[Divergencia]:
+    colunas = exportar_colunas(contas)
+    calculados = recalcular_saldos(colunas)
+    registrados = colunas.saldos_registrados
+    if np is not None:
+        diferentes = np.nonzero(np.frombuffer(calculados, dtype=np.int64) !=
+                                np.frombuffer(registrados, dtype=np.int64))[0].tolist()
+    else:
+        diferentes = [i for i in range(len(calculados)) if calculados[i] != registrados[i]]
+    return [Divergencia(colunas.numeros[i], Dinheiro(calculados[i]), Dinheiro(registrados[i])) for i in diferentes]
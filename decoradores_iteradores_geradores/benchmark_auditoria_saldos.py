@@ -0,0 +1,56 @@
+# Benchmark: auditoria de saldos sobre milhões de transações.
+# Uso: python benchmark_auditoria_saldos.py [transacoes] [contas]   (ex.: 20000000 100000)
+import random
+import sys
+import time
+
+import auditoria_saldos
+from auditoria_saldos import auditar_saldos, exportar_colunas, recalcular_saldos
+from Banco_iteradores_geradores_decoradores import (_CODIGOS_TRANSACAO, ContaCorrente, Deposito, PessoaFisica,
+                                                    Saque)
+
+def criar_contas(transacoes: int, quantidade_contas: int) -> list[ContaCorrente]:
+    cliente = PessoaFisica(cpf="00000000000", nome="Cliente", data_nascimento="01-01-1990", endereco="Rua A, 1")
+    contas = [ContaCorrente(cliente=cliente, numero=1001 + i) for i in range(quantidade_contas)]
+    deposito, saque = _CODIGOS_TRANSACAO[Deposito], _CODIGOS_TRANSACAO[Saque]
+    por_conta = transacoes // quantidade_contas
+    for conta in contas:
+        historico = conta.historico
+        saldo = 0
+        for i in range(por_conta):
+            valor = random.randint(1, 50_000)
+            if i % 3 == 2 and valor <= saldo:
+                historico._adicionar(i, saque, valor, i)
+                saldo -= valor
+            else:
+                historico._adicionar(i, deposito, valor, i)
+                saldo += valor
+        conta._saldo = saldo
+    return contas
+
+def main():
+    transacoes = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    quantidade_contas = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+    motor = "NumPy" if auditoria_saldos.np is not None else "Python puro"
+    print(f"Gerando {transacoes} transações em {quantidade_contas} contas...")
+    contas = criar_contas(transacoes, quantidade_contas)
+
+    inicio = time.perf_counter()
+    colunas = exportar_colunas(contas)
+    exportacao = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    recalcular_saldos(colunas)
+    recalculo = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    divergencias = auditar_saldos(contas)
+    auditoria = time.perf_counter() - inicio
+
+    print(f"Motor: {motor}")
+    print(f"Exportação das colunas: {exportacao:.2f} s")
+    print(f"Recálculo dos saldos:   {recalculo:.2f} s ({len(colunas.tipos) / recalculo:,.0f} transações/s)")
+    print(f"Auditoria completa:     {auditoria:.2f} s ({len(divergencias)} divergências)")
+
+if __name__ == "__main__":
+    main()
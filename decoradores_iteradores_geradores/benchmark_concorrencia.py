@@ -0,0 +1,80 @@
+# Benchmark de estresse: vários caixas (threads) fazendo depósitos e saques nas mesmas
+# contas ao mesmo tempo. Ao final confere a integridade de cada conta: o saldo deve ser
+# igual a depósitos menos saques do histórico, nenhum saldo pode ficar negativo e os ids
+# de transação não podem se repetir. O intervalo de troca de threads é reduzido para
+# forçar intercalações; com o GIL o ganho de vazão é limitado, o objetivo é a corretude.
+import contextlib
+import os
+import random
+import sys
+import threading
+import time
+
+from Banco_iteradores_geradores_decoradores import ContaCorrente, Deposito, PessoaFisica, Saque
+
+CONTAS = 8
+OPERACOES_POR_CAIXA = 20_000
+CAIXAS = (1, 2, 4, 8, 16)
+
+def criar_contas() -> list[tuple[PessoaFisica, ContaCorrente]]:
+    contas = []
+    for i in range(CONTAS):
+        cliente = PessoaFisica(cpf=f"{i:011d}", nome=f"Cliente {i}", data_nascimento="01-01-1990", endereco="Rua A, 1")
+        conta = ContaCorrente(cliente=cliente, numero=1001 + i, limite_valor_saque=1_000.0, limite_saques_diarios_cc=10**9)
+        cliente.adicionar_conta(conta)
+        contas.append((cliente, conta))
+    return contas
+
+def caixa(contas, semente: int, largada: threading.Barrier):
+    aleatorio = random.Random(semente)
+    largada.wait()
+    for _ in range(OPERACOES_POR_CAIXA):
+        cliente, conta = contas[aleatorio.randrange(CONTAS)]
+        valor = float(aleatorio.randint(1, 200))
+        transacao = Deposito(valor) if aleatorio.random() < 0.5 else Saque(valor)
+        cliente.realizar_transacao(conta, transacao)
+
+def verificar(contas) -> list[str]:
+    erros = []
+    ids = set()
+    total = 0
+    for _, conta in contas:
+        historico = conta.historico
+        depositos = historico.agregado("deposito").total
+        saques = historico.agregado("saque").total
+        if conta.saldo < 0:
+            erros.append(f"conta {conta.numero}: saldo negativo {conta.saldo:.2f}")
+        if conta.saldo != depositos - saques:
+            erros.append(f"conta {conta.numero}: saldo {conta.saldo:.2f} != histórico {depositos - saques:.2f}")
+        ids_conta = historico.exportar_colunas()[0]
+        ids.update(ids_conta)
+        total += len(ids_conta)
+    if len(ids) != total:
+        erros.append(f"{total - len(ids)} ids de transação repetidos")
+    return erros
+
+def main():
+    sys.setswitchinterval(1e-6)
+    print(f"{CONTAS} contas, {OPERACOES_POR_CAIXA} operações por caixa")
+    print(f"{'caixas':>6} | {'tempo (s)':>9} | {'operações/s':>11} | integridade")
+    print("-" * 48)
+    with open(os.devnull, "w") as saida, contextlib.redirect_stdout(saida):
+        resultados = []
+        for quantidade in CAIXAS:
+            contas = criar_contas()
+            largada = threading.Barrier(quantidade + 1)
+            threads = [threading.Thread(target=caixa, args=(contas, semente, largada)) for semente in range(quantidade)]
+            for thread in threads:
+                thread.start()
+            largada.wait()
+            inicio = time.perf_counter()
+            for thread in threads:
+                thread.join()
+            duracao = time.perf_counter() - inicio
+            resultados.append((quantidade, duracao, verificar(contas)))
+    for quantidade, duracao, erros in resultados:
+        operacoes = quantidade * OPERACOES_POR_CAIXA
+        print(f"{quantidade:>6} | {duracao:>9.2f} | {operacoes / duracao:>11.0f} | {'ok' if not erros else erros[0]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# Benchmark: limites diários em 1M de contas. Mede o custo por verificação de saque com a
+# checagem preguiçosa do dia (comparada às regras compiladas sozinhas), a virada da
+# meia-noite pelo calendário, que visita só as contas ativas no dia, contra zerar todas
+# as contas, e as primeiras verificações do dia seguinte (que zeram o balde na hora).
+import random
+import sys
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from Banco_iteradores_geradores_decoradores import (OPERACAO_OK, ContaCorrente, Historico, PessoaFisica,
+                                                    ativar_calendario)
+from banco_comum.contadores_diarios import CalendarioDiario
+
+CONTAS = 1_000_000
+ATIVAS = 100_000
+VERIFICACOES = 2_000_000
+
+def validar(validacao, contas: list[ContaCorrente], indices: list[int], valores: list[int]) -> float:
+    inicio = time.perf_counter_ns()
+    for indice, valor in zip(indices, valores):
+        validacao(contas[indice], valor)
+    return (time.perf_counter_ns() - inicio) / len(indices)
+
+def verificar(contas: list[ContaCorrente], indices: list[int], valores: list[int]) -> tuple[float, int]:
+    aprovados = 0
+    inicio = time.perf_counter_ns()
+    for indice, valor in zip(indices, valores):
+        conta = contas[indice]
+        if conta._validar_saque(valor) == OPERACAO_OK:
+            conta._debitar(valor)
+            aprovados += 1
+    return (time.perf_counter_ns() - inicio) / len(indices), aprovados
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else CONTAS
+    ativas = min(ATIVAS, quantidade)
+    agora = [datetime(2026, 3, 10, 9, 0, tzinfo=ZoneInfo("America/Sao_Paulo")).timestamp()]
+    calendario = CalendarioDiario(ZoneInfo("America/Sao_Paulo"), relogio=lambda: agora[0])
+    ativar_calendario(calendario)
+
+    print(f"Criando {quantidade:,} contas...")
+    cliente = PessoaFisica(cpf="00000000000", nome="Cliente", data_nascimento="01-01-1990", endereco="Rua A, 1")
+    historico = Historico()
+    contas = [ContaCorrente(cliente=cliente, numero=numero, limite_valor_saque=500.0, limite_saques_diarios_cc=5,
+                            historico=historico) for numero in range(quantidade)]
+    for conta in contas:
+        conta._saldo = 1_000_000_00
+
+    random.seed(42)
+    indices = [random.randrange(ativas) for _ in range(VERIFICACOES)]
+    valores = [random.randint(1, 600_00) for _ in range(VERIFICACOES)]
+
+    # Primeiro acesso do dia em cada conta ativa: abre o balde.
+    abertura, _ = verificar(contas, range(ativas), [1_00] * ativas)
+    por_verificacao, aprovados = verificar(contas, indices, valores)
+    so_regras = validar(ContaCorrente._regras_saque, contas, indices, valores)
+    com_dia = validar(ContaCorrente._validar_saque, contas, indices, valores)
+
+    print(f"{'':34} {'ns/operação':>11}")
+    print(f"{'regras compiladas (sem dia)':34} {so_regras:11.0f}")
+    print(f"{'regras + checagem do dia':34} {com_dia:11.0f}")
+    print(f"{'verificação + débito dos contadores':34} {por_verificacao:11.0f}   ({aprovados:,} saques aprovados)")
+    print(f"{'abertura do balde (1º acesso)':34} {abertura:11.0f}")
+
+    agora[0] += 86_400
+    inicio = time.perf_counter()
+    visitadas = calendario.virar()
+    virada = time.perf_counter() - inicio
+    # Sem baldes, a virada teria de zerar todas as contas.
+    inicio = time.perf_counter()
+    for conta in contas:
+        with conta._trava:
+            conta._saques_hoje = 0
+            conta._volume_saques_hoje = 0
+    todas = time.perf_counter() - inicio
+    print(f"\nVirada da meia-noite: {visitadas:,} contas ativas em {virada * 1000:.1f} ms "
+          f"(zerar todas as {quantidade:,}: {todas * 1000:.1f} ms)")
+
+    # Mais um dia sem chamar virar(): as contas zeram o balde no primeiro acesso.
+    agora[0] += 86_400
+    depois, _ = verificar(contas, range(ativas), [1_00] * ativas)
+    print(f"Dia seguinte sem virada agendada: {depois:.0f} ns no primeiro acesso de cada conta")
+
+if __name__ == "__main__":
+    main()
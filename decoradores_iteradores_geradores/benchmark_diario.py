@@ -0,0 +1,35 @@
+# Benchmark: vazão do diário com diferentes tamanhos de grupo de fsync e tempo de recuperação.
+import os
+import tempfile
+import time
+
+from diario import DiarioTransacoes, ler_registros
+
+REGISTROS = 200_000
+GRUPOS_FSYNC = [1, 16, 256, 4096]
+
+def gravar(caminho: str, registros_por_fsync: int, quantidade: int) -> float:
+    inicio = time.perf_counter()
+    with DiarioTransacoes(caminho, registros_por_fsync=registros_por_fsync, intervalo_fsync=float("inf")) as diario:
+        for i in range(quantidade):
+            diario.registrar_transacao(1001 + i % 1_000, i, 1 + i % 2, 10_000, i)
+    return time.perf_counter() - inicio
+
+def main():
+    with tempfile.TemporaryDirectory() as pasta:
+        print(f"{'registros/fsync':>15} | {'registros':>9} | {'registros/s':>12}")
+        print("-" * 44)
+        for grupo in GRUPOS_FSYNC:
+            caminho = os.path.join(pasta, f"diario_{grupo}.bin")
+            # Com fsync a cada registro o teste é limitado a uma amostra menor.
+            quantidade = min(REGISTROS, grupo * 2_000)
+            duracao = gravar(caminho, grupo, quantidade)
+            print(f"{grupo:>15} | {quantidade:>9} | {quantidade / duracao:>12.0f}")
+
+        inicio = time.perf_counter()
+        lidos = sum(1 for _ in ler_registros(caminho))
+        duracao = time.perf_counter() - inicio
+        print(f"\nLeitura para recuperação: {lidos} registros em {duracao:.2f} s ({lidos / duracao:.0f} registros/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# Benchmark: Dinheiro (centavos em int) contra float e decimal.Decimal. Cada passo soma um
+# valor ao saldo, subtrai outro e compara com um limite (3 operações), e ao final mostra o
+# desvio acumulado em centavos. Também mede a interpretação de valores digitados.
+# A aritmética em Dinheiro é a mais lenta (cada operação passa por __add__/__sub__ em Python
+# e cria um objeto novo); por isso a Conta do banco guarda _saldo como int e só converte nas
+# bordas: int(valor) na entrada de cada operação e Dinheiro(_saldo) na leitura do saldo. A
+# linha "Dinheiro nas bordas" mede esse caminho.
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from banco_comum.dinheiro import Dinheiro
+
+OPERACOES = 10_000_000
+TEXTOS = 1_000_000
+
+def movimentar(pares: list, zero, limite, passos: int) -> tuple[float, object]:
+    saldo = zero
+    acima = 0
+    inicio = time.perf_counter()
+    for _ in range(passos // len(pares)):
+        for entrada, saida in pares:
+            saldo = saldo + entrada - saida
+            if saldo > limite:
+                acima += 1
+    return time.perf_counter() - inicio, saldo
+
+def movimentar_nas_bordas(pares: list, zero, limite, passos: int) -> tuple[float, object]:
+    # Como Conta: valores chegam como Dinheiro, o saldo é int e só vira Dinheiro na saída.
+    saldo = int(zero)
+    limite = int(limite)
+    acima = 0
+    inicio = time.perf_counter()
+    for _ in range(passos // len(pares)):
+        for entrada, saida in pares:
+            saldo = saldo + int(entrada) - int(saida)
+            if saldo > limite:
+                acima += 1
+    return time.perf_counter() - inicio, Dinheiro(saldo)
+
+def interpretar(conversao, textos: list[str]) -> float:
+    inicio = time.perf_counter()
+    for texto in textos:
+        conversao(texto)
+    return time.perf_counter() - inicio
+
+def texto_com_ponto(texto: str) -> str:
+    # float e Decimal só entendem o ponto decimal: converte "R$ 1.234,56" para "1234.56".
+    return texto.removeprefix("R$ ").replace(".", "").replace(",", ".") if "," in texto else texto
+
+def main():
+    operacoes = int(sys.argv[1]) if len(sys.argv) > 1 else OPERACOES
+    random.seed(42)
+    centavos = [(random.randint(1, 99_999), random.randint(1, 99_999)) for _ in range(1_000)]
+    passos = operacoes // 3 // len(centavos) * len(centavos)
+    limite = 10**9
+
+    em_dinheiro = [(Dinheiro(e), Dinheiro(s)) for e, s in centavos]
+    tipos = [
+        ("float", movimentar, [(e / 100, s / 100) for e, s in centavos], 0.0, limite / 100,
+         lambda saldo: saldo * 100),
+        ("Decimal", movimentar, [(Decimal(e).scaleb(-2), Decimal(s).scaleb(-2)) for e, s in centavos],
+         Decimal(0), Decimal(limite).scaleb(-2), lambda saldo: saldo.scaleb(2)),
+        ("Dinheiro", movimentar, em_dinheiro, Dinheiro(0), Dinheiro(limite), int),
+        ("Dinheiro nas bordas", movimentar_nas_bordas, em_dinheiro, Dinheiro(0), Dinheiro(limite), int),
+        ("int (centavos)", movimentar, centavos, 0, limite, int),
+    ]
+    print(f"{passos * 3:,} operações (soma, subtração e comparação)")
+    print(f"{'tipo':>19} | {'tempo (s)':>9} | {'Mops/s':>7} | {'desvio (centavos)':>17}")
+    print("-" * 62)
+    exato = passos // len(centavos) * sum(e - s for e, s in centavos)
+    for nome, medir, pares, zero, limite_tipo, para_centavos in tipos:
+        tempo, saldo = medir(pares, zero, limite_tipo, passos)
+        desvio = float(para_centavos(saldo) - exato)
+        print(f"{nome:>19} | {tempo:9.2f} | {passos * 3 / tempo / 1e6:7.2f} | {desvio:>17.6f}")
+
+    sorteados = [c for c, _ in random.choices(centavos, k=TEXTOS)]
+    formatos = (("1234.56", [f"{c // 100}.{c % 100:02d}" for c in sorteados]),
+                ("R$ 1.234,56", [f"R$ {c // 100:,}".replace(",", ".") + f",{c % 100:02d}" for c in sorteados]))
+    for formato, textos in formatos:
+        print(f"\nInterpretação de {TEXTOS:,} valores digitados como \"{formato}\"")
+        for nome, conversao in (("float", lambda texto: float(texto_com_ponto(texto))),
+                                ("Decimal", lambda texto: Decimal(texto_com_ponto(texto))),
+                                ("Dinheiro.de_texto", Dinheiro.de_texto)):
+            tempo = interpretar(conversao, textos)
+            print(f"{nome:>18} | {tempo:6.2f} s | {TEXTOS / tempo / 1e6:5.2f} M/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# Benchmark: exportação e importação em massa de clientes, contas e históricos.
+# Mede linhas/s de cada exportador e importador em CSV e JSONL, compara a importação com o
+# cadastro pelo menu (cadastrar_usuario/criar_conta com input() e print()) em uma amostra
+# menor e confere a ida e volta: ContasIterator igual ao original e auditoria sem divergências.
+# Uso: python benchmark_exportacao_importacao.py [contas] [transacoes] [amostra_menu]
+#      (ex.: 200000 1000000 20000)
+import contextlib
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import Banco_iteradores_geradores_decoradores as banco
+from Banco_iteradores_geradores_decoradores import (_CODIGOS_TRANSACAO, ContaCorrente, ContasIterator, Deposito,
+                                                    PessoaFisica, RegistroClientes, RegistroContas, Saque)
+from auditoria_saldos import auditar_saldos
+from exportacao_importacao import (exportar_clientes, exportar_contas, exportar_historicos, importar_clientes,
+                                   importar_contas, importar_historicos)
+
+def criar_banco(quantidade_contas: int, transacoes: int) -> tuple[RegistroClientes, RegistroContas]:
+    clientes, contas = RegistroClientes(), RegistroContas()
+    deposito, saque = _CODIGOS_TRANSACAO[Deposito], _CODIGOS_TRANSACAO[Saque]
+    inicio_us = int(datetime(2026, 3, 1).timestamp() - datetime(1970, 1, 1).timestamp()) * 1_000_000
+    por_conta = transacoes // quantidade_contas
+    id = 0
+    for i in range(quantidade_contas):
+        cliente = PessoaFisica(cpf=f"{i:011d}", nome=f"Cliente {i}", data_nascimento="01-01-1990",
+                               endereco=f"Rua {i % 500}, {i} - Centro - Cidade/UF")
+        conta = ContaCorrente(cliente=cliente, numero=1001 + i, limite_valor_saque=random.choice((500.0, 1000.0)),
+                              limite_saques_diarios_cc=random.choice((3, 5)))
+        historico, saldo = conta.historico, 0
+        for j in range(por_conta):
+            id += 1
+            valor = random.randint(1, 50_000)
+            data_us = inicio_us + j * 60_000_000
+            if j % 3 == 2 and valor <= saldo:
+                historico._adicionar(id, saque, valor, data_us)
+                saldo -= valor
+            else:
+                historico._adicionar(id, deposito, valor, data_us)
+                saldo += valor
+        conta._saldo = saldo
+        clientes.adicionar(cliente)
+        contas.adicionar(conta)
+        cliente.adicionar_conta(conta)
+        clientes.registrar_conta(conta)
+    return clientes, contas
+
+def cadastrar_pelo_menu(quantidade: int) -> float:
+    # Mesmo fluxo do menu: respostas de input() vindas de uma lista, print() para /dev/null.
+    clientes, contas = RegistroClientes(), RegistroContas()
+    respostas = []
+    for i in range(quantidade):
+        respostas += (f"{i:011d}", f"Cliente {i}", "01-01-1990", "Rua A, 1 - Centro - Cidade/UF")
+        respostas += (f"{i:011d}", "500", "3")
+    respostas = iter(respostas)
+    input_original = banco.__dict__.get("input")
+    banco.input = lambda prompt="": next(respostas)
+    try:
+        with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+            tempo_inicio = time.perf_counter()
+            for _ in range(quantidade):
+                banco.cadastrar_usuario(clientes)
+                banco.criar_conta(clientes, contas)
+            return time.perf_counter() - tempo_inicio
+    finally:
+        if input_original is None:
+            del banco.input
+        else:
+            banco.input = input_original
+
+def medir(nome: str, funcao, *args) -> tuple[float, object]:
+    tempo_inicio = time.perf_counter()
+    resultado = funcao(*args)
+    return time.perf_counter() - tempo_inicio, resultado
+
+def main():
+    quantidade_contas = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    transacoes = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+    amostra_menu = int(sys.argv[3]) if len(sys.argv) > 3 else 20_000
+    print(f"Gerando {quantidade_contas:,} clientes/contas e {transacoes:,} transações...")
+    random.seed(42)
+    clientes, contas = criar_banco(quantidade_contas, transacoes)
+    esperado = list(ContasIterator(contas))
+
+    tempo_menu = cadastrar_pelo_menu(amostra_menu)
+    # Cada cadastro pelo menu cria um cliente e uma conta.
+    linhas_menu = 2 * amostra_menu / tempo_menu
+    print(f"\nCadastro pelo menu ({amostra_menu:,} clientes + contas): {linhas_menu:,.0f} linhas/s")
+
+    print(f"\n{'etapa':>22} | {'formato':>7} | {'linhas':>10} | {'tempo (s)':>9} | {'linhas/s':>10}")
+    print("-" * 72)
+    with tempfile.TemporaryDirectory() as diretorio:
+        for formato in ("csv", "jsonl"):
+            caminhos = [os.path.join(diretorio, f"{nome}.{formato}") for nome in ("clientes", "contas", "historicos")]
+            for nome, funcao, origem, caminho in (("exportar_clientes", exportar_clientes, clientes, caminhos[0]),
+                                                  ("exportar_contas", exportar_contas, contas, caminhos[1]),
+                                                  ("exportar_historicos", exportar_historicos, contas, caminhos[2])):
+                tempo, linhas = medir(nome, funcao, origem, caminho)
+                print(f"{nome:>22} | {formato:>7} | {linhas:>10,} | {tempo:9.2f} | {linhas / tempo:10,.0f}")
+
+            novos_clientes, novas_contas = RegistroClientes(), RegistroContas()
+            for nome, funcao, args in (("importar_clientes", importar_clientes, (caminhos[0], novos_clientes)),
+                                       ("importar_contas", importar_contas, (caminhos[1], novos_clientes, novas_contas)),
+                                       ("importar_historicos", importar_historicos, (caminhos[2], novas_contas))):
+                tempo, (importadas, ignoradas) = medir(nome, funcao, *args)
+                linhas = importadas + ignoradas
+                print(f"{nome:>22} | {formato:>7} | {linhas:>10,} | {tempo:9.2f} | {linhas / tempo:10,.0f}")
+
+            iguais = list(ContasIterator(novas_contas)) == esperado
+            divergencias = auditar_saldos(novas_contas)
+            print(f"{'ida e volta':>22} | {formato:>7} | contas {'iguais' if iguais else 'DIVERGENTES'}, "
+                  f"{len(divergencias)} divergência(s) de saldo")
+            print("-" * 72)
+
+if __name__ == "__main__":
+    main()
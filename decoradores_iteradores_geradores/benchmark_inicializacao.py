@@ -0,0 +1,69 @@
+# Benchmark: tempo de inicialização reaplicando o diário inteiro comparado a
+# carregar o snapshot via mmap e reaplicar apenas a cauda do diário. Com o snapshot, o
+# histórico de cada conta é copiado em bloco e só é indexado no primeiro uso; a última
+# linha mede a primeira consulta por tipo em todas as contas, que paga essa indexação.
+# Uso: python benchmark_inicializacao.py [contas] [transacoes_por_conta]   (ex.: 1000000 2)
+import gc
+import os
+import sys
+import tempfile
+import time
+
+import Banco_iteradores_geradores_decoradores as banco
+from diario import DiarioTransacoes
+
+CONTAS = 1_000_000
+TRANSACOES_POR_CONTA = 2
+FRACAO_CAUDA = 0.01
+
+def gravar_diario(caminho: str, quantidade_contas: int, transacoes_por_conta: int):
+    with DiarioTransacoes(caminho, registros_por_fsync=1 << 20, intervalo_fsync=float("inf")) as diario:
+        for i in range(quantidade_contas):
+            cpf = f"{i:011d}"
+            diario.registrar_cliente(cpf, f"Cliente {i}", "01-01-1990", "Rua A, 1")
+            diario.registrar_conta(1001 + i, cpf, 50_000, 3)
+            for j in range(transacoes_por_conta):
+                diario.registrar_transacao(1001 + i, i * transacoes_por_conta + j + 1, 1 + j % 2, 10_000 - j, i + j)
+
+def gravar_cauda(diario: DiarioTransacoes, quantidade_contas: int):
+    for i in range(int(quantidade_contas * FRACAO_CAUDA)):
+        diario.registrar_transacao(1001 + i, 10**12 + i, 1, 500, 10**12)
+    diario.confirmar()
+
+def cronometrar_recuperacao(caminho: str, caminho_snapshot: str | None):
+    inicio = time.perf_counter()
+    clientes, contas, diario = banco.recuperar_estado(caminho, caminho_snapshot=caminho_snapshot)
+    return time.perf_counter() - inicio, clientes, contas, diario
+
+def main():
+    quantidade_contas = int(sys.argv[1]) if len(sys.argv) > 1 else CONTAS
+    transacoes_por_conta = int(sys.argv[2]) if len(sys.argv) > 2 else TRANSACOES_POR_CONTA
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "diario.bin")
+        caminho_snapshot = os.path.join(pasta, "snapshot.bin")
+        print(f"Gerando diário com {quantidade_contas} contas e {transacoes_por_conta} transações por conta...")
+        gravar_diario(caminho, quantidade_contas, transacoes_por_conta)
+
+        duracao, clientes, contas, diario = cronometrar_recuperacao(caminho, None)
+        print(f"Reaplicação completa do diário:  {duracao:.2f} s")
+
+        inicio = time.perf_counter()
+        banco.gravar_estado(caminho_snapshot, clientes, contas, diario)
+        print(f"Gravação do snapshot:            {time.perf_counter() - inicio:.2f} s "
+              f"({os.path.getsize(caminho_snapshot) / 2**20:.1f} MB)")
+        gravar_cauda(diario, quantidade_contas)
+        diario.fechar()
+        del clientes, contas
+        gc.collect()
+
+        duracao, _, contas, diario = cronometrar_recuperacao(caminho, caminho_snapshot)
+        diario.fechar()
+        print(f"Snapshot (mmap) + cauda do diário: {duracao:.2f} s")
+
+        inicio = time.perf_counter()
+        for conta in contas:
+            conta.historico.agregado("saque")
+        print(f"Primeira consulta por tipo (todas as contas): {time.perf_counter() - inicio:.2f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# Benchmark: listagem de contas e recuperação de conta por número.
+# Compara a busca antiga com next(...) sobre a lista (O(n²) na listagem) com o RegistroContas.
+import contextlib
+import os
+import random
+import time
+
+from Banco_iteradores_geradores_decoradores import (ContaCorrente, ContasIterator, PessoaFisica,
+                                                    RegistroContas, listar_contas)
+
+TAMANHOS = [1_000, 10_000, 100_000, 1_000_000]
+LIMITE_LISTAGEM_ANTIGA = 10_000
+
+def criar_contas(quantidade: int) -> RegistroContas:
+    contas = RegistroContas()
+    cliente = PessoaFisica(cpf="00000000000", nome="Cliente", data_nascimento="01-01-1990", endereco="Rua A, 1")
+    for i in range(quantidade):
+        conta = ContaCorrente(cliente=cliente, numero=1001 + i)
+        cliente.adicionar_conta(conta)
+        contas.adicionar(conta)
+    return contas
+
+def listar_contas_antigo(contas: list):
+    for conta_info in ContasIterator(contas):
+        conta_original = next((c for c in contas if c.numero == conta_info['numero']), None)
+        print(conta_info['numero'], conta_original.limite)
+
+def cronometrar(func, *args) -> float:
+    with open(os.devnull, "w") as saida, contextlib.redirect_stdout(saida):
+        inicio = time.perf_counter()
+        func(*args)
+        return time.perf_counter() - inicio
+
+def main():
+    print(f"{'contas':>10} | {'listagem antiga (s)':>19} | {'listagem indexada (s)':>21} | {'busca (us)':>10}")
+    print("-" * 72)
+    for tamanho in TAMANHOS:
+        contas = criar_contas(tamanho)
+        antigo = cronometrar(listar_contas_antigo, list(contas)) if tamanho <= LIMITE_LISTAGEM_ANTIGA else float("nan")
+        indexado = cronometrar(listar_contas, contas)
+
+        numeros = [1001 + random.randrange(tamanho) for _ in range(10_000)]
+        inicio = time.perf_counter()
+        for numero in numeros:
+            contas.buscar(numero)
+        busca = (time.perf_counter() - inicio) / len(numeros) * 1e6
+        print(f"{tamanho:>10} | {antigo:>19.3f} | {indexado:>21.3f} | {busca:>10.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# Benchmark: vazão de depósitos e saques no livro-razão particionado com 1, 2, 4, ...
+# partições (processos), até a quantidade de núcleos, comparada ao processar_lote em um
+# único processo. O ganho só aparece com núcleos livres: em uma máquina de um núcleo as
+# partições dividem o mesmo processador e o roteamento entre processos é custo puro.
+# Uso: python benchmark_livro_particionado.py [transacoes] [particoes_maximas]
+import os
+import random
+import sys
+import time
+
+from Banco_iteradores_geradores_decoradores import (ContaCorrente, PessoaFisica, RegistroClientes,
+                                                    processar_lote)
+from livro_particionado import LivroParticionado
+
+CONTAS = 10_000
+TRANSACOES = 1_000_000
+TAMANHO_LOTE = 50_000
+
+def gerar_transacoes(quantidade: int) -> list[tuple[str, int, str, float]]:
+    aleatorio = random.Random(42)
+    transacoes = []
+    for _ in range(quantidade):
+        i = aleatorio.randrange(CONTAS)
+        tipo = "deposito" if aleatorio.random() < 0.6 else "saque"
+        transacoes.append((f"{i:011d}", 1001 + i, tipo, float(aleatorio.randint(1, 500))))
+    return transacoes
+
+def em_lotes(transacoes: list, tamanho: int):
+    for inicio in range(0, len(transacoes), tamanho):
+        yield transacoes[inicio:inicio + tamanho]
+
+def processo_unico(transacoes) -> float:
+    clientes = RegistroClientes()
+    for i in range(CONTAS):
+        cliente = PessoaFisica(cpf=f"{i:011d}", nome=f"Cliente {i}", data_nascimento="01-01-1990", endereco="Rua A, 1")
+        conta = ContaCorrente(cliente=cliente, numero=1001 + i, limite_valor_saque=1_000.0, limite_saques_diarios_cc=10**9)
+        cliente.adicionar_conta(conta)
+        clientes.adicionar(cliente)
+        clientes.registrar_conta(conta)
+    inicio = time.perf_counter()
+    for lote in em_lotes(transacoes, TAMANHO_LOTE):
+        processar_lote(lote, clientes)
+    return time.perf_counter() - inicio
+
+def particionado(transacoes, particoes: int) -> float:
+    with LivroParticionado(particoes) as livro:
+        for i in range(CONTAS):
+            cpf = f"{i:011d}"
+            livro.cadastrar_usuario(cpf, f"Cliente {i}", "01-01-1990", "Rua A, 1")
+            livro.criar_conta(cpf, 1001 + i, limite_valor_saque=1_000.0, limite_saques_diarios=10**9)
+        inicio = time.perf_counter()
+        for lote in em_lotes(transacoes, TAMANHO_LOTE):
+            livro.processar_lote(lote)
+        return time.perf_counter() - inicio
+
+def main():
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else TRANSACOES
+    nucleos = os.cpu_count() or 1
+    maximo = int(sys.argv[2]) if len(sys.argv) > 2 else max(nucleos, 4)
+    transacoes = gerar_transacoes(quantidade)
+    print(f"{quantidade} transações em {CONTAS} contas, lotes de {TAMANHO_LOTE}, {nucleos} núcleo(s)")
+    print(f"{'modo':>16} | {'tempo (s)':>9} | {'transações/s':>12} | {'ganho':>6}")
+    print("-" * 54)
+    base = processo_unico(transacoes)
+    print(f"{'processo único':>16} | {base:>9.2f} | {quantidade / base:>12.0f} | {1.0:>5.2f}x")
+    particoes = 1
+    while particoes <= maximo:
+        duracao = particionado(transacoes, particoes)
+        nome = f"{particoes} partição" if particoes == 1 else f"{particoes} partições"
+        print(f"{nome:>16} | {duracao:>9.2f} | {quantidade / duracao:>12.0f} | "
+              f"{base / duracao:>5.2f}x")
+        particoes *= 2
+
+if __name__ == "__main__":
+    main()
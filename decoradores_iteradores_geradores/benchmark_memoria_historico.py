@@ -0,0 +1,43 @@
+# Benchmark: memória por transação no Historico.
+# Compara a lista de objetos Deposito/Saque usada antes com o Historico colunar.
+import gc
+import time
+import tracemalloc
+
+from Banco_iteradores_geradores_decoradores import Deposito, Historico, Saque
+
+QUANTIDADE = 1_000_000
+
+def criar_transacao(i: int):
+    return Deposito(10.0 + i % 100) if i % 3 else Saque(5.0 + i % 50)
+
+def medir(construir) -> tuple[float, float]:
+    gc.collect()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    estrutura = construir()
+    duracao = time.perf_counter() - inicio
+    atual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del estrutura
+    return atual / QUANTIDADE, duracao
+
+def lista_de_objetos():
+    return [criar_transacao(i) for i in range(QUANTIDADE)]
+
+def historico_colunar():
+    historico = Historico()
+    for i in range(QUANTIDADE):
+        historico.adicionar_transacao(criar_transacao(i))
+    return historico
+
+def main():
+    print(f"{QUANTIDADE} transações")
+    print(f"{'armazenamento':>18} | {'bytes/transação':>15} | {'tempo (s)':>9}")
+    print("-" * 50)
+    for nome, construir in [("lista de objetos", lista_de_objetos), ("historico colunar", historico_colunar)]:
+        bytes_por_transacao, duracao = medir(construir)
+        print(f"{nome:>18} | {bytes_por_transacao:>15.1f} | {duracao:>9.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Benchmark: custo do decorador @medir. Mede ns por chamada de uma função trivial sem
+# decorador, decorada com as métricas desativadas e ativadas, e o custo por transação
+# de Cliente.realizar_transacao (que passa por registrar e depositar/sacar medidos).
+# Com BANCO_METRICAS=0 nada é instrumentado e os cenários medem as funções originais.
+import contextlib
+import os
+import time
+
+import metricas
+from Banco_iteradores_geradores_decoradores import ContaCorrente, Deposito, PessoaFisica, Saque
+from metricas import ativar_metricas, limpar_metricas, medir, metricas_ativas
+
+CHAMADAS = 2_000_000
+TRANSACOES = 200_000
+
+def somar(a, b):
+    return a + b
+
+somar_medido = medir(somar, nome="benchmark.somar")
+
+def por_chamada(funcao) -> float:
+    inicio = time.perf_counter_ns()
+    for i in range(CHAMADAS):
+        funcao(i, 1)
+    return (time.perf_counter_ns() - inicio) / CHAMADAS
+
+def por_transacao() -> float:
+    cliente = PessoaFisica(cpf="00000000000", nome="Cliente", data_nascimento="01-01-1990", endereco="Rua A, 1")
+    conta = ContaCorrente(cliente=cliente, numero=1001, limite_valor_saque=1_000.0, limite_saques_diarios_cc=10**9)
+    cliente.adicionar_conta(conta)
+    with open(os.devnull, "w") as saida, contextlib.redirect_stdout(saida):
+        inicio = time.perf_counter_ns()
+        for i in range(TRANSACOES):
+            cliente.realizar_transacao(conta, Deposito(10.0) if i % 2 == 0 else Saque(5.0))
+        return (time.perf_counter_ns() - inicio) / TRANSACOES
+
+def main():
+    ativar_metricas(True)
+    if not metricas_ativas():
+        print("BANCO_METRICAS=0: instrumentação desligada, @medir devolve a própria função.\n")
+    print(f"{'cenário':>32} | {'ns/chamada':>10}")
+    print("-" * 45)
+    print(f"{'função sem decorador':>32} | {por_chamada(somar):>10.0f}")
+    ativar_metricas(False)
+    print(f"{'@medir desativado':>32} | {por_chamada(somar_medido):>10.0f}")
+    ativar_metricas(True)
+    print(f"{'@medir ativado':>32} | {por_chamada(somar_medido):>10.0f}")
+
+    ativar_metricas(False)
+    desligado = por_transacao()
+    ativar_metricas(True)
+    limpar_metricas()
+    ligado = por_transacao()
+    print(f"{'transação, métricas desativadas':>32} | {desligado:>10.0f}")
+    print(f"{'transação, métricas ativadas':>32} | {ligado:>10.0f}")
+
+    print("\nLatências medidas (µs):")
+    for nome, histograma in metricas.relatorio_metricas().items():
+        if nome.startswith("benchmark."):
+            continue
+        print(f"  {nome:<20} p50 {histograma.percentil(0.50) / 1000:6.2f}  p95 {histograma.percentil(0.95) / 1000:6.2f}"
+              f"  p99 {histograma.percentil(0.99) / 1000:6.2f}")
+
+if __name__ == "__main__":
+    main()
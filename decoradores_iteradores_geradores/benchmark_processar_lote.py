@@ -0,0 +1,56 @@
+# Benchmark: transações por segundo no caminho unitário (Cliente.realizar_transacao)
+# comparado ao processamento em lote (processar_lote).
+import contextlib
+import os
+import random
+import time
+
+from Banco_iteradores_geradores_decoradores import (ContaCorrente, Deposito, PessoaFisica, RegistroClientes,
+                                                    Saque, processar_lote)
+
+CLIENTES = 1_000
+TRANSACOES = 200_000
+
+def criar_registro() -> RegistroClientes:
+    clientes = RegistroClientes()
+    for i in range(CLIENTES):
+        cliente = PessoaFisica(cpf=f"{i:011d}", nome=f"Cliente {i}", data_nascimento="01-01-1990", endereco="Rua A, 1")
+        conta = ContaCorrente(cliente=cliente, numero=1001 + i, limite_valor_saque=1_000.0, limite_saques_diarios_cc=10**9)
+        cliente.adicionar_conta(conta)
+        clientes.adicionar(cliente)
+        clientes.registrar_conta(conta)
+    return clientes
+
+def gerar_registros() -> list[tuple[str, int, str, float]]:
+    registros = []
+    for _ in range(TRANSACOES):
+        i = random.randrange(CLIENTES)
+        tipo = "deposito" if random.random() < 0.6 else "saque"
+        registros.append((f"{i:011d}", 1001 + i, tipo, float(random.randint(1, 500))))
+    return registros
+
+def unitario(clientes: RegistroClientes, registros):
+    with open(os.devnull, "w") as saida, contextlib.redirect_stdout(saida):
+        for cpf, numero_conta, tipo, valor in registros:
+            cliente = clientes.buscar_por_cpf(cpf)
+            conta = cliente.buscar_conta(numero_conta)
+            transacao = Deposito(valor) if tipo == "deposito" else Saque(valor)
+            cliente.realizar_transacao(conta, transacao)
+
+def main():
+    registros = gerar_registros()
+    print(f"{TRANSACOES} transações em {CLIENTES} contas")
+    print(f"{'caminho':>10} | {'tempo (s)':>9} | {'transações/s':>12}")
+    print("-" * 38)
+    for nome, executar in [("unitário", unitario), ("lote", processar_lote)]:
+        clientes = criar_registro()
+        inicio = time.perf_counter()
+        if nome == "lote":
+            executar(registros, clientes)
+        else:
+            executar(clientes, registros)
+        duracao = time.perf_counter() - inicio
+        print(f"{nome:>10} | {duracao:>9.2f} | {TRANSACOES / duracao:>12.0f}")
+
+if __name__ == "__main__":
+    main()
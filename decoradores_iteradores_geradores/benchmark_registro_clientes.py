@@ -0,0 +1,42 @@
+# Benchmark: latência de busca de clientes por CPF.
+# Compara a varredura linear antiga (lista de clientes) com o RegistroClientes indexado.
+import random
+import time
+
+from Banco_iteradores_geradores_decoradores import PessoaFisica, RegistroClientes
+
+TAMANHOS = [1_000, 10_000, 100_000, 1_000_000]
+BUSCAS = 1_000
+
+def filtrar_cliente_linear(cpf: str, clientes: list[PessoaFisica]) -> PessoaFisica | None:
+    for cliente in clientes:
+        if cliente.cpf == cpf:
+            return cliente
+    return None
+
+def medir(func, cpfs) -> float:
+    inicio = time.perf_counter()
+    for cpf in cpfs:
+        func(cpf)
+    return (time.perf_counter() - inicio) / len(cpfs) * 1e6
+
+def main():
+    print(f"{'clientes':>10} | {'linear (us)':>12} | {'registro (us)':>13}")
+    print("-" * 42)
+    for tamanho in TAMANHOS:
+        lista = [PessoaFisica(cpf=f"{i:011d}", nome=f"Cliente {i}", data_nascimento="01-01-1990", endereco="Rua A, 1")
+                 for i in range(tamanho)]
+        registro = RegistroClientes()
+        for cliente in lista:
+            registro.adicionar(cliente)
+
+        cpfs = [f"{random.randrange(tamanho):011d}" for _ in range(BUSCAS)]
+        # A varredura linear fica limitada a poucas buscas nos tamanhos maiores.
+        cpfs_lineares = cpfs[:max(10, BUSCAS * 1_000 // tamanho)]
+
+        linear = medir(lambda cpf: filtrar_cliente_linear(cpf, lista), cpfs_lineares)
+        indexado = medir(registro.buscar_por_cpf, cpfs)
+        print(f"{tamanho:>10} | {linear:>12.2f} | {indexado:>13.2f}")
+
+if __name__ == "__main__":
+    main()
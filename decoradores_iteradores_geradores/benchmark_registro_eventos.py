@@ -0,0 +1,67 @@
+# Benchmark: custo por transação (Cliente.realizar_transacao) com o log desligado, com o
+# log síncrono antigo (strftime + print a cada evento, aqui gravando em arquivo) e com o
+# RegistroEventos em buffer, com e sem amostragem. O tempo de "fechar" é o que a thread
+# de gravação ainda leva para esvaziar o buffer depois da última transação. Cada modo
+# roda REPETICOES vezes e vale a melhor execução, para reduzir o ruído da máquina.
+import contextlib
+import os
+import tempfile
+import time
+from datetime import datetime
+
+import Banco_iteradores_geradores_decoradores as banco
+from Banco_iteradores_geradores_decoradores import ContaCorrente, Deposito, PessoaFisica, Saque
+from registro_eventos import RegistroEventos
+
+TRANSACOES = 200_000
+REPETICOES = 3
+
+class RegistroSincrono:
+    # Reproduz o log anterior: formata a data e imprime no momento do evento.
+    def __init__(self, caminho: str):
+        self._arquivo = open(caminho, "a", encoding="utf-8")
+
+    def registrar(self, evento: str, referencia: int = 0, valor: float = 0.0):
+        print(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')}: {evento}", file=self._arquivo, flush=True)
+
+    def fechar(self):
+        self._arquivo.close()
+
+def executar(registro) -> tuple[float, float]:
+    cliente = PessoaFisica(cpf="00000000000", nome="Cliente", data_nascimento="01-01-1990", endereco="Rua A, 1")
+    conta = ContaCorrente(cliente=cliente, numero=1001, limite_valor_saque=1_000.0, limite_saques_diarios_cc=10**9)
+    cliente.adicionar_conta(conta)
+    banco.ativar_registro_eventos(registro)
+    with open(os.devnull, "w") as saida, contextlib.redirect_stdout(saida):
+        inicio = time.perf_counter()
+        for i in range(TRANSACOES):
+            cliente.realizar_transacao(conta, Deposito(10.0) if i % 2 == 0 else Saque(5.0))
+        duracao = time.perf_counter() - inicio
+    banco.ativar_registro_eventos(None)
+    inicio = time.perf_counter()
+    if registro is not None:
+        registro.fechar()
+    return duracao, time.perf_counter() - inicio
+
+def main():
+    with tempfile.TemporaryDirectory() as pasta:
+        modos = [
+            ("desligado", lambda: None),
+            ("síncrono", lambda: RegistroSincrono(os.path.join(pasta, "sincrono.log"))),
+            ("buffer 1:1", lambda: RegistroEventos(os.path.join(pasta, "eventos1.jsonl"))),
+            ("buffer 1:10", lambda: RegistroEventos(os.path.join(pasta, "eventos10.jsonl"), amostragem=10)),
+            ("buffer 1:100", lambda: RegistroEventos(os.path.join(pasta, "eventos100.jsonl"), amostragem=100)),
+        ]
+        print(f"{TRANSACOES} transações")
+        print(f"{'modo':>13} | {'tempo (s)':>9} | {'µs/transação':>12} | {'custo do log':>12} | {'fechar (s)':>10}")
+        print("-" * 69)
+        base = None
+        for nome, criar in modos:
+            duracao, fechamento = min(executar(criar()) for _ in range(REPETICOES))
+            por_transacao = duracao / TRANSACOES * 1e6
+            base = por_transacao if base is None else base
+            print(f"{nome:>13} | {duracao:>9.2f} | {por_transacao:>12.2f} | {por_transacao - base:>+12.2f} | "
+                  f"{fechamento:>10.2f}")
+
+if __name__ == "__main__":
+    main()
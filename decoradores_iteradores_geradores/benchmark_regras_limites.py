@@ -0,0 +1,98 @@
+# Benchmark: validação de saque por regras compiladas contra a cadeia de ifs escrita à
+# mão (a ContaCorrente._validar_saque anterior) e contra um interpretador que percorre a
+# lista de regras a cada chamada. Mede ns por validação com as regras da ContaCorrente e
+# com um conjunto maior (volume diário e limites fixos adicionais).
+import sys
+import time
+
+from Banco_iteradores_geradores_decoradores import (LIMITE_SAQUES_DIARIOS, LIMITE_VALOR_SAQUE, OPERACAO_OK,
+                                                    SALDO_INSUFICIENTE, VALOR_INVALIDO, ContaCorrente,
+                                                    PessoaFisica)
+from banco_comum.regras_limites import (LimitePorOperacao, LimiteQuantidadeDiaria, LimiteVolumeDiario, SaldoSuficiente,
+                            TetoMovimentacao, ValorPositivo, compilar_regras)
+
+CHAMADAS = 1_000_000
+LIMITE_VOLUME_DIARIO = 8
+
+class ContaBenchmark(ContaCorrente):
+    __slots__ = ("_volume_saques_hoje",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._volume_saques_hoje = 0
+
+def validar_a_mao(conta, valor) -> int:
+    if valor <= 0:
+        return VALOR_INVALIDO
+    if conta._saques_hoje >= conta._limite_saques_diarios:
+        return LIMITE_SAQUES_DIARIOS
+    if valor > conta._limite_valor_saque:
+        return LIMITE_VALOR_SAQUE
+    if valor > conta._saldo:
+        return SALDO_INSUFICIENTE
+    return OPERACAO_OK
+
+def interpretar(regras):
+    # Uma função por regra, avaliadas em sequência a cada chamada.
+    condicoes = [(eval(f"lambda conta, valor: {regra.condicao()}", {"__builtins__": {}}), regra.codigo)
+                 for regra in regras]
+
+    def validar(conta, valor):
+        for condicao, codigo in condicoes:
+            if condicao(conta, valor):
+                return codigo
+        return OPERACAO_OK
+    return validar
+
+def regras_conta_corrente():
+    return [
+        ValorPositivo(VALOR_INVALIDO),
+        LimiteQuantidadeDiaria(LIMITE_SAQUES_DIARIOS, limite="_limite_saques_diarios", realizadas="_saques_hoje"),
+        LimitePorOperacao(LIMITE_VALOR_SAQUE, limite="_limite_valor_saque"),
+        SaldoSuficiente(SALDO_INSUFICIENTE),
+    ]
+
+def regras_ampliadas():
+    return regras_conta_corrente()[:3] + [
+        LimitePorOperacao(LIMITE_VALOR_SAQUE, limite=1_000_000_00),
+        LimiteVolumeDiario(LIMITE_VOLUME_DIARIO, limite=5_000_000_00, acumulado="_volume_saques_hoje"),
+        TetoMovimentacao(LIMITE_VOLUME_DIARIO, teto=10**12),
+        LimiteQuantidadeDiaria(LIMITE_SAQUES_DIARIOS, limite=10**9, realizadas="_saques_hoje"),
+        SaldoSuficiente(SALDO_INSUFICIENTE),
+    ]
+
+def por_chamada(validar, conta, valores: list[int]) -> float:
+    repeticoes = CHAMADAS // len(valores)
+    inicio = time.perf_counter_ns()
+    for _ in range(repeticoes):
+        for valor in valores:
+            validar(conta, valor)
+    return (time.perf_counter_ns() - inicio) / (repeticoes * len(valores))
+
+def main():
+    global CHAMADAS
+    CHAMADAS = int(sys.argv[1]) if len(sys.argv) > 1 else CHAMADAS
+    cliente = PessoaFisica(cpf="00000000000", nome="Cliente", data_nascimento="01-01-1990", endereco="Rua A, 1")
+    conta = ContaBenchmark(cliente=cliente, numero=1001, limite_valor_saque=500.0, limite_saques_diarios_cc=10)
+    conta._saldo = 1_000_00
+    # Maioria aprovada, com recusas por valor, limite por saque e saldo.
+    valores = [100_00, 250_00, 0, 499_99, 600_00, 50_00, 1_00, 300_00, 450_00, 20_00]
+
+    compiladas = compilar_regras(regras_conta_corrente())
+    ampliadas = regras_ampliadas()
+    for valor in valores:
+        esperado = validar_a_mao(conta, valor)
+        if compiladas(conta, valor) != esperado or ContaCorrente._validar_saque(conta, valor) != esperado:
+            raise SystemExit(f"resultado divergente para {valor}")
+
+    print(f"{CHAMADAS:,} validações, ns por chamada")
+    print(f"{'regras':>8} | {'à mão':>7} | {'interpretadas':>13} | {'compiladas':>10}")
+    print("-" * 50)
+    print(f"{len(regras_conta_corrente()):>8} | {por_chamada(validar_a_mao, conta, valores):7.0f} | "
+          f"{por_chamada(interpretar(regras_conta_corrente()), conta, valores):13.0f} | "
+          f"{por_chamada(compiladas, conta, valores):10.0f}")
+    print(f"{len(ampliadas):>8} | {'-':>7} | {por_chamada(interpretar(ampliadas), conta, valores):13.0f} | "
+          f"{por_chamada(compilar_regras(ampliadas), conta, valores):10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# Benchmark: extratos de fim de mês para todas as contas. Compara o caminho atual
+# (Historico.gerar_relatorio conta a conta, com a saída redirecionada para um arquivo)
+# com gerar_extratos no processo atual e com 1, 2, 4 e 8 processos, e confere que os
+# índices gerados são iguais.
+# Uso: python benchmark_relatorios.py [transacoes] [contas]   (ex.: 2000000 20000)
+import contextlib
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from Banco_iteradores_geradores_decoradores import (_CODIGOS_DEBITO, _CODIGOS_TRANSACAO, _TIPOS_TRANSACAO,
+                                                    ContaCorrente, Deposito, PessoaFisica, Saque)
+from relatorios import ARQUIVO_INDICE, gerar_extratos
+
+TRABALHADORES = (1, 2, 4, 8)
+
+def criar_contas(transacoes: int, quantidade_contas: int) -> list[ContaCorrente]:
+    cliente = PessoaFisica(cpf="00000000000", nome="Cliente", data_nascimento="01-01-1990", endereco="Rua A, 1")
+    contas = [ContaCorrente(cliente=cliente, numero=1001 + i) for i in range(quantidade_contas)]
+    deposito, saque = _CODIGOS_TRANSACAO[Deposito], _CODIGOS_TRANSACAO[Saque]
+    por_conta = transacoes // quantidade_contas
+    # Um mês de transações, a partir de 01/03/2026.
+    inicio_us = int(datetime(2026, 3, 1).timestamp() - datetime(1970, 1, 1).timestamp()) * 1_000_000
+    passo_us = 31 * 86_400 * 1_000_000 // max(por_conta, 1)
+    for conta in contas:
+        historico = conta.historico
+        saldo = 0
+        for i in range(por_conta):
+            valor = random.randint(1, 50_000)
+            data_us = inicio_us + i * passo_us + random.randrange(passo_us)
+            if i % 3 == 2 and valor <= saldo:
+                historico._adicionar(i, saque, valor, data_us)
+                saldo -= valor
+            else:
+                historico._adicionar(i, deposito, valor, data_us)
+                saldo += valor
+        conta._saldo = saldo
+    return contas
+
+def gerar_relatorio_serial(contas: list[ContaCorrente], diretorio: str):
+    for conta in contas:
+        with open(os.path.join(diretorio, f"extrato_{conta.numero}.txt"), "w", encoding="utf-8") as saida:
+            with contextlib.redirect_stdout(saida):
+                conta.historico.gerar_relatorio()
+
+def main():
+    transacoes = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    quantidade_contas = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    print(f"Gerando {transacoes:,} transações em {quantidade_contas:,} contas...")
+    random.seed(42)
+    contas = criar_contas(transacoes, quantidade_contas)
+    nomes_tipos = {codigo: tipo.__name__ for codigo, tipo in _TIPOS_TRANSACAO.items()}
+    inicio, fim = datetime(2026, 3, 1), datetime(2026, 3, 31, 23, 59, 59, 999999)
+
+    print(f"CPUs: {os.cpu_count()}")
+    print(f"{'caminho':>24} | {'tempo (s)':>9} | {'linhas/s':>10} | {'aceleração':>10}")
+    print("-" * 64)
+    with tempfile.TemporaryDirectory() as diretorio:
+        tempo_inicio = time.perf_counter()
+        gerar_relatorio_serial(contas, diretorio)
+        base = time.perf_counter() - tempo_inicio
+        print(f"{'gerar_relatorio serial':>24} | {base:9.2f} | {transacoes / base:10,.0f} | {1:9.2f}x")
+
+    indices = set()
+    for trabalhadores in (0, *TRABALHADORES):
+        with tempfile.TemporaryDirectory() as diretorio:
+            tempo_inicio = time.perf_counter()
+            gerar_extratos(contas, diretorio, nomes_tipos, _CODIGOS_DEBITO, inicio=inicio, fim=fim,
+                           trabalhadores=trabalhadores)
+            tempo = time.perf_counter() - tempo_inicio
+            with open(os.path.join(diretorio, ARQUIVO_INDICE), encoding="utf-8") as indice:
+                indices.add(indice.read())
+        nome = "no processo atual" if trabalhadores == 0 else f"{trabalhadores} processo(s)"
+        print(f"{nome:>24} | {tempo:9.2f} | {transacoes / tempo:10,.0f} | {base / tempo:9.2f}x")
+    print("\nÍndices idênticos em todas as execuções." if len(indices) == 1 else "\n!!! Índices divergentes.")
+
+if __name__ == "__main__":
+    main()
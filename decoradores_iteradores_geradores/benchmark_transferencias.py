@@ -0,0 +1,82 @@
+# Benchmark de transferências com alta disputa: vários caixas (threads) transferem em
+# sentidos opostos entre poucas contas (A->B e B->A ao mesmo tempo). Mede transferências
+# por segundo e confere que nenhuma thread travou (deadlock), que o dinheiro total se
+# conservou, que nenhum saldo ficou negativo e que cada saldo bate com o histórico.
+import contextlib
+import os
+import random
+import sys
+import threading
+import time
+
+from Banco_iteradores_geradores_decoradores import ContaCorrente, Deposito, PessoaFisica, Transferencia
+from banco_comum.dinheiro import Dinheiro
+
+SALDO_INICIAL = 10_000.0
+TRANSFERENCIAS_POR_CAIXA = 20_000
+CENARIOS = ((2, 2), (2, 8), (8, 8), (64, 8))  # (contas, caixas)
+TEMPO_MAXIMO = 120.0
+
+def criar_contas(quantidade: int) -> list[tuple[PessoaFisica, ContaCorrente]]:
+    contas = []
+    for i in range(quantidade):
+        cliente = PessoaFisica(cpf=f"{i:011d}", nome=f"Cliente {i}", data_nascimento="01-01-1990", endereco="Rua A, 1")
+        conta = ContaCorrente(cliente=cliente, numero=1001 + i)
+        cliente.adicionar_conta(conta)
+        cliente.realizar_transacao(conta, Deposito(SALDO_INICIAL))
+        contas.append((cliente, conta))
+    return contas
+
+def caixa(contas, semente: int, largada: threading.Barrier):
+    aleatorio = random.Random(semente)
+    largada.wait()
+    for _ in range(TRANSFERENCIAS_POR_CAIXA):
+        (cliente, origem), (_, destino) = aleatorio.sample(contas, 2)
+        cliente.realizar_transacao(origem, Transferencia(float(aleatorio.randint(1, 500)), destino))
+
+def verificar(contas) -> list[str]:
+    erros = []
+    total = 0
+    for _, conta in contas:
+        resumo = conta.historico.resumo()
+        esperado = (resumo["Deposito"].total - resumo["Saque"].total
+                    - resumo["Transferencia"].total + resumo["TransferenciaRecebida"].total)
+        if conta.saldo < 0:
+            erros.append(f"conta {conta.numero}: saldo negativo {conta.saldo:.2f}")
+        if conta.saldo != esperado:
+            erros.append(f"conta {conta.numero}: saldo {conta.saldo:.2f} != histórico {esperado:.2f}")
+        total += conta.saldo
+    if total != Dinheiro.de_reais(SALDO_INICIAL) * len(contas):
+        erros.append(f"total {total:.2f} != {SALDO_INICIAL * len(contas):.2f}")
+    return erros
+
+def executar(quantidade_contas: int, quantidade_caixas: int) -> tuple[float, list[str]]:
+    contas = criar_contas(quantidade_contas)
+    largada = threading.Barrier(quantidade_caixas + 1)
+    threads = [threading.Thread(target=caixa, args=(contas, semente, largada), daemon=True)
+               for semente in range(quantidade_caixas)]
+    for thread in threads:
+        thread.start()
+    largada.wait()
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.join(TEMPO_MAXIMO)
+    duracao = time.perf_counter() - inicio
+    if any(thread.is_alive() for thread in threads):
+        return duracao, ["deadlock: threads ainda bloqueadas"]
+    return duracao, verificar(contas)
+
+def main():
+    sys.setswitchinterval(1e-6)
+    print(f"{TRANSFERENCIAS_POR_CAIXA} transferências por caixa")
+    print(f"{'contas':>6} | {'caixas':>6} | {'tempo (s)':>9} | {'transf./s':>9} | integridade")
+    print("-" * 56)
+    with open(os.devnull, "w") as saida, contextlib.redirect_stdout(saida):
+        resultados = [(contas, caixas, *executar(contas, caixas)) for contas, caixas in CENARIOS]
+    for contas, caixas, duracao, erros in resultados:
+        transferencias = caixas * TRANSFERENCIAS_POR_CAIXA
+        print(f"{contas:>6} | {caixas:>6} | {duracao:>9.2f} | {transferencias / duracao:>9.0f} | "
+              f"{'ok' if not erros else erros[0]}")
+
+if __name__ == "__main__":
+    main()
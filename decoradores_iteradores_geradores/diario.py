@@ -0,0 +1,160 @@
+# Diário (write-ahead log) binário e somente anexação do estado do banco.
+# Cada tipo de registro tem largura fixa e começa por um byte que identifica o tipo.
+# As gravações são confirmadas em grupo: o fsync acontece ao completar `registros_por_fsync`
+# registros pendentes ou, por uma thread de fundo, no máximo `intervalo_fsync` segundos
+# depois do primeiro registro pendente, mesmo que nada mais seja anexado.
+# Com intervalo_fsync=inf não há thread e só a contagem (ou confirmar()) grava.
+import math
+import os
+import struct
+import threading
+
+REGISTRO_CLIENTE = 1
+REGISTRO_CONTA = 2
+REGISTRO_TRANSACAO = 3
+REGISTRO_TRANSFERENCIA = 4
+
+# Tamanho máximo, em bytes UTF-8, de cpf, nome, data_nascimento e endereco nos registros de
+# largura fixa do diário e do snapshot. Textos maiores são recusados, nunca cortados.
+TAMANHOS_CLIENTE = (14, 100, 10, 160)
+_ROTULOS_CLIENTE = ("CPF", "nome", "data de nascimento", "endereço")
+
+_FORMATOS = {
+    # cpf, nome, data_nascimento, endereco
+    REGISTRO_CLIENTE: struct.Struct("<B{}s{}s{}s{}s".format(*TAMANHOS_CLIENTE)),
+    # numero, cpf, limite_valor_saque (centavos), limite_saques_diarios
+    REGISTRO_CONTA: struct.Struct("<Bq14sqq"),
+    # numero_conta, id, codigo do tipo, valor (centavos), data (microssegundos)
+    REGISTRO_TRANSACAO: struct.Struct("<BqqBqq"),
+    # conta de origem, conta de destino, id, valor (centavos), data (microssegundos)
+    REGISTRO_TRANSFERENCIA: struct.Struct("<Bqqqqq"),
+}
+
+def validar_cliente(cpf: str, nome: str, data_nascimento: str, endereco: str):
+    for rotulo, valor, tamanho in zip(_ROTULOS_CLIENTE, (cpf, nome, data_nascimento, endereco), TAMANHOS_CLIENTE):
+        if len(valor.encode("utf-8")) > tamanho:
+            raise ValueError(f"O campo {rotulo} excede o limite de {tamanho} bytes.")
+
+def _texto(valor: str, tamanho: int) -> bytes:
+    dados = valor.encode("utf-8")
+    if len(dados) > tamanho:
+        raise ValueError(f"Texto de {len(dados)} bytes não cabe em um campo de {tamanho}: {valor!r}")
+    return dados
+
+def _ler_texto(dados: bytes) -> str:
+    return dados.rstrip(b"\0").decode("utf-8", errors="ignore")
+
+def ler_registros(caminho: str, inicio: int = 0):
+    # Gera (tipo, campos, posicao_final) para cada registro completo do diário a partir do
+    # byte `inicio`. Um registro truncado no fim do arquivo (queda durante a escrita) encerra a leitura.
+    if not os.path.exists(caminho):
+        return
+    with open(caminho, "rb") as arquivo:
+        arquivo.seek(inicio)
+        posicao = inicio
+        while True:
+            cabecalho = arquivo.read(1)
+            if not cabecalho:
+                return
+            formato = _FORMATOS.get(cabecalho[0])
+            if formato is None:
+                return
+            dados = cabecalho + arquivo.read(formato.size - 1)
+            if len(dados) < formato.size:
+                return
+            posicao += formato.size
+            tipo, *campos = formato.unpack(dados)
+            if tipo == REGISTRO_CLIENTE:
+                campos = [_ler_texto(campo) for campo in campos]
+            elif tipo == REGISTRO_CONTA:
+                campos[1] = _ler_texto(campos[1])
+            yield tipo, tuple(campos), posicao
+
+class DiarioTransacoes:
+    def __init__(self, caminho: str, registros_por_fsync: int = 64, intervalo_fsync: float = 0.05,
+                 comprimento_valido: int | None = None):
+        if registros_por_fsync <= 0:
+            raise ValueError("registros_por_fsync deve ser positivo.")
+        self._caminho = caminho
+        self._arquivo = open(caminho, "ab")
+        if comprimento_valido is not None:
+            self._arquivo.truncate(comprimento_valido)
+            self._arquivo.seek(comprimento_valido)
+        self._registros_por_fsync = registros_por_fsync
+        self._intervalo_fsync = intervalo_fsync
+        self._pendentes = 0
+        self._trava = threading.RLock()
+        # Sinalizado enquanto há registros pendentes; a thread de confirmação espera por ele.
+        self._ha_pendentes = threading.Event()
+        self._parar = threading.Event()
+        self._confirmador = None
+        if math.isfinite(intervalo_fsync):
+            self._confirmador = threading.Thread(target=self._executar, name="diario-fsync", daemon=True)
+            self._confirmador.start()
+
+    @property
+    def caminho(self) -> str:
+        return self._caminho
+
+    @property
+    def posicao(self) -> int:
+        return self._arquivo.tell()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def registrar_cliente(self, cpf: str, nome: str, data_nascimento: str, endereco: str):
+        self._anexar(_FORMATOS[REGISTRO_CLIENTE].pack(
+            REGISTRO_CLIENTE, *map(_texto, (cpf, nome, data_nascimento, endereco), TAMANHOS_CLIENTE)))
+
+    def registrar_conta(self, numero: int, cpf: str, limite_valor_saque_centavos: int, limite_saques_diarios: int):
+        self._anexar(_FORMATOS[REGISTRO_CONTA].pack(
+            REGISTRO_CONTA, numero, _texto(cpf, 14), limite_valor_saque_centavos, limite_saques_diarios))
+
+    def registrar_transacao(self, numero_conta: int, id: int, codigo: int, valor_centavos: int, data_us: int):
+        self._anexar(_FORMATOS[REGISTRO_TRANSACAO].pack(
+            REGISTRO_TRANSACAO, numero_conta, id, codigo, valor_centavos, data_us))
+
+    def registrar_transferencia(self, numero_origem: int, numero_destino: int, id: int, valor_centavos: int,
+                                data_us: int):
+        # As duas pernas em um único registro: após uma queda a transferência é reaplicada inteira ou não é.
+        self._anexar(_FORMATOS[REGISTRO_TRANSFERENCIA].pack(
+            REGISTRO_TRANSFERENCIA, numero_origem, numero_destino, id, valor_centavos, data_us))
+
+    def _anexar(self, dados: bytes):
+        with self._trava:
+            self._arquivo.write(dados)
+            self._pendentes += 1
+            if self._pendentes >= self._registros_por_fsync:
+                self.confirmar()
+            elif self._pendentes == 1:
+                self._ha_pendentes.set()
+
+    def _executar(self):
+        while not self._parar.is_set():
+            self._ha_pendentes.wait()
+            if self._parar.is_set():
+                return
+            # Dá tempo para o grupo crescer; fechar() interrompe a espera.
+            self._parar.wait(self._intervalo_fsync)
+            self.confirmar()
+
+    def confirmar(self):
+        with self._trava:
+            if self._pendentes:
+                self._arquivo.flush()
+                os.fsync(self._arquivo.fileno())
+                self._pendentes = 0
+            self._ha_pendentes.clear()
+
+    def fechar(self):
+        if not self._arquivo.closed:
+            if self._confirmador is not None:
+                self._parar.set()
+                self._ha_pendentes.set()
+                self._confirmador.join()
+            self.confirmar()
+            self._arquivo.close()
@@ -0,0 +1,201 @@
+# Exportação e importação em massa de clientes, contas e históricos, em CSV ou JSONL.
+# Os exportadores escrevem linha a linha a partir de ContasIterator e de
+# Historico.transacoes_por_tipo, com memória constante. Os importadores leem em lotes de
+# tamanho fixo, criam PessoaFisica/ContaCorrente sem input() nem print() e registram cada
+# lote de uma vez (adicionar_lote). Valores monetários vão como texto ("12.34") para não
+# passar por float; datas em ISO 8601, locais e sem fuso como no Historico.
+# O saldo importado é o do arquivo de contas; importar_historicos só carrega as transações.
+# A importação não passa pelo diário: para persistir, grave um snapshot (gravar_estado).
+import csv
+import gc
+import json
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from functools import wraps
+from itertools import islice
+
+from Banco_iteradores_geradores_decoradores import (_CODIGOS_POR_NOME, _EPOCA, _MICROSSEGUNDO, ContaCorrente,
+                                                    ContasIterator, PessoaFisica, RegistroClientes, RegistroContas,
+                                                    _avancar_ids_transacao)
+from banco_comum.dinheiro import Dinheiro
+from diario import validar_cliente
+from snapshot import TAMANHO_AGENCIA
+
+CAMPOS_CLIENTES = ("cpf", "nome", "data_nascimento", "endereco")
+CAMPOS_CONTAS = ("numero", "agencia", "tipo_conta", "cliente_cpf", "saldo", "limite_valor_saque",
+                 "limite_saques_diarios")
+CAMPOS_TRANSACOES = ("numero_conta", "id", "tipo", "valor", "data")
+TAMANHO_LOTE = 10_000
+
+def _formato(caminho: str, formato: str | None) -> str:
+    formato = formato or caminho.rsplit(".", 1)[-1].lower()
+    if formato not in ("csv", "jsonl"):
+        raise ValueError(f"Formato não suportado: {formato!r} (use csv ou jsonl).")
+    return formato
+
+def _gravar(caminho: str, formato: str | None, campos: tuple[str, ...], linhas: Iterable[tuple]) -> int:
+    formato = _formato(caminho, formato)
+    quantidade = 0
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        if formato == "csv":
+            escritor = csv.writer(arquivo)
+            escritor.writerow(campos)
+            for linha in linhas:
+                escritor.writerow(linha)
+                quantidade += 1
+        else:
+            for linha in linhas:
+                arquivo.write(json.dumps(dict(zip(campos, linha)), ensure_ascii=False))
+                arquivo.write("\n")
+                quantidade += 1
+    return quantidade
+
+def _ler(caminho: str, formato: str | None, campos: tuple[str, ...]) -> Iterator[tuple]:
+    # Devolve as linhas como tuplas na ordem de `campos`, qualquer que seja a ordem no arquivo.
+    formato = _formato(caminho, formato)
+    with open(caminho, newline="", encoding="utf-8") as arquivo:
+        if formato == "csv":
+            leitor = csv.reader(arquivo)
+            cabecalho = next(leitor, None)
+            if cabecalho is None:
+                return
+            try:
+                posicoes = [cabecalho.index(campo) for campo in campos]
+            except ValueError:
+                raise ValueError(f"Cabeçalho de {caminho} sem os campos {', '.join(campos)}.") from None
+            for linha in leitor:
+                yield tuple(linha[posicao] for posicao in posicoes)
+        else:
+            for linha in arquivo:
+                if linha.strip():
+                    registro = json.loads(linha)
+                    yield tuple(registro[campo] for campo in campos)
+
+def _centavos(valor: str | int | float) -> int:
+    # Texto como o gravado pelos exportadores ("1234.56"); números vêm de JSONL escrito à
+    # mão e, mesmo inteiros, estão em reais.
+    return int(Dinheiro.de_reais(valor))
+
+def _lotes(linhas: Iterable[tuple], tamanho_lote: int) -> Iterator[list[tuple]]:
+    if tamanho_lote <= 0:
+        raise ValueError("O tamanho do lote deve ser positivo.")
+    linhas = iter(linhas)
+    while lote := list(islice(linhas, tamanho_lote)):
+        yield lote
+
+def exportar_clientes(clientes: RegistroClientes, caminho: str, formato: str | None = None) -> int:
+    return _gravar(caminho, formato, CAMPOS_CLIENTES,
+                   ((cliente.cpf, cliente.nome, cliente.data_nascimento, cliente.endereco) for cliente in clientes))
+
+def _linhas_contas(contas: RegistroContas):
+    for dados, conta in zip(ContasIterator(contas), contas):
+        corrente = isinstance(conta, ContaCorrente)
+        yield (dados["numero"], dados["agencia"], dados["tipo_conta"], dados["cliente_cpf"], str(dados["saldo"]),
+               str(conta.limite) if corrente else "", conta._limite_saques_diarios if corrente else "")
+
+def exportar_contas(contas: RegistroContas, caminho: str, formato: str | None = None) -> int:
+    return _gravar(caminho, formato, CAMPOS_CONTAS, _linhas_contas(contas))
+
+def _linhas_transacoes(contas: RegistroContas, tipo_filtro: str | None, inicio: datetime | None,
+                       fim: datetime | None):
+    for conta in contas:
+        numero = conta.numero
+        for transacao in conta.historico.transacoes_por_tipo(tipo_filtro, inicio, fim):
+            yield numero, transacao.id, type(transacao).__name__, str(transacao.valor), transacao.data.isoformat()
+
+def exportar_historicos(contas: RegistroContas, caminho: str, formato: str | None = None,
+                        tipo_filtro: str | None = None, inicio: datetime | None = None,
+                        fim: datetime | None = None) -> int:
+    return _gravar(caminho, formato, CAMPOS_TRANSACOES, _linhas_transacoes(contas, tipo_filtro, inicio, fim))
+
+def _sem_coletor(funcao):
+    # Como em recuperar_estado: milhões de objetos novos disparariam coletas inúteis.
+    @wraps(funcao)
+    def executar(*args, **kwargs):
+        gc_ativo = gc.isenabled()
+        gc.disable()
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            if gc_ativo:
+                gc.enable()
+    return executar
+
+def _cliente_valido(campos: tuple[str, str, str, str]) -> bool:
+    try:
+        validar_cliente(*campos)
+    except ValueError:
+        return False
+    return True
+
+@_sem_coletor
+def importar_clientes(caminho: str, clientes: RegistroClientes, formato: str | None = None,
+                      tamanho_lote: int = TAMANHO_LOTE) -> tuple[int, int]:
+    # Devolve (importados, ignorados); CPFs já cadastrados e campos maiores que os do diário
+    # e do snapshot (diario.TAMANHOS_CLIENTE) são ignorados.
+    importados = ignorados = 0
+    for lote in _lotes(_ler(caminho, formato, CAMPOS_CLIENTES), tamanho_lote):
+        novos = [PessoaFisica(cpf=cpf, nome=nome, data_nascimento=data_nascimento, endereco=endereco)
+                 for cpf, nome, data_nascimento, endereco in filter(_cliente_valido, lote)]
+        aceitos = len(clientes.adicionar_lote(novos))
+        importados += aceitos
+        ignorados += len(lote) - aceitos
+    return importados, ignorados
+
+@_sem_coletor
+def importar_contas(caminho: str, clientes: RegistroClientes, contas: RegistroContas, formato: str | None = None,
+                    tamanho_lote: int = TAMANHO_LOTE) -> tuple[int, int]:
+    # Devolve (importadas, ignoradas): contas de outro tipo, com titular desconhecido, número
+    # já existente ou agência maior que a do snapshot (TAMANHO_AGENCIA bytes) são ignoradas.
+    importadas = ignoradas = 0
+    por_cpf = clientes.buscar_por_cpf
+    for lote in _lotes(_ler(caminho, formato, CAMPOS_CONTAS), tamanho_lote):
+        novas = []
+        for numero, agencia, tipo_conta, cpf, saldo, limite_valor_saque, limite_saques_diarios in lote:
+            cliente = por_cpf(cpf)
+            if (cliente is None or tipo_conta != ContaCorrente.__name__
+                    or len(agencia.encode("utf-8")) > TAMANHO_AGENCIA):
+                continue
+            conta = ContaCorrente(cliente=cliente, numero=int(numero),
+                                  limite_valor_saque=Dinheiro(_centavos(limite_valor_saque)),
+                                  limite_saques_diarios_cc=int(limite_saques_diarios))
+            conta._agencia = agencia
+            conta._saldo = _centavos(saldo)
+            novas.append(conta)
+        aceitas = contas.adicionar_lote(novas)
+        for conta in aceitas:
+            conta.cliente.adicionar_conta(conta)
+            clientes.registrar_conta(conta)
+        importadas += len(aceitas)
+        ignoradas += len(lote) - len(aceitas)
+    return importadas, ignoradas
+
+@_sem_coletor
+def importar_historicos(caminho: str, contas: RegistroContas, formato: str | None = None,
+                        tamanho_lote: int = TAMANHO_LOTE) -> tuple[int, int]:
+    # Devolve (importadas, ignoradas): transações de conta inexistente ou de tipo desconhecido
+    # são ignoradas. Os saldos não mudam; o gerador de ids avança além do maior id importado.
+    importadas = ignoradas = 0
+    ultimo_id = 0
+    buscar = contas.buscar
+    codigos = _CODIGOS_POR_NOME
+    fromisoformat = datetime.fromisoformat
+    for lote in _lotes(_ler(caminho, formato, CAMPOS_TRANSACOES), tamanho_lote):
+        conta = None
+        for numero_conta, id, tipo, valor, data in lote:
+            numero_conta = int(numero_conta)
+            if conta is None or conta.numero != numero_conta:
+                conta = buscar(numero_conta)
+            codigo = codigos.get(tipo.lower())
+            if conta is None or codigo is None:
+                ignoradas += 1
+                continue
+            id = int(id)
+            conta.historico._adicionar(id, codigo, _centavos(valor),
+                                       (fromisoformat(data) - _EPOCA) // _MICROSSEGUNDO)
+            if id > ultimo_id:
+                ultimo_id = id
+            importadas += 1
+    if ultimo_id:
+        _avancar_ids_transacao(ultimo_id)
+    return importadas, ignoradas
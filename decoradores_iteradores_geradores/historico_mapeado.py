@@ -0,0 +1,125 @@
+# Arquivo de transações de uma agência com registros de tamanho fixo, mapeado em memória.
+# O arquivo é pré-alocado em blocos e os registros são gravados direto no mapa; o
+# cabeçalho guarda a quantidade de registros válidos. Um único processo grava e vários
+# podem ler o mesmo arquivo ao mesmo tempo (somente_leitura=True), sem copiar os dados.
+import mmap
+import os
+import struct
+import threading
+from array import array
+
+_MAGICO = b"BHISTAG1"
+_CABECALHO = struct.Struct("<8sq")
+_INICIO_REGISTROS = 64
+# numero_conta, id, valor (centavos), data (microssegundos), codigo do tipo
+_REGISTRO = struct.Struct("<qqqqb7x")
+_BLOCO_REGISTROS = 1 << 16
+
+CAMPO_NUMERO_CONTA = 0
+CAMPO_ID = 1
+CAMPO_VALOR = 2
+CAMPO_DATA = 3
+CAMPO_CODIGO = 4
+
+_CAMPOS = [(struct.Struct("<q"), 0), (struct.Struct("<q"), 8), (struct.Struct("<q"), 16),
+           (struct.Struct("<q"), 24), (struct.Struct("<b"), 32)]
+
+class ArquivoHistorico:
+    def __init__(self, caminho: str, somente_leitura: bool = False):
+        self._caminho = caminho
+        self._somente_leitura = somente_leitura
+        if not somente_leitura and not os.path.exists(caminho):
+            with open(caminho, "wb") as arquivo:
+                arquivo.write(_CABECALHO.pack(_MAGICO, 0))
+                arquivo.truncate(_INICIO_REGISTROS + _BLOCO_REGISTROS * _REGISTRO.size)
+        self._arquivo = open(caminho, "rb" if somente_leitura else "r+b")
+        self._mapa = None
+        self._trava = threading.Lock()
+        self._mapear()
+        magico, _ = _CABECALHO.unpack_from(self._mapa)
+        if magico != _MAGICO:
+            self.fechar()
+            raise ValueError(f"Arquivo de histórico inválido: {caminho}")
+
+    def _mapear(self):
+        if self._mapa is not None:
+            self._mapa.close()
+        acesso = mmap.ACCESS_READ if self._somente_leitura else mmap.ACCESS_WRITE
+        self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=acesso)
+
+    def _capacidade(self) -> int:
+        return (len(self._mapa) - _INICIO_REGISTROS) // _REGISTRO.size
+
+    def __len__(self) -> int:
+        return _CABECALHO.unpack_from(self._mapa)[1]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    @property
+    def caminho(self) -> str:
+        return self._caminho
+
+    def anexar(self, numero_conta: int, id: int, codigo: int, valor_centavos: int, data_us: int) -> int:
+        if self._somente_leitura:
+            raise PermissionError("Arquivo de histórico aberto somente para leitura.")
+        with self._trava:
+            registro = len(self)
+            if registro >= self._capacidade():
+                self._mapa.flush()
+                self._arquivo.truncate(_INICIO_REGISTROS + (self._capacidade() + _BLOCO_REGISTROS) * _REGISTRO.size)
+                self._mapear()
+            _REGISTRO.pack_into(self._mapa, _INICIO_REGISTROS + registro * _REGISTRO.size,
+                                numero_conta, id, valor_centavos, data_us, codigo)
+            _CABECALHO.pack_into(self._mapa, 0, _MAGICO, registro + 1)
+        return registro
+
+    def _garantir_mapeado(self, registro: int):
+        # Leitores de outros processos remapeiam quando o gravador cresce o arquivo.
+        if registro >= self._capacidade():
+            self._mapear()
+
+    def campo(self, registro: int, campo: int) -> int:
+        self._garantir_mapeado(registro)
+        formato, deslocamento = _CAMPOS[campo]
+        return formato.unpack_from(self._mapa, _INICIO_REGISTROS + registro * _REGISTRO.size + deslocamento)[0]
+
+    def registro(self, registro: int) -> tuple[int, int, int, int, int]:
+        self._garantir_mapeado(registro)
+        return _REGISTRO.unpack_from(self._mapa, _INICIO_REGISTROS + registro * _REGISTRO.size)
+
+    def registros(self, inicio: int = 0, fim: int | None = None):
+        # Percorre os registros [inicio, fim) diretamente sobre o mapa, sem cópia.
+        fim = len(self) if fim is None else fim
+        if fim <= inicio:
+            return
+        self._garantir_mapeado(fim - 1)
+        with memoryview(self._mapa) as visao:
+            trecho = visao[_INICIO_REGISTROS + inicio * _REGISTRO.size:_INICIO_REGISTROS + fim * _REGISTRO.size]
+            try:
+                yield from _REGISTRO.iter_unpack(trecho)
+            finally:
+                trecho.release()
+
+    def posicoes_por_conta(self) -> dict[int, array]:
+        posicoes: dict[int, array] = {}
+        for registro, campos in enumerate(self.registros()):
+            numero_conta = campos[CAMPO_NUMERO_CONTA]
+            if numero_conta not in posicoes:
+                posicoes[numero_conta] = array('q')
+            posicoes[numero_conta].append(registro)
+        return posicoes
+
+    def sincronizar(self):
+        self._mapa.flush()
+
+    def fechar(self):
+        if self._mapa is not None:
+            if not self._somente_leitura:
+                self._mapa.flush()
+            self._mapa.close()
+            self._mapa = None
+        self._arquivo.close()
@@ -0,0 +1,189 @@
+# Livro-razão particionado: as contas são distribuídas por `numero` entre processos
+# trabalhadores, cada um com seu próprio interpretador (e GIL). Depósitos e saques são
+# roteados em lote, por um Pipe, para a partição dona da conta, que os aplica com
+# processar_lote; listagens e resumos consultam todas as partições e juntam os resultados.
+# Um cliente com contas em várias partições tem uma cópia em cada uma, só com as contas locais.
+# Cada resposta de partição é (sucesso, resultado); um comando que falha devolve a exceção,
+# que é relançada no processo pai, e a partição segue atendendo os próximos comandos.
+import heapq
+import multiprocessing
+import os
+from array import array
+from collections.abc import Iterable
+from operator import itemgetter
+
+from Banco_iteradores_geradores_decoradores import (CLIENTE_NAO_ENCONTRADO, CONTA_NAO_ENCONTRADA, OPERACAO_OK,
+                                                    ContasIterator, ContaCorrente, PessoaFisica, RegistroClientes,
+                                                    RegistroContas, ativar_diario, normalizar_cpf, processar_lote)
+from banco_comum.dinheiro import Dinheiro
+
+def _criar_conta(clientes: RegistroClientes, contas: RegistroContas, campos_cliente: tuple[str, str, str, str],
+                 numero: int, limite_valor_saque: float, limite_saques_diarios: int) -> bool:
+    if numero in contas:
+        return False
+    cliente = clientes.buscar_por_cpf(campos_cliente[0])
+    if cliente is None:
+        cpf, nome, data_nascimento, endereco = campos_cliente
+        cliente = PessoaFisica(cpf=cpf, nome=nome, data_nascimento=data_nascimento, endereco=endereco)
+        clientes.adicionar(cliente)
+    conta = ContaCorrente(cliente=cliente, numero=numero, limite_valor_saque=limite_valor_saque,
+                          limite_saques_diarios_cc=limite_saques_diarios)
+    contas.adicionar(conta)
+    cliente.adicionar_conta(conta)
+    clientes.registrar_conta(conta)
+    return True
+
+def _resumo(contas: RegistroContas) -> dict[str, tuple[int, float]]:
+    totais = {}
+    for conta in contas:
+        for tipo, agregado in conta.historico.resumo().items():
+            quantidade, total = totais.get(tipo, (0, Dinheiro(0)))
+            totais[tipo] = (quantidade + agregado.quantidade, total + agregado.total)
+    return totais
+
+def _enviar_erro(conexao, erro: Exception):
+    try:
+        conexao.send((False, erro))
+    except Exception:
+        # Exceção que não pode ser serializada: vai só a descrição.
+        conexao.send((False, RuntimeError(repr(erro))))
+
+def _executar_particao(conexao):
+    # O diário do processo pai (herdado no fork) não pode receber gravações das partições.
+    ativar_diario(None)
+    clientes = RegistroClientes()
+    contas = RegistroContas()
+    while True:
+        try:
+            comando, *argumentos = conexao.recv()
+        except EOFError:
+            break  # o processo pai fechou o Pipe
+        if comando == "fim":
+            break
+        try:
+            if comando == "lote":
+                resposta = processar_lote(argumentos[0], clientes).tobytes()
+            elif comando == "conta":
+                resposta = _criar_conta(clientes, contas, *argumentos)
+            elif comando == "contas":
+                resposta = sorted(ContasIterator(contas), key=itemgetter("numero"))
+            elif comando == "resumo":
+                resposta = _resumo(contas)
+            else:
+                raise ValueError(f"Comando desconhecido: {comando!r}")
+        except Exception as erro:
+            _enviar_erro(conexao, erro)
+        else:
+            conexao.send((True, resposta))
+    conexao.close()
+
+def _respostas(conexoes: Iterable) -> list:
+    # Lê a resposta de todas as partições antes de relançar um erro, para que nenhuma fique
+    # pendente no Pipe e seja lida como resposta do comando seguinte.
+    respostas = [conexao.recv() for conexao in conexoes]
+    for sucesso, resposta in respostas:
+        if not sucesso:
+            raise resposta
+    return [resposta for _, resposta in respostas]
+
+class LivroParticionado:
+    def __init__(self, particoes: int | None = None):
+        particoes = particoes if particoes is not None else os.cpu_count() or 1
+        if particoes <= 0:
+            raise ValueError("A quantidade de partições deve ser positiva.")
+        self._clientes: dict[str, tuple[str, str, str, str]] = {}
+        self._conexoes = []
+        self._processos = []
+        for _ in range(particoes):
+            local, remota = multiprocessing.Pipe()
+            processo = multiprocessing.Process(target=_executar_particao, args=(remota,), daemon=True)
+            processo.start()
+            remota.close()
+            self._conexoes.append(local)
+            self._processos.append(processo)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def __len__(self) -> int:
+        return len(self._conexoes)
+
+    def particao(self, numero_conta: int) -> int:
+        return numero_conta % len(self._conexoes)
+
+    def cadastrar_usuario(self, cpf: str, nome: str, data_nascimento: str, endereco: str) -> bool:
+        chave = normalizar_cpf(cpf)
+        if chave in self._clientes:
+            return False
+        self._clientes[chave] = (cpf, nome, data_nascimento, endereco)
+        return True
+
+    def criar_conta(self, cpf: str, numero: int, limite_valor_saque: float = 500.0,
+                    limite_saques_diarios: int = 3) -> bool:
+        campos_cliente = self._clientes.get(normalizar_cpf(cpf))
+        if campos_cliente is None:
+            raise ValueError("Cliente não encontrado, cadastre o usuário primeiro.")
+        conexao = self._conexoes[self.particao(numero)]
+        conexao.send(("conta", campos_cliente, numero, limite_valor_saque, limite_saques_diarios))
+        return _respostas((conexao,))[0]
+
+    def processar_lote(self, transacoes: Iterable[tuple[str, int, str, float]]) -> array:
+        # Mesmo contrato de processar_lote: um código de resultado por registro, na ordem de
+        # entrada. Todas as partições recebem sua parte antes de qualquer resposta ser lida,
+        # então processam em paralelo.
+        particoes = len(self._conexoes)
+        lotes = [[] for _ in range(particoes)]
+        indices = [array('q') for _ in range(particoes)]
+        resultados = array('b')
+        for indice, transacao in enumerate(transacoes):
+            if normalizar_cpf(transacao[0]) not in self._clientes:
+                resultados.append(CLIENTE_NAO_ENCONTRADO)
+                continue
+            resultados.append(OPERACAO_OK)
+            particao = transacao[1] % particoes
+            lotes[particao].append(transacao)
+            indices[particao].append(indice)
+
+        for conexao, lote in zip(self._conexoes, lotes):
+            if lote:
+                conexao.send(("lote", lote))
+        ocupadas = [particao for particao, lote in enumerate(lotes) if lote]
+        codigos_particoes = _respostas(self._conexoes[particao] for particao in ocupadas)
+        for particao, codigos in zip(ocupadas, codigos_particoes):
+            for posicao, codigo in zip(indices[particao], codigos):
+                # O cliente existe (conferido acima); se a partição não o conhece, ele
+                # só não tem contas nela.
+                resultados[posicao] = CONTA_NAO_ENCONTRADA if codigo == CLIENTE_NAO_ENCONTRADO else codigo
+        return resultados
+
+    def _consultar(self, comando: str) -> list:
+        for conexao in self._conexoes:
+            conexao.send((comando,))
+        return _respostas(self._conexoes)
+
+    def listar_contas(self):
+        # Cada partição devolve suas contas já ordenadas; a junção mantém a ordem por número.
+        return heapq.merge(*self._consultar("contas"), key=itemgetter("numero"))
+
+    def resumo(self) -> dict[str, tuple[int, float]]:
+        totais = {}
+        for resumo_particao in self._consultar("resumo"):
+            for tipo, (quantidade, total) in resumo_particao.items():
+                quantidade_atual, total_atual = totais.get(tipo, (0, Dinheiro(0)))
+                totais[tipo] = (quantidade_atual + quantidade, total_atual + total)
+        return totais
+
+    def fechar(self):
+        # Tolera partições que já terminaram (Pipe quebrado do outro lado).
+        for conexao in self._conexoes:
+            if not conexao.closed:
+                try:
+                    conexao.send(("fim",))
+                except (ConnectionError, EOFError):
+                    pass
+                conexao.close()
+        for processo in self._processos:
+            processo.join()
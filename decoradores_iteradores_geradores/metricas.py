@@ -0,0 +1,121 @@
+# Instrumentação de latência por operação. O decorador @medir conta as chamadas e guarda
+# a duração de cada uma em um histograma log-linear (no estilo HDR): cada potência de 2
+# é dividida em 2**(_BITS_PRECISAO - 1) faixas, então p50/p95/p99 saem com erro relativo
+# de até ~6% usando memória fixa, sem guardar as amostras. Desativadas (padrão), o custo por
+# chamada é o do wrapper mais o teste de uma variável global (~0,4 µs). Com BANCO_METRICAS=0
+# no ambiente nada é instrumentado: @medir devolve a própria função, sem custo algum, e
+# ativar_metricas não tem efeito.
+# Sob várias threads as contagens são aproximadas: os incrementos não usam trava.
+import os
+from array import array
+from functools import wraps
+from math import ceil
+from time import perf_counter_ns
+
+_BITS_PRECISAO = 5
+_FAIXAS = 1 << (_BITS_PRECISAO - 1)
+_TAMANHO = (64 - _BITS_PRECISAO + 2) * _FAIXAS
+
+_INSTRUMENTAR = os.environ.get("BANCO_METRICAS") != "0"
+_ATIVAS = False
+_HISTOGRAMAS: dict[str, 'HistogramaLatencia'] = {}
+
+def _indice(valor: int) -> int:
+    expoente = valor.bit_length() - _BITS_PRECISAO
+    if expoente <= 0:
+        return valor
+    return expoente * _FAIXAS + (valor >> expoente)
+
+def _limite_superior(indice: int) -> int:
+    if indice < 2 * _FAIXAS:
+        return indice
+    expoente = indice // _FAIXAS - 1
+    return ((indice - expoente * _FAIXAS + 1) << expoente) - 1
+
+class HistogramaLatencia:
+    __slots__ = ("_contagens", "_quantidade", "_total", "_maximo")
+
+    def __init__(self):
+        self._contagens = array('q', bytes(8 * _TAMANHO))
+        self._quantidade = 0
+        self._total = 0
+        self._maximo = 0
+
+    @property
+    def quantidade(self) -> int:
+        return self._quantidade
+
+    @property
+    def media(self) -> float:
+        return self._total / self._quantidade if self._quantidade else 0.0
+
+    @property
+    def maximo(self) -> int:
+        return self._maximo
+
+    def registrar(self, duracao_ns: int):
+        # Mesmo cálculo de _indice, repetido aqui para evitar uma chamada por medição.
+        expoente = duracao_ns.bit_length() - _BITS_PRECISAO
+        self._contagens[duracao_ns if expoente <= 0 else expoente * _FAIXAS + (duracao_ns >> expoente)] += 1
+        self._quantidade += 1
+        self._total += duracao_ns
+        if duracao_ns > self._maximo:
+            self._maximo = duracao_ns
+
+    def percentil(self, fracao: float) -> int:
+        # Limite superior da faixa que contém o percentil, em nanossegundos.
+        if not self._quantidade:
+            return 0
+        alvo = max(1, ceil(fracao * self._quantidade))
+        acumulado = 0
+        for indice, contagem in enumerate(self._contagens):
+            acumulado += contagem
+            if acumulado >= alvo:
+                return min(_limite_superior(indice), self._maximo)
+        return self._maximo
+
+    def limpar(self):
+        self._contagens = array('q', bytes(8 * _TAMANHO))
+        self._quantidade = 0
+        self._total = 0
+        self._maximo = 0
+
+def ativar_metricas(ativas: bool = True):
+    global _ATIVAS
+    _ATIVAS = ativas
+
+def metricas_ativas() -> bool:
+    return _ATIVAS and _INSTRUMENTAR
+
+def histograma_operacao(nome: str) -> HistogramaLatencia | None:
+    # Para quem mede dentro do próprio wrapper; None quando nada é instrumentado.
+    if not _INSTRUMENTAR:
+        return None
+    return _HISTOGRAMAS.setdefault(nome, HistogramaLatencia())
+
+def medir(func=None, *, nome: str | None = None):
+    # Uso: @medir ou @medir(nome="operacao"); o nome padrão é o __qualname__ da função.
+    if func is None:
+        return lambda funcao: medir(funcao, nome=nome)
+    histograma = histograma_operacao(nome or func.__qualname__)
+    if histograma is None:
+        return func
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _ATIVAS:
+            return func(*args, **kwargs)
+        inicio = perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            histograma.registrar(perf_counter_ns() - inicio)
+    return wrapper
+
+def relatorio_metricas() -> dict[str, HistogramaLatencia]:
+    # Somente as operações já chamadas com as métricas ativas, em ordem de nome.
+    return {nome: histograma for nome, histograma in sorted(_HISTOGRAMAS.items()) if histograma.quantidade}
+
+def limpar_metricas():
+    for histograma in _HISTOGRAMAS.values():
+        histograma.limpar()
@@ -0,0 +1,96 @@
+# Registro estruturado de eventos fora do caminho crítico. Quem registra só anexa uma
+# tupla compacta (instante em ns, evento, referência, valor) a um buffer circular; uma
+# thread de fundo esvazia o buffer em lotes, formata cada registro como uma linha JSON e
+# grava no arquivo. Com o buffer cheio os registros mais antigos são descartados em vez
+# de bloquear a operação. `amostragem=N` guarda apenas 1 a cada N eventos.
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from itertools import count
+
+class RegistroEventos:
+    def __init__(self, caminho: str, capacidade: int = 1 << 16, amostragem: int = 1, intervalo: float = 0.2):
+        if capacidade <= 0:
+            raise ValueError("A capacidade do buffer deve ser positiva.")
+        if amostragem <= 0:
+            raise ValueError("A amostragem deve ser positiva.")
+        self._capacidade = capacidade
+        self._amostragem = amostragem
+        self._contador = count()
+        self._intervalo = intervalo
+        # deque.append e popleft são atômicos, então quem registra nunca espera pela thread de gravação.
+        self._buffer: deque[tuple[int, str, int, float]] = deque(maxlen=capacidade)
+        self._descartados = 0
+        self._gravados = 0
+        # Caches da thread de gravação: nomes de evento já escapados para JSON e o prefixo
+        # de data do último segundo formatado (eventos próximos compartilham o mesmo segundo).
+        self._eventos_json: dict[str, str] = {}
+        self._segundo = -1
+        self._prefixo_data = ""
+        self._arquivo = open(caminho, "a", encoding="utf-8")
+        self._acordar = threading.Event()
+        self._encerrar = False
+        self._gravador = threading.Thread(target=self._executar, name="registro-eventos", daemon=True)
+        self._gravador.start()
+
+    @property
+    def descartados(self) -> int:
+        return self._descartados
+
+    @property
+    def gravados(self) -> int:
+        return self._gravados
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def registrar(self, evento: str, referencia: int = 0, valor: float = 0.0):
+        if self._amostragem > 1 and next(self._contador) % self._amostragem:
+            return
+        if len(self._buffer) >= self._capacidade:
+            # Contagem aproximada sob concorrência; o descarte em si é feito pelo deque.
+            self._descartados += 1
+        self._buffer.append((time.time_ns(), evento, referencia, valor))
+        if len(self._buffer) >= self._capacidade // 2:
+            self._acordar.set()
+
+    def _esvaziar(self):
+        buffer = self._buffer
+        eventos_json = self._eventos_json
+        linhas = []
+        while buffer:
+            instante, evento, referencia, valor = buffer.popleft()
+            segundo, nanossegundos = divmod(instante, 1_000_000_000)
+            if segundo != self._segundo:
+                self._segundo = segundo
+                self._prefixo_data = datetime.fromtimestamp(segundo).isoformat()
+            evento_json = eventos_json.get(evento)
+            if evento_json is None:
+                evento_json = eventos_json[evento] = json.dumps(evento, ensure_ascii=False)
+            linhas.append(f'{{"data": "{self._prefixo_data}.{nanossegundos // 1000:06d}", "evento": {evento_json}, '
+                          f'"referencia": {referencia}, "valor": {valor!r}}}')
+        if linhas:
+            linhas.append("")
+            self._arquivo.write("\n".join(linhas))
+            self._arquivo.flush()
+            self._gravados += len(linhas) - 1
+
+    def _executar(self):
+        while not self._encerrar:
+            self._acordar.wait(self._intervalo)
+            self._acordar.clear()
+            self._esvaziar()
+        self._esvaziar()
+
+    def fechar(self):
+        if self._arquivo.closed:
+            return
+        self._encerrar = True
+        self._acordar.set()
+        self._gravador.join()
+        self._arquivo.close()
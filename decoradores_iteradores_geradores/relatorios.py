@@ -0,0 +1,110 @@
+# Extratos de período (fim de mês) de todas as contas, gerados em paralelo. As contas vão,
+# em faixas contíguas de números, para um ProcessPoolExecutor só com o necessário: dados do
+# titular e as colunas do Historico no período. Cada processo grava um arquivo por conta e
+# devolve as linhas do índice; o processo principal as junta em indice.csv, na ordem das
+# contas. Há no máximo 2 faixas por trabalhador em trânsito, então a memória extra não
+# cresce com a quantidade de contas.
+import csv
+import os
+from array import array
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+_EPOCA = datetime(1970, 1, 1)
+ARQUIVO_INDICE = "indice.csv"
+CAMPOS_INDICE = ("numero", "agencia", "titular", "cpf", "transacoes", "creditos", "debitos", "saldo", "arquivo")
+
+def _colunas_periodo(historico, inicio: datetime | None, fim: datetime | None) -> tuple[array, array, array]:
+    posicoes, primeiro, ultimo = historico._selecionar(None, inicio, fim)
+    _, tipos, valores, datas = historico.exportar_colunas()
+    selecionadas = posicoes[primeiro:ultimo]
+    if isinstance(selecionadas, range):
+        return tipos[primeiro:ultimo], valores[primeiro:ultimo], datas[primeiro:ultimo]
+    return (array('b', (tipos[posicao] for posicao in selecionadas)),
+            array('q', (valores[posicao] for posicao in selecionadas)),
+            array('q', (datas[posicao] for posicao in selecionadas)))
+
+def _dados_conta(conta, inicio: datetime | None, fim: datetime | None) -> tuple:
+    cliente = conta.cliente
+    return (conta.numero, conta.agencia, cliente.nome, getattr(cliente, "cpf", "N/A"), int(conta.saldo),
+            *_colunas_periodo(conta.historico, inicio, fim))
+
+def _gravar_faixa(diretorio: str, periodo: str, nomes_tipos: dict[int, str], codigos_debito: frozenset[int],
+                  faixa: list[tuple]) -> list[tuple]:
+    # Linhas no mesmo formato de formatar_transacao. As datas são locais e sem fuso, então o
+    # dia é formatado uma vez (strftime) e a hora sai da aritmética sobre os segundos.
+    prefixos = {codigo: f"Tipo: {nome:<21} | Valor: R$" for codigo, nome in nomes_tipos.items()}
+    dia_atual = None
+    dia_texto = ""
+    indice = []
+    for numero, agencia, titular, cpf, saldo, tipos, valores, datas in faixa:
+        linhas = [f"Agência: {agencia}\nConta: {numero}\nTitular: {titular}\nCPF: {cpf}\nPeríodo: {periodo}\n\n"]
+        creditos = debitos = 0
+        for codigo, valor, data_us in zip(tipos, valores, datas):
+            dia, segundo = divmod(data_us // 1_000_000, 86_400)
+            if dia != dia_atual:
+                dia_atual = dia
+                dia_texto = (_EPOCA + timedelta(days=dia)).strftime('%d/%m/%Y')
+            hora, segundo = divmod(segundo, 3600)
+            minuto, segundo = divmod(segundo, 60)
+            linhas.append(f"{prefixos[codigo]}{valor / 100:7.2f} | Data: {dia_texto} {hora:02d}:{minuto:02d}:{segundo:02d}\n")
+            if codigo in codigos_debito:
+                debitos += valor
+            else:
+                creditos += valor
+        if len(linhas) == 1:
+            linhas.append("Nenhuma transação no período.\n")
+        linhas.append(f"\nCréditos: R${creditos / 100:.2f}\nDébitos: R${debitos / 100:.2f}\n"
+                      f"Saldo atual: R${saldo / 100:.2f}\n")
+        arquivo = f"extrato_{agencia}_{numero}.txt"
+        with open(os.path.join(diretorio, arquivo), "w", encoding="utf-8") as saida:
+            saida.write("".join(linhas))
+        indice.append((numero, agencia, titular, cpf, len(tipos), f"{creditos / 100:.2f}", f"{debitos / 100:.2f}",
+                       f"{saldo / 100:.2f}", arquivo))
+    return indice
+
+def _faixas(contas: Iterable, contas_por_faixa: int, inicio: datetime | None, fim: datetime | None):
+    faixa = []
+    for conta in sorted(contas, key=lambda conta: conta.numero):
+        faixa.append(_dados_conta(conta, inicio, fim))
+        if len(faixa) == contas_por_faixa:
+            yield faixa
+            faixa = []
+    if faixa:
+        yield faixa
+
+def gerar_extratos(contas: Iterable, diretorio: str, nomes_tipos: dict[int, str], codigos_debito: frozenset[int],
+                   inicio: datetime | None = None, fim: datetime | None = None, trabalhadores: int | None = None,
+                   contas_por_faixa: int = 256) -> str:
+    # trabalhadores=0 gera tudo no processo atual; None usa um processo por CPU.
+    # Devolve o caminho do índice.
+    if contas_por_faixa <= 0:
+        raise ValueError("A quantidade de contas por faixa deve ser positiva.")
+    if trabalhadores is None:
+        trabalhadores = os.cpu_count() or 1
+    os.makedirs(diretorio, exist_ok=True)
+    periodo = (f"{inicio.strftime('%d/%m/%Y') if inicio else 'início'} a "
+               f"{fim.strftime('%d/%m/%Y') if fim else 'hoje'}")
+    faixas = _faixas(contas, contas_por_faixa, inicio, fim)
+    caminho_indice = os.path.join(diretorio, ARQUIVO_INDICE)
+    with open(caminho_indice, "w", newline="", encoding="utf-8") as arquivo_indice:
+        escritor = csv.writer(arquivo_indice)
+        escritor.writerow(CAMPOS_INDICE)
+        if trabalhadores == 0:
+            for faixa in faixas:
+                escritor.writerows(_gravar_faixa(diretorio, periodo, nomes_tipos, codigos_debito, faixa))
+            return caminho_indice
+
+        with ProcessPoolExecutor(max_workers=trabalhadores) as executor:
+            em_transito = deque()
+            limite = 2 * trabalhadores
+            for faixa in faixas:
+                em_transito.append(executor.submit(_gravar_faixa, diretorio, periodo, nomes_tipos, codigos_debito,
+                                                   faixa))
+                if len(em_transito) >= limite:
+                    escritor.writerows(em_transito.popleft().result())
+            while em_transito:
+                escritor.writerows(em_transito.popleft().result())
+    return caminho_indice
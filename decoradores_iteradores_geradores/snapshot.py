@@ -0,0 +1,119 @@
+# Snapshot compacto do estado do banco em um único arquivo mapeável em memória.
+# Layout: cabeçalho, clientes (largura fixa), contas (largura fixa) e as colunas de
+# transações de todas as contas concatenadas (ids, valores, datas e tipos). A leitura
+# usa mmap e memoryview; o Historico copia as colunas de cada conta em bloco.
+import mmap
+import os
+import struct
+from array import array
+
+from diario import TAMANHOS_CLIENTE
+
+_MAGICO = b"BSNP"
+_VERSAO = 3
+_CABECALHO = struct.Struct("<4sH2xqqqqq")
+# cpf, nome, data_nascimento, endereco
+_CLIENTE = struct.Struct("<{}s{}s{}s{}s".format(*TAMANHOS_CLIENTE))
+# Tamanho máximo, em bytes UTF-8, da agência de uma conta.
+TAMANHO_AGENCIA = 8
+# numero, indice do cliente, saldo (centavos), limite_valor_saque (centavos), limite_saques_diarios,
+# histórico em ordem cronológica (0/1), agência, posição da primeira transação, quantidade de transações.
+# Os contadores do dia não são gravados: na carga eles são recalculados a partir do histórico.
+_CONTA = struct.Struct(f"<qqqqqq{TAMANHO_AGENCIA}sqq")
+
+def _alinhar(posicao: int) -> int:
+    return (posicao + 7) & ~7
+
+def _texto(valor: str, tamanho: int) -> bytes:
+    # Clientes e agências já são validados na entrada (cadastro e importação).
+    dados = valor.encode("utf-8")
+    if len(dados) > tamanho:
+        raise ValueError(f"Texto de {len(dados)} bytes não cabe em um campo de {tamanho}: {valor!r}")
+    return dados
+
+def _ler_texto(dados: bytes) -> str:
+    return dados.rstrip(b"\0").decode("utf-8", errors="ignore")
+
+def _secoes(quantidade_clientes: int, quantidade_contas: int, quantidade_transacoes: int) -> dict[str, int]:
+    secoes = {"clientes": _alinhar(_CABECALHO.size)}
+    secoes["contas"] = _alinhar(secoes["clientes"] + quantidade_clientes * _CLIENTE.size)
+    secoes["ids"] = secoes["contas"] + quantidade_contas * _CONTA.size
+    secoes["valores"] = secoes["ids"] + quantidade_transacoes * 8
+    secoes["datas"] = secoes["valores"] + quantidade_transacoes * 8
+    secoes["tipos"] = secoes["datas"] + quantidade_transacoes * 8
+    secoes["fim"] = secoes["tipos"] + quantidade_transacoes
+    return secoes
+
+def gravar_snapshot(caminho: str, posicao_diario: int, ultimo_id: int, clientes: list[tuple[str, str, str, str]],
+                    contas: list[tuple[int, int, int, int, int, bool, str]],
+                    historicos: list[tuple[array, array, array, array]]):
+    # `contas[i]` traz (numero, indice do cliente, saldo e limite_valor_saque em centavos,
+    # limite_saques_diarios, histórico cronológico, agência) e `historicos[i]` as colunas do
+    # seu Historico.
+    ids, tipos, valores, datas = array('q'), array('b'), array('q'), array('q')
+    registros_contas = bytearray()
+    for (*campos, agencia), (ids_conta, tipos_conta, valores_conta, datas_conta) in zip(contas, historicos):
+        registros_contas += _CONTA.pack(*campos, _texto(agencia, TAMANHO_AGENCIA), len(ids), len(ids_conta))
+        ids.extend(ids_conta)
+        tipos.extend(tipos_conta)
+        valores.extend(valores_conta)
+        datas.extend(datas_conta)
+
+    secoes = _secoes(len(clientes), len(contas), len(ids))
+    temporario = caminho + ".tmp"
+    with open(temporario, "wb") as arquivo:
+        arquivo.write(_CABECALHO.pack(_MAGICO, _VERSAO, posicao_diario, ultimo_id, len(clientes), len(contas), len(ids)))
+        arquivo.seek(secoes["clientes"])
+        for cpf, nome, data_nascimento, endereco in clientes:
+            arquivo.write(_CLIENTE.pack(*map(_texto, (cpf, nome, data_nascimento, endereco), TAMANHOS_CLIENTE)))
+        arquivo.seek(secoes["contas"])
+        arquivo.write(registros_contas)
+        for coluna in (ids, valores, datas, tipos):
+            coluna.tofile(arquivo)
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+    os.replace(temporario, caminho)
+
+class Snapshot:
+    def __init__(self, caminho: str):
+        with open(caminho, "rb") as arquivo:
+            self._mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self._dados = memoryview(self._mapa)
+        (magico, versao, self.posicao_diario, self.ultimo_id, self.quantidade_clientes,
+         self.quantidade_contas, self.quantidade_transacoes) = _CABECALHO.unpack_from(self._dados)
+        if magico != _MAGICO or versao != _VERSAO:
+            self.fechar()
+            raise ValueError(f"Arquivo de snapshot inválido: {caminho}")
+        self._secoes = _secoes(self.quantidade_clientes, self.quantidade_contas, self.quantidade_transacoes)
+        inicio, fim = self._secoes["ids"], self._secoes["fim"]
+        self._ids = self._dados[inicio:inicio + self.quantidade_transacoes * 8].cast('q')
+        self._valores = self._dados[self._secoes["valores"]:self._secoes["datas"]].cast('q')
+        self._datas = self._dados[self._secoes["datas"]:self._secoes["tipos"]].cast('q')
+        self._tipos = self._dados[self._secoes["tipos"]:fim].cast('b')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def clientes(self):
+        for campos in _CLIENTE.iter_unpack(self._dados[self._secoes["clientes"]:
+                                                       self._secoes["clientes"] + self.quantidade_clientes * _CLIENTE.size]):
+            yield tuple(_ler_texto(campo) for campo in campos)
+
+    def contas(self):
+        for *campos, agencia, inicio, quantidade in _CONTA.iter_unpack(
+                self._dados[self._secoes["contas"]:self._secoes["ids"]]):
+            yield (*campos, _ler_texto(agencia), inicio, quantidade)
+
+    def colunas(self, inicio: int, quantidade: int) -> tuple[memoryview, memoryview, memoryview, memoryview]:
+        fim = inicio + quantidade
+        return self._ids[inicio:fim], self._tipos[inicio:fim], self._valores[inicio:fim], self._datas[inicio:fim]
+
+    def fechar(self):
+        for atributo in ("_ids", "_valores", "_datas", "_tipos", "_dados"):
+            visao = getattr(self, atributo, None)
+            if visao is not None:
+                visao.release()
+        self._mapa.close()